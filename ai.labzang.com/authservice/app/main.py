@@ -11,6 +11,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from app.config import AuthServiceConfig
 from app.routers import auth
+from common.metrics import setup_metrics
 from common.middleware import LoggingMiddleware
 from common.utils import setup_logging
 
@@ -39,6 +40,9 @@ app.add_middleware(
 # 미들웨어 추가
 app.add_middleware(LoggingMiddleware)
 
+# Prometheus 메트릭 (GET /metrics)
+setup_metrics(app, config.service_name)
+
 # 라우터 등록
 app.include_router(auth.router)
 
@@ -0,0 +1,153 @@
+"""
+공통 Prometheus 메트릭
+
+- 모든 서비스: `GET /metrics`, HTTP 요청 처리 시간 히스토그램
+- 추론 서비스: 단계별(tokenize, forward, serialize 등) 처리 시간, 초당 토큰 수,
+  배치 크기, 큐 깊이 같은 상태 값
+
+prometheus-client 가 설치되지 않은 서비스에서는 기록 함수가 아무것도 하지 않고
+`/metrics` 는 503 을 반환합니다.
+"""
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+from starlette.middleware.base import BaseHTTPMiddleware
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        Counter,
+        Histogram,
+        generate_latest,
+    )
+    from prometheus_client.core import GaugeMetricFamily
+
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+if PROMETHEUS_AVAILABLE:
+    HTTP_REQUEST_SECONDS = Histogram(
+        "http_request_duration_seconds",
+        "HTTP 요청 처리 시간(초)",
+        ["service", "method", "path", "status"],
+        buckets=LATENCY_BUCKETS,
+    )
+    STAGE_SECONDS = Histogram(
+        "inference_stage_seconds",
+        "추론 단계별 처리 시간(초)",
+        ["service", "stage"],
+        buckets=LATENCY_BUCKETS,
+    )
+    TOKENS_PER_SECOND = Histogram(
+        "inference_tokens_per_second",
+        "forward 단계 초당 처리 토큰 수",
+        ["service"],
+        buckets=(100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000),
+    )
+    BATCH_SIZE = Histogram(
+        "inference_batch_size",
+        "forward 한 번에 처리한 문장 수",
+        ["service"],
+        buckets=(1, 2, 4, 8, 16, 32, 64),
+    )
+    PROCESSED_TOKENS = Counter(
+        "inference_tokens_total", "forward 로 처리한 토큰 수 (패딩 제외)", ["service"]
+    )
+
+
+def observe_stage(service: str, stage: str, seconds: float) -> None:
+    """단계 하나의 처리 시간 기록"""
+    if PROMETHEUS_AVAILABLE:
+        STAGE_SECONDS.labels(service=service, stage=stage).observe(seconds)
+
+
+@contextmanager
+def stage_timer(service: str, stage: str) -> Iterator[None]:
+    """with 블록의 처리 시간을 단계 메트릭으로 기록"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(service, stage, time.perf_counter() - start)
+
+
+def observe_batch(service: str, batch_size: int, tokens: int, seconds: float) -> None:
+    """forward 한 번의 배치 크기, 처리 토큰 수, 초당 토큰 수 기록"""
+    if not PROMETHEUS_AVAILABLE:
+        return
+    BATCH_SIZE.labels(service=service).observe(batch_size)
+    PROCESSED_TOKENS.labels(service=service).inc(tokens)
+    if seconds > 0:
+        TOKENS_PER_SECOND.labels(service=service).observe(tokens / seconds)
+
+
+class _GaugeCollector:
+    """스크레이프 시점에 콜백으로 값을 읽는 게이지 (큐 깊이, 풀 상태 등)"""
+
+    def __init__(self):
+        self.gauges: Dict[str, tuple] = {}
+
+    def collect(self):
+        for name, (documentation, func) in list(self.gauges.items()):
+            gauge = GaugeMetricFamily(name, documentation)
+            try:
+                gauge.add_metric([], float(func()))
+            except Exception:
+                continue
+            yield gauge
+
+
+_gauges = _GaugeCollector()
+if PROMETHEUS_AVAILABLE:
+    REGISTRY.register(_gauges)
+
+
+def register_gauge(name: str, documentation: str, func: Callable[[], float]) -> None:
+    """스크레이프할 때마다 func() 값을 보고하는 게이지 등록 (같은 이름이면 교체)"""
+    _gauges.gauges[name] = (documentation, func)
+
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """HTTP 요청 처리 시간을 라우트 템플릿 별로 기록하는 미들웨어"""
+
+    def __init__(self, app, service_name: str):
+        super().__init__(app)
+        self.service_name = service_name
+
+    async def dispatch(self, request: Request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+        if PROMETHEUS_AVAILABLE:
+            route = request.scope.get("route")
+            HTTP_REQUEST_SECONDS.labels(
+                service=self.service_name,
+                method=request.method,
+                path=getattr(route, "path", "unmatched"),
+                status=str(response.status_code),
+            ).observe(time.perf_counter() - start)
+        return response
+
+
+def setup_metrics(app: FastAPI, service_name: str) -> None:
+    """HTTP 메트릭 미들웨어와 `GET /metrics` 엔드포인트 등록"""
+    app.add_middleware(MetricsMiddleware, service_name=service_name)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        """Prometheus 메트릭"""
+        if not PROMETHEUS_AVAILABLE:
+            return Response(
+                "prometheus-client 가 설치되어 있지 않습니다.\n",
+                status_code=503,
+                media_type="text/plain",
+            )
+        return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -51,8 +51,10 @@ except Exception as e:
 
 # 라우터 및 공통 모듈 import
 LoggingMiddleware = None
+setup_metrics = None
 try:
     from app.titanic.titanic_router import router as titanic_router
+    from common.metrics import setup_metrics
     from common.middleware import LoggingMiddleware
     from common.utils import setup_logging
 except ImportError as e:
@@ -125,6 +127,10 @@ app.add_middleware(
 if LoggingMiddleware is not None:
     app.add_middleware(LoggingMiddleware)
 
+# Prometheus 메트릭 (GET /metrics)
+if setup_metrics is not None:
+    setup_metrics(app, config.service_name)
+
 app.include_router(titanic_router, prefix="/titanic")
 if seoul_router is not None:
     app.include_router(seoul_router, prefix="/seoul")
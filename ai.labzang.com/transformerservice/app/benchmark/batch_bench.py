@@ -0,0 +1,97 @@
+"""
+KoELECTRA 배치 추론 처리량 벤치마크
+
+같은 텍스트 목록을 (1) 문장마다 `predict_sentiment` 를 호출하는 기존 방식과
+(2) 한 번에 토크나이징하고 서브 배치로 forward 하는 `predict_batch` 로 처리해
+처리량(문장/초)과 전체 지연을 비교합니다. 두 방식의 예측 레이블이 같은지도
+확인합니다.
+
+사용 예시 (transformerservice 디렉토리에서):
+    python -m app.benchmark.batch_bench
+    python -m app.benchmark.batch_bench --sizes 8 32 50 --batch-size 16 --repeat 5
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from app.koelectra.koelectra_service import get_sentiment_service
+
+SAMPLE_TEXTS = [
+    "이 영화는 정말 재미있고 감동적이었어요!",
+    "너무 지루하고 재미없었습니다.",
+    "연기가 훌륭하고 스토리도 완벽했습니다.",
+    "스토리가 뻔하고 연기도 어색했어요.",
+    "최고의 영화 중 하나예요. 강력 추천합니다!",
+    "시간 낭비였습니다. 추천하지 않아요.",
+    "웃음과 감동을 동시에 주는 멋진 작품이었어요. 배우들의 연기도 자연스럽고 음악도 좋았습니다.",
+    "그냥 평범한 영화였어요.",
+]
+
+
+def _texts(size: int) -> List[str]:
+    """SAMPLE_TEXTS 를 반복해 size 개의 텍스트 생성"""
+    return [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] for i in range(size)]
+
+
+def _measure(func: Callable[[], List[Dict]], repeat: int) -> Dict[str, float]:
+    """func 를 repeat 번 실행한 지연의 중앙값/최솟값(초)"""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return {"median": statistics.median(latencies), "min": min(latencies)}
+
+
+def run_benchmark(sizes: List[int], batch_size: int, repeat: int) -> List[Dict[str, float]]:
+    """입력 크기별로 기존 루프와 배치 추론을 비교"""
+    service = get_sentiment_service()
+    if not service.load_model():
+        raise RuntimeError("모델 로딩 실패")
+
+    # 워밍업 (커널 초기화 비용 제외)
+    service.predict_batch(_texts(batch_size), batch_size=batch_size)
+
+    results = []
+    for size in sizes:
+        texts = _texts(size)
+        loop = _measure(lambda: [service.predict_sentiment(t) for t in texts], repeat)
+        batched = _measure(lambda: service.predict_batch(texts, batch_size=batch_size), repeat)
+
+        loop_labels = [r["sentiment"] for r in (service.predict_sentiment(t) for t in texts)]
+        batch_labels = [r["sentiment"] for r in service.predict_batch(texts, batch_size=batch_size)]
+
+        result = {
+            "size": size,
+            "loop_per_sec": size / loop["median"],
+            "batch_per_sec": size / batched["median"],
+            "speedup": loop["median"] / batched["median"],
+            "labels_match": loop_labels == batch_labels,
+        }
+        results.append(result)
+        print(
+            f"size={size:>4}  "
+            f"loop={result['loop_per_sec']:8.1f} texts/s  "
+            f"batch={result['batch_per_sec']:8.1f} texts/s  "
+            f"speedup={result['speedup']:5.2f}x  "
+            f"labels_match={result['labels_match']}"
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="KoELECTRA 배치 추론 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 8, 16, 32, 50], help="입력 텍스트 수")
+    parser.add_argument("--batch-size", type=int, default=None, help="서브 배치 크기 (기본값: DEFAULT_BATCH_SIZE)")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    from app.config import config
+
+    run_benchmark(args.sizes, args.batch_size or config.DEFAULT_BATCH_SIZE, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+/analyze 동시 요청 처리량 벤치마크 (마이크로 배칭 효과 측정)
+
+실행 중인 서버의 `/api/transformer/koelectra/analyze` 에 동시 요청 수를 늘려가며
+요청을 보내고 단계별 처리량과 지연(p50/p95)을 출력합니다. 마이크로 배칭을 켜면
+(USE_MICRO_BATCHING=true) 동시 요청이 forward 한 번으로 묶이므로 동시성이
+늘어날수록 처리량이 함께 증가하고, 지연은 MICRO_BATCH_MAX_WAIT_MS + 배치 forward
+시간 안에서 유지되어야 합니다. 끈 상태로 한 번 더 실행해 비교하세요.
+
+사용 예시:
+    python -m app.benchmark.concurrency_bench
+    python -m app.benchmark.concurrency_bench --requests 256 --concurrency 1 4 16 32
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+ENDPOINT = "/api/transformer/koelectra/analyze"
+
+
+async def _run_level(
+    client: httpx.AsyncClient,
+    text: str,
+    total_requests: int,
+    concurrency: int,
+) -> Dict[str, float]:
+    """주어진 동시성으로 total_requests 개의 요청을 보내고 결과를 집계"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one_request() -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.post(ENDPOINT, json={"text": text})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+            except httpx.HTTPError:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(total_requests)))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies) or [0.0]
+    return {
+        "concurrency": concurrency,
+        "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "errors": errors,
+    }
+
+
+async def run_benchmark(
+    base_url: str,
+    text: str,
+    total_requests: int,
+    levels: List[int],
+    timeout: float,
+) -> List[Dict[str, float]]:
+    """동시성 단계별로 벤치마크를 실행하고 결과 목록을 반환"""
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        # 워밍업 (지연 로딩되는 모델 로딩 비용 제외)
+        await _run_level(client, text, 1, 1)
+
+        results = []
+        for level in levels:
+            result = await _run_level(client, text, total_requests, level)
+            results.append(result)
+            print(
+                f"concurrency={result['concurrency']:>3}  "
+                f"throughput={result['throughput']:7.2f} req/s  "
+                f"p50={result['p50_ms']:8.1f} ms  "
+                f"p95={result['p95_ms']:8.1f} ms  "
+                f"errors={result['errors']}"
+            )
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="KoELECTRA /analyze 동시성 벤치마크")
+    parser.add_argument("--url", default="http://localhost:9020", help="서버 주소")
+    parser.add_argument("--text", default="이 영화는 정말 재미있고 감동적이었어요!", help="분석할 문장")
+    parser.add_argument("--requests", type=int, default=128, help="단계별 요청 수")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32], help="동시성 단계"
+    )
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃(초)")
+    args = parser.parse_args()
+
+    asyncio.run(run_benchmark(args.url, args.text, args.requests, args.concurrency, args.timeout))
+
+
+if __name__ == "__main__":
+    main()
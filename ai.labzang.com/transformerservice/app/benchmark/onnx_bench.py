@@ -0,0 +1,112 @@
+"""
+KoELECTRA 추론 백엔드 벤치마크 (PyTorch FP32 vs ONNX Runtime FP32 vs ONNX INT8)
+
+같은 입력을 백엔드별로 forward 해 배치 크기별 지연(중앙값)과 처리량(문장/초)을
+비교하고, PyTorch 출력과의 정합성(최대 확률 차이, 레이블 일치율)을 함께 출력합니다.
+ONNX 모델은 ONNX_MODEL_DIR 에 내보내고 재사용합니다.
+
+사용 예시 (transformerservice 디렉토리에서):
+    python -m app.benchmark.onnx_bench
+    python -m app.benchmark.onnx_bench --batch-sizes 1 8 32 --threads 4 --repeat 20
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+import torch
+
+from app.benchmark.batch_bench import SAMPLE_TEXTS, _texts
+from app.config import config
+from app.koelectra.koelectra_service import get_sentiment_service
+from app.koelectra.onnx_backend import check_parity, create_onnx_backend
+
+
+def _median_latency(func: Callable[[], object], repeat: int) -> float:
+    """func 를 repeat 번 실행한 지연의 중앙값(초)"""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies)
+
+
+def run_benchmark(batch_sizes: List[int], threads: int, repeat: int) -> List[Dict[str, float]]:
+    """백엔드 및 배치 크기별 지연/처리량 측정"""
+    service = get_sentiment_service()
+    if not service.load_model():
+        raise RuntimeError("모델 로딩 실패")
+
+    # 비교 기준은 CPU PyTorch (ONNX 백엔드는 CPU 에서 실행)
+    model = service.model.to("cpu")
+    torch.set_num_threads(threads or torch.get_num_threads())
+
+    backends: Dict[str, Callable[[Dict[str, torch.Tensor]], torch.Tensor]] = {
+        "pytorch-fp32": lambda batch: model(**batch).logits
+    }
+    for name, quantize in (("onnx-fp32", False), ("onnx-int8", True)):
+        backend = create_onnx_backend(
+            model,
+            service.tokenizer,
+            service.model_path,
+            config.ONNX_MODEL_DIR,
+            quantize=quantize,
+            intra_op_threads=threads
+        )
+        parity = check_parity(model, service.tokenizer, backend, SAMPLE_TEXTS, service.max_length)
+        print(
+            f"{name}: {backend.info()['size_mb']}MB  "
+            f"max_abs_diff={parity['max_abs_diff']:.5f}  "
+            f"label_agreement={parity['label_agreement']:.2%}"
+        )
+        backends[name] = backend.logits
+
+    results = []
+    with torch.no_grad():
+        for batch_size in batch_sizes:
+            batch = dict(service.tokenizer(
+                _texts(batch_size),
+                padding="longest",
+                truncation=True,
+                max_length=service.max_length,
+                return_tensors="pt"
+            ))
+            baseline = None
+            for name, forward in backends.items():
+                forward(batch)  # 워밍업
+                latency = _median_latency(lambda: forward(batch), repeat)
+                baseline = baseline or latency
+                result = {
+                    "backend": name,
+                    "batch_size": batch_size,
+                    "latency_ms": latency * 1000,
+                    "texts_per_sec": batch_size / latency,
+                    "speedup": baseline / latency,
+                }
+                results.append(result)
+                print(
+                    f"batch={batch_size:>3}  {name:<13} "
+                    f"latency={result['latency_ms']:8.2f}ms  "
+                    f"throughput={result['texts_per_sec']:8.1f} texts/s  "
+                    f"speedup={result['speedup']:5.2f}x"
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="KoELECTRA 추론 백엔드 벤치마크")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32], help="forward 배치 크기")
+    parser.add_argument(
+        "--threads", type=int, default=config.ONNX_INTRA_OP_THREADS,
+        help="연산 내부 스레드 수 (0: 기본값)"
+    )
+    parser.add_argument("--repeat", type=int, default=10, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    run_benchmark(args.batch_sizes, args.threads, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
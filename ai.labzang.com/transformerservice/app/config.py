@@ -28,6 +28,10 @@ class TransformerConfig:
     # 허깅페이스 모델 설정 (대안)
     HUGGINGFACE_MODEL_NAME: str = "monologg/koelectra-small-v3-discriminator"
     
+    # 가중치 로딩 설정 (safetensors mmap 로드, checksums.json SHA-256 검증)
+    MODEL_VERIFY_CHECKSUM: bool = os.getenv("MODEL_VERIFY_CHECKSUM", "true").lower() == "true"
+    MODEL_CONVERT_TO_SAFETENSORS: bool = os.getenv("MODEL_CONVERT_TO_SAFETENSORS", "true").lower() == "true"
+    
     # 모델 캐시 설정
     MODEL_CACHE_DIR: str = "app/koelectra/cache"
     TRANSFORMERS_CACHE: str = os.getenv("TRANSFORMERS_CACHE", MODEL_CACHE_DIR)
@@ -35,9 +39,9 @@ class TransformerConfig:
     # ========================================================================
     # 토크나이저 설정
     # ========================================================================
-    MAX_SEQUENCE_LENGTH: int = 512
+    MAX_SEQUENCE_LENGTH: int = 512  # 잘라내기 상한 (패딩 길이 아님)
     TOKENIZER_DO_LOWER_CASE: bool = False
-    PADDING: str = "max_length"
+    PADDING: str = "longest"  # 배치 안에서 가장 긴 문장 길이로 동적 패딩
     TRUNCATION: bool = True
     
     # ========================================================================
@@ -52,6 +56,21 @@ class TransformerConfig:
     MAX_BATCH_SIZE: int = int(os.getenv("MAX_BATCH_SIZE", "50"))
     DEFAULT_BATCH_SIZE: int = int(os.getenv("DEFAULT_BATCH_SIZE", "8"))
     
+    # 마이크로 배칭 설정 (/analyze, /quick 동시 요청을 모아 forward 한 번으로 처리)
+    USE_MICRO_BATCHING: bool = os.getenv("USE_MICRO_BATCHING", "true").lower() == "true"
+    MICRO_BATCH_MAX_SIZE: int = int(os.getenv("MICRO_BATCH_MAX_SIZE", "16"))
+    MICRO_BATCH_MAX_WAIT_MS: float = float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "10"))
+
+    # 추론 백엔드 설정 (pytorch | onnx) - onnx 는 CPU 에서 onnxruntime 으로 실행
+    INFERENCE_BACKEND: str = os.getenv("INFERENCE_BACKEND", "pytorch").lower()
+    ONNX_MODEL_DIR: str = os.getenv("ONNX_MODEL_DIR", "app/koelectra/onnx")
+    ONNX_QUANTIZE: bool = os.getenv("ONNX_QUANTIZE", "false").lower() == "true"  # 동적 INT8 양자화
+    ONNX_INTRA_OP_THREADS: int = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))  # 0: 물리 코어 수
+    ONNX_INTER_OP_THREADS: int = int(os.getenv("ONNX_INTER_OP_THREADS", "1"))
+    # 로딩 시 PyTorch 출력과 비교해 확률 차이가 허용치를 넘거나 레이블이 다르면 PyTorch 로 되돌림
+    ONNX_PARITY_CHECK: bool = os.getenv("ONNX_PARITY_CHECK", "true").lower() == "true"
+    ONNX_PARITY_TOLERANCE: float = float(os.getenv("ONNX_PARITY_TOLERANCE", "0.05"))
+
     # 신뢰도 임계값
     CONFIDENCE_THRESHOLD: float = float(os.getenv("CONFIDENCE_THRESHOLD", "0.5"))
     
@@ -104,6 +123,8 @@ class TransformerConfig:
     # ========================================================================
     HEALTH_CHECK_TIMEOUT: int = int(os.getenv("HEALTH_CHECK_TIMEOUT", "30"))
     HEALTH_CHECK_TEXT: str = "이것은 테스트 문장입니다."
+    # 상태 갱신 주기(초) - 헬스체크 엔드포인트는 갱신된 상태만 읽고 추론하지 않음
+    HEALTH_CHECK_INTERVAL: float = float(os.getenv("HEALTH_CHECK_INTERVAL", "15"))
     
     # ========================================================================
     # 개발/프로덕션 설정
@@ -141,12 +162,15 @@ class TransformerConfig:
         model_path = cls.get_model_path()
         required_files = [
             "config.json",
-            "pytorch_model.bin",
             "tokenizer_config.json",
             "vocab.txt"
         ]
+        weight_files = ["model.safetensors", "pytorch_model.bin"]
         
-        return all((model_path / file).exists() for file in required_files)
+        return (
+            all((model_path / file).exists() for file in required_files)
+            and any((model_path / file).exists() for file in weight_files)
+        )
     
     @classmethod
     def get_device_info(cls) -> dict:
@@ -77,10 +77,11 @@ async def analyze_sentiment(request: SentimentRequest):
     
     - **text**: 감성분석할 텍스트 (최대 1000자)
     - 반환값: 감성(긍정/부정), 신뢰도, 확률 분포
+    - 동시에 들어온 요청은 마이크로 배치로 묶어 한 번에 추론합니다
     """
     try:
         service = get_sentiment_service()
-        result = service.predict_sentiment(request.text)
+        result = await service.apredict(request.text)
         
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
@@ -113,7 +114,7 @@ async def analyze_batch_sentiment(request: BatchSentimentRequest):
     """
     try:
         service = get_sentiment_service()
-        results = service.predict_batch(request.texts)
+        results = await service.apredict_batch(request.texts)
         
         # 에러가 있는 결과 확인
         error_count = sum(1 for result in results if "error" in result)
@@ -151,7 +152,7 @@ async def quick_analyze(
     """
     try:
         service = get_sentiment_service()
-        result = service.predict_sentiment(text)
+        result = await service.apredict(text)
         
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
@@ -210,18 +211,19 @@ async def health_check():
     """
     서비스 상태 확인
     
-    - 모델 로딩 상태 및 서비스 정상 작동 여부 확인
+    - 모델 로딩 상태와 마지막 추론 지연 반환 (추론을 새로 실행하지 않음)
+    - 모델 로딩에 실패한 경우에만 503
     """
     try:
         service = get_sentiment_service()
         health_status = service.health_check()
         
-        status_code = 200 if health_status["status"] == "healthy" else 503
+        status_code = 503 if health_status["status"] == "error" else 200
         
         return JSONResponse(
             status_code=status_code,
             content={
-                "success": health_status["status"] == "healthy",
+                "success": status_code == 200,
                 "data": health_status,
                 "message": f"서비스 상태: {health_status['status']}"
             }
@@ -271,14 +273,14 @@ async def get_examples():
         ]
     }
     
-        return JSONResponse(
-            status_code=200,
-            content={
-                "success": True,
-                "data": examples,
-                "message": "감성분석 예제 텍스트를 제공합니다"
-            }
-        )
+    return JSONResponse(
+        status_code=200,
+        content={
+            "success": True,
+            "data": examples,
+            "message": "감성분석 예제 텍스트를 제공합니다"
+        }
+    )
 
 @router.post("/train")
 async def train_model():
@@ -4,21 +4,36 @@ KoELECTRA 감성분석 서비스
 """
 
 import os
+import time
+import asyncio
 import torch
 import logging
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 import numpy as np
-from transformers import (
-    AutoTokenizer, 
-    AutoModelForSequenceClassification,
-    ElectraTokenizer,
-    ElectraForSequenceClassification
-)
-import json
+
+from app.config import config
+from app.koelectra.model_loader import load_sentiment_model
+from app.koelectra.onnx_backend import OnnxSentimentBackend, check_parity, create_onnx_backend
+
+try:
+    from common.metrics import observe_batch, observe_stage, register_gauge
+except ImportError:
+    # common 모듈 없이 단독 실행하는 경우 (학습 스크립트 등) 메트릭 생략
+    def observe_stage(service: str, stage: str, seconds: float) -> None:
+        pass
+
+    def observe_batch(service: str, batch_size: int, tokens: int, seconds: float) -> None:
+        pass
+
+    def register_gauge(name: str, documentation: str, func) -> None:
+        pass
 
 logger = logging.getLogger(__name__)
 
+METRICS_SERVICE = "transformerservice"
+
 class KoELECTRASentimentService:
     """KoELECTRA 기반 감성분석 서비스"""
     
@@ -38,7 +53,13 @@ class KoELECTRASentimentService:
             self.model_path = self.base_model_path
             logger.info("기본 모델을 사용합니다")
             
-        self.max_length = 512
+        self.max_length = config.MAX_SEQUENCE_LENGTH
+        
+        # 추론 백엔드 (onnx 는 load_model 에서 준비되고, 실패하면 pytorch 로 동작)
+        self.backend = "pytorch"
+        self.onnx_backend: Optional[OnnxSentimentBackend] = None
+        self.onnx_parity: Optional[Dict[str, Any]] = None
+        self.load_info: Optional[Dict[str, Any]] = None
         
         # 감성 레이블 매핑
         self.label_mapping = {
@@ -46,6 +67,24 @@ class KoELECTRASentimentService:
             1: "긍정"
         }
         
+        # 헬스체크용 상태 (추론 없이 보고)
+        self._load_error: Optional[str] = None
+        self._last_inference: Optional[Dict[str, Any]] = None
+        self._inference_count = 0
+        self._error_count = 0
+        self._health: Optional[Dict[str, Any]] = None
+        
+        # 마이크로 배칭 (추론은 전용 스레드 하나에서 순서대로 실행)
+        self.micro_batch_max_size = config.MICRO_BATCH_MAX_SIZE
+        self.micro_batch_max_wait = config.MICRO_BATCH_MAX_WAIT_MS / 1000
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="koelectra-inference")
+        self._queue: Optional[asyncio.Queue] = None
+        self._batch_worker: Optional[asyncio.Task] = None
+        # 큐에서 꺼냈지만 아직 결과를 받지 못한 요청 (워커 종료 시 함께 취소)
+        self._inflight: List[asyncio.Future] = []
+        self._micro_batches = 0
+        self._micro_batch_requests = 0
+        
         logger.info(f"KoELECTRA 서비스 초기화 - 디바이스: {self.device}")
     
     def load_model(self) -> bool:
@@ -59,56 +98,75 @@ class KoELECTRASentimentService:
             
             logger.info(f"모델 로딩 시작: {model_path}")
             
-            # 토크나이저 로드
-            self.tokenizer = ElectraTokenizer.from_pretrained(
+            # 분류 헤드를 포함한 체크포인트 전체 로드 (safetensors mmap, 체크섬 검증, 프로세스 캐시)
+            loaded = load_sentiment_model(
                 str(model_path),
-                do_lower_case=False
+                self.device,
+                num_labels=len(self.label_mapping),
+                verify=config.MODEL_VERIFY_CHECKSUM,
+                convert=config.MODEL_CONVERT_TO_SAFETENSORS
             )
+            self.tokenizer = loaded.tokenizer
+            self.model = loaded.model
+            self.load_info = loaded.info()
             
-            # 모델 로드 (감성분석용으로 수정)
-            # 기본 ELECTRA 모델을 감성분석용으로 변환
-            from transformers import ElectraConfig
-            
-            config = ElectraConfig.from_pretrained(str(model_path))
-            config.num_labels = 2  # 긍정/부정 이진 분류
-            
-            # 감성분석용 모델 생성
-            self.model = ElectraForSequenceClassification(config)
-            
-            # 사전 훈련된 가중치 로드 (분류 헤드 제외)
-            pretrained_dict = torch.load(
-                model_path / "pytorch_model.bin", 
-                map_location=self.device
-            )
-            
-            # 모델 상태 딕셔너리 가져오기
-            model_dict = self.model.state_dict()
-            
-            # 사전 훈련된 가중치 중 모델과 일치하는 것만 필터링
-            filtered_dict = {
-                k: v for k, v in pretrained_dict.items() 
-                if k in model_dict and model_dict[k].shape == v.shape
-            }
-            
-            # 가중치 업데이트
-            model_dict.update(filtered_dict)
-            self.model.load_state_dict(model_dict, strict=False)
-            
-            # 분류 헤드 초기화 (랜덤 가중치)
-            if hasattr(self.model, 'classifier'):
-                torch.nn.init.normal_(self.model.classifier.weight, std=0.02)
-                torch.nn.init.zeros_(self.model.classifier.bias)
-            
-            self.model.to(self.device)
-            self.model.eval()
+            if config.INFERENCE_BACKEND == "onnx":
+                self._load_onnx_backend()
             
+            self._load_error = None
             logger.info("✅ KoELECTRA 모델 로딩 완료")
             return True
             
         except Exception as e:
+            self._load_error = str(e)
             logger.error(f"❌ 모델 로딩 실패: {str(e)}")
             return False
     
+    def _load_onnx_backend(self) -> None:
+        """
+        ONNX Runtime 백엔드 준비 (필요하면 내보내기/INT8 양자화)
+        
+        분류 헤드가 학습되지 않았거나, 준비에 실패하거나, PyTorch 출력과의 차이가
+        ONNX_PARITY_TOLERANCE 를 넘으면 경고를 남기고 PyTorch 백엔드를 그대로 사용합니다.
+        """
+        if self.load_info is not None and not self.load_info["head_trained"]:
+            logger.warning("⚠️ 분류 헤드가 학습되지 않은 모델은 ONNX 로 내보내지 않고 PyTorch 로 추론합니다")
+            return
+        
+        try:
+            backend = create_onnx_backend(
+                self.model,
+                self.tokenizer,
+                self.model_path,
+                config.ONNX_MODEL_DIR,
+                quantize=config.ONNX_QUANTIZE,
+                intra_op_threads=config.ONNX_INTRA_OP_THREADS,
+                inter_op_threads=config.ONNX_INTER_OP_THREADS
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ ONNX 백엔드 준비 실패, PyTorch 로 추론합니다: {str(e)}")
+            return
+        
+        if config.ONNX_PARITY_CHECK:
+            self.onnx_parity = check_parity(self.model, self.tokenizer, backend, max_length=self.max_length)
+            logger.info(f"ONNX 정합성 검사: {self.onnx_parity}")
+            if (
+                self.onnx_parity["max_abs_diff"] > config.ONNX_PARITY_TOLERANCE
+                or self.onnx_parity["label_agreement"] < 1.0
+            ):
+                logger.warning("⚠️ ONNX 출력이 PyTorch 와 달라 PyTorch 로 추론합니다")
+                return
+        
+        self.onnx_backend = backend
+        self.backend = "onnx-int8" if config.ONNX_QUANTIZE else "onnx"
+        logger.info(f"✅ ONNX Runtime 백엔드 사용: {backend.info()}")
+    
+    def _forward_logits(self, inputs: Dict[str, torch.Tensor]) -> torch.Tensor:
+        """선택된 백엔드로 forward 해 로짓 반환"""
+        if self.onnx_backend is not None:
+            return self.onnx_backend.logits(inputs)
+        return self.model(**inputs).logits
+    
     def preprocess_text(self, text: str) -> str:
         """텍스트 전처리"""
         if not text:
@@ -136,69 +194,275 @@ class KoELECTRASentimentService:
             if not processed_text:
                 return {"error": "빈 텍스트입니다"}
             
-            # 토크나이징
+            # 토크나이징 (단일 문장이므로 패딩 없음, max_length 는 잘라내기 상한)
+            start = time.perf_counter()
             inputs = self.tokenizer(
                 processed_text,
                 return_tensors="pt",
                 max_length=self.max_length,
-                padding=True,
                 truncation=True
             )
             
             # 디바이스로 이동
             inputs = {k: v.to(self.device) for k, v in inputs.items()}
+            observe_stage(METRICS_SERVICE, "tokenize", time.perf_counter() - start)
             
             # 추론
+            start = time.perf_counter()
             with torch.no_grad():
-                outputs = self.model(**inputs)
-                logits = outputs.logits
+                logits = self._forward_logits(inputs)
                 
                 # 소프트맥스로 확률 계산
                 probabilities = torch.nn.functional.softmax(logits, dim=-1)
-                predicted_class = torch.argmax(probabilities, dim=-1).item()
-                confidence = probabilities[0][predicted_class].item()
+            forward_seconds = time.perf_counter() - start
+            self._record_inference(forward_seconds, batch_size=1)
+            observe_stage(METRICS_SERVICE, "forward", forward_seconds)
+            observe_batch(
+                METRICS_SERVICE, 1, int(inputs["attention_mask"].sum().item()), forward_seconds
+            )
             
             # 결과 구성
-            result = {
-                "text": text,
-                "sentiment": self.label_mapping[predicted_class],
-                "confidence": round(confidence, 4),
-                "probabilities": {
-                    "부정": round(probabilities[0][0].item(), 4),
-                    "긍정": round(probabilities[0][1].item(), 4)
-                },
-                "model_info": {
-                    "model_type": "KoELECTRA",
-                    "device": str(self.device)
-                }
-            }
+            start = time.perf_counter()
+            result = self._build_result(text, probabilities[0].tolist())
+            observe_stage(METRICS_SERVICE, "serialize", time.perf_counter() - start)
             
             logger.info(f"감성분석 완료 - 텍스트: '{text[:50]}...', 결과: {result['sentiment']}")
             return result
             
         except Exception as e:
+            self._error_count += 1
             logger.error(f"감성분석 실패: {str(e)}")
             return {"error": f"감성분석 실패: {str(e)}"}
     
-    def predict_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
-        """배치 텍스트 감성분석"""
+    def _build_result(self, text: str, probabilities: List[float]) -> Dict[str, Any]:
+        """클래스별 확률로 감성분석 결과 구성"""
+        predicted_class = int(np.argmax(probabilities))
+        return {
+            "text": text,
+            "sentiment": self.label_mapping[predicted_class],
+            "confidence": round(probabilities[predicted_class], 4),
+            "probabilities": {
+                "부정": round(probabilities[0], 4),
+                "긍정": round(probabilities[1], 4)
+            },
+            "model_info": {
+                "model_type": "KoELECTRA",
+                "device": str(self.device),
+                "backend": self.backend
+            }
+        }
+    
+    def predict_batch(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        배치 텍스트 감성분석
+        
+        전체 텍스트를 한 번에 토크나이징한 뒤 길이 순으로 정렬해 batch_size 개씩
+        forward 하고, 전체 로짓에 softmax 를 한 번 적용합니다. 각 서브 배치는
+        그 안에서 가장 긴 문장 길이로만 패딩하므로 (max_length=512 까지 채우지
+        않음) 어텐션 연산이 실제 길이에 비례합니다.
+        
+        Args:
+            texts: 감성분석할 텍스트 리스트
+            batch_size: forward 한 번에 넣을 문장 수 (기본값: config.DEFAULT_BATCH_SIZE)
+        
+        Returns:
+            입력 순서와 같은 순서의 결과 리스트 (빈 텍스트는 개별 에러)
+        """
         try:
             if not self.model or not self.tokenizer:
                 if not self.load_model():
                     return [{"error": "모델 로딩 실패"} for _ in texts]
             
-            results = []
+            batch_size = batch_size or config.DEFAULT_BATCH_SIZE
+            results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
             
-            for text in texts:
-                result = self.predict_sentiment(text)
-                results.append(result)
+            # 텍스트 전처리 (빈 텍스트는 추론에서 제외)
+            indices = []
+            processed_texts = []
+            for i, text in enumerate(texts):
+                processed_text = self.preprocess_text(text)
+                if processed_text:
+                    indices.append(i)
+                    processed_texts.append(processed_text)
+                else:
+                    results[i] = {"error": "빈 텍스트입니다"}
             
+            if processed_texts:
+                # 토크나이징 (한 번, 패딩 없이 길이만 구함)
+                start = time.perf_counter()
+                encodings = self.tokenizer(
+                    processed_texts,
+                    max_length=self.max_length,
+                    truncation=True
+                )
+                # 길이 순으로 정렬해 비슷한 길이끼리 서브 배치를 구성 (길이 버킷팅)
+                order = sorted(
+                    range(len(processed_texts)),
+                    key=lambda j: len(encodings["input_ids"][j])
+                )
+                observe_stage(METRICS_SERVICE, "tokenize", time.perf_counter() - start)
+                
+                # 서브 배치 forward (각 배치는 그 안에서 가장 긴 문장 길이로 패딩)
+                start = time.perf_counter()
+                all_logits = []
+                with torch.no_grad():
+                    for offset in range(0, len(order), batch_size):
+                        batch_start = time.perf_counter()
+                        batch_order = order[offset:offset + batch_size]
+                        batch = self.tokenizer.pad(
+                            {k: [v[j] for j in batch_order] for k, v in encodings.items()},
+                            padding="longest",
+                            return_tensors="pt"
+                        )
+                        batch = {k: v.to(self.device) for k, v in batch.items()}
+                        all_logits.append(self._forward_logits(batch))
+                        observe_batch(
+                            METRICS_SERVICE,
+                            len(batch_order),
+                            int(batch["attention_mask"].sum().item()),
+                            time.perf_counter() - batch_start
+                        )
+                    
+                    # 소프트맥스는 전체 로짓에 한 번 적용
+                    probabilities = torch.nn.functional.softmax(
+                        torch.cat(all_logits), dim=-1
+                    ).cpu().tolist()
+                forward_seconds = time.perf_counter() - start
+                self._record_inference(forward_seconds, batch_size=len(processed_texts))
+                observe_stage(METRICS_SERVICE, "forward", forward_seconds)
+                
+                # 결과 구성 (정렬 전 입력 순서로 복원)
+                start = time.perf_counter()
+                for j, probs in zip(order, probabilities):
+                    i = indices[j]
+                    results[i] = self._build_result(texts[i], probs)
+                observe_stage(METRICS_SERVICE, "serialize", time.perf_counter() - start)
+            
+            logger.info(f"배치 감성분석 완료 - {len(processed_texts)}/{len(texts)}개 텍스트")
             return results
             
         except Exception as e:
+            self._error_count += 1
             logger.error(f"배치 감성분석 실패: {str(e)}")
             return [{"error": f"배치 감성분석 실패: {str(e)}"} for _ in texts]
     
+    # ------------------------------------------------------------------
+    # 비동기 API (이벤트 루프를 막지 않음)
+    # ------------------------------------------------------------------
+    
+    async def run_in_inference_thread(self, func, *args) -> Any:
+        """추론 전용 스레드에서 func 실행 (모델 forward 가 동시에 겹치지 않음)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+    
+    async def apredict(self, text: str) -> Dict[str, Any]:
+        """
+        단일 텍스트 감성분석 (마이크로 배칭)
+        
+        동시에 들어온 요청을 최대 MICRO_BATCH_MAX_WAIT_MS 동안, 최대
+        MICRO_BATCH_MAX_SIZE 개까지 모아 forward 한 번으로 처리합니다.
+        """
+        if not config.USE_MICRO_BATCHING:
+            return await self.run_in_inference_thread(self.predict_sentiment, text)
+        
+        self.start_batcher()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+    
+    async def apredict_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """배치 텍스트 감성분석 (추론 전용 스레드에서 실행)"""
+        return await self.run_in_inference_thread(self.predict_batch, texts)
+    
+    def start_batcher(self) -> None:
+        """마이크로 배칭 워커 시작 (실행 중인 이벤트 루프 안에서 호출)"""
+        if self._batch_worker is None:
+            self._queue = asyncio.Queue()
+            self._batch_worker = asyncio.create_task(self._run_batcher())
+            register_gauge(
+                "inference_queue_depth",
+                "마이크로 배칭 대기 요청 수",
+                lambda: self._queue.qsize() if self._queue is not None else 0
+            )
+    
+    async def stop_batcher(self) -> None:
+        """워커 종료 및 처리 중/대기 중인 요청 취소"""
+        if self._batch_worker is not None:
+            self._batch_worker.cancel()
+            await asyncio.gather(self._batch_worker, return_exceptions=True)
+            self._batch_worker = None
+        for future in self._inflight:
+            if not future.done():
+                future.cancel()
+        self._inflight = []
+        while self._queue is not None and not self._queue.empty():
+            self._queue.get_nowait()[1].cancel()
+    
+    async def _collect_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        """첫 요청 이후 최대 대기 시간 또는 최대 개수까지 요청 수집"""
+        batch = [await self._queue.get()]
+        self._inflight.append(batch[0][1])
+        deadline = time.perf_counter() + self.micro_batch_max_wait
+        while len(batch) < self.micro_batch_max_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+            self._inflight.append(batch[-1][1])
+        return batch
+    
+    async def _run_batcher(self) -> None:
+        """요청을 모아 predict_batch 를 실행하고 각 요청의 future 에 결과 전달"""
+        while True:
+            batch = await self._collect_batch()
+            # 클라이언트 연결이 끊겨 취소된 요청은 제외
+            batch = [(text, future) for text, future in batch if not future.cancelled()]
+            if not batch:
+                self._inflight = []
+                continue
+            
+            try:
+                results = await self.run_in_inference_thread(
+                    self.predict_batch, [text for text, _ in batch], len(batch)
+                )
+            except Exception as e:
+                logger.error(f"마이크로 배치 추론 실패 (batch_size={len(batch)}): {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                self._inflight = []
+                continue
+            
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+            self._inflight = []
+            
+            self._micro_batches += 1
+            self._micro_batch_requests += len(batch)
+    
+    def batcher_stats(self) -> Dict[str, Any]:
+        """마이크로 배칭 통계"""
+        return {
+            "enabled": config.USE_MICRO_BATCHING,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "batches": self._micro_batches,
+            "requests": self._micro_batch_requests,
+            "avg_batch_size": (
+                round(self._micro_batch_requests / self._micro_batches, 2)
+                if self._micro_batches else 0.0
+            ),
+            "max_batch_size": self.micro_batch_max_size,
+            "max_wait_ms": self.micro_batch_max_wait * 1000
+        }
+    
     def get_model_info(self) -> Dict[str, Any]:
         """모델 정보 반환"""
         return {
@@ -206,30 +470,67 @@ class KoELECTRASentimentService:
             "model_path": self.model_path,
             "device": str(self.device),
             "max_length": self.max_length,
+            "backend": self.backend,
+            "load_info": self.load_info,
+            "onnx": self.onnx_backend.info() if self.onnx_backend is not None else None,
+            "onnx_parity": self.onnx_parity,
             "labels": list(self.label_mapping.values()),
             "loaded": self.model is not None and self.tokenizer is not None
         }
     
+    def _record_inference(self, seconds: float, batch_size: int) -> None:
+        """마지막 추론 지연 기록 (헬스체크에서 재사용)"""
+        self._inference_count += 1
+        self._last_inference = {
+            "latency_ms": round(seconds * 1000, 2),
+            "batch_size": batch_size,
+            "timestamp": time.time()
+        }
+    
+    def refresh_health(self) -> Dict[str, Any]:
+        """
+        서비스 상태 갱신 (추론을 실행하지 않음)
+        
+        모델/토크나이저 로딩 여부와 마지막 실제 추론의 지연만 확인합니다.
+        아직 요청이 없어 모델을 지연 로딩 중이면 "idle" 로 보고합니다.
+        """
+        loaded = self.model is not None and self.tokenizer is not None
+        if loaded:
+            status = "healthy"
+        elif self._load_error is not None:
+            status = "error"
+        else:
+            status = "idle"
+        
+        health = {
+            "status": status,
+            "model_loaded": self.model is not None,
+            "tokenizer_loaded": self.tokenizer is not None,
+            "device": str(self.device),
+            "backend": self.backend,
+            "model_path": self.model_path,
+            "head_trained": self.load_info["head_trained"] if self.load_info else None,
+            "last_inference": self._last_inference,
+            "inference_count": self._inference_count,
+            "error_count": self._error_count,
+            "micro_batching": self.batcher_stats(),
+            "checked_at": time.time()
+        }
+        if self._load_error is not None:
+            health["error"] = self._load_error
+        if loaded and self.device.type == "cuda":
+            health["cuda_memory_allocated_mb"] = round(
+                torch.cuda.memory_allocated(self.device) / (1024 * 1024), 1
+            )
+        
+        self._health = health
+        return health
+    
     def health_check(self) -> Dict[str, Any]:
-        """서비스 상태 확인"""
-        try:
-            # 간단한 테스트 문장으로 확인
-            test_result = self.predict_sentiment("이 영화는 정말 재미있어요!")
-            
-            return {
-                "status": "healthy" if "error" not in test_result else "error",
-                "model_loaded": self.model is not None,
-                "tokenizer_loaded": self.tokenizer is not None,
-                "device": str(self.device),
-                "test_prediction": test_result
-            }
-        except Exception as e:
-            return {
-                "status": "error",
-                "error": str(e),
-                "model_loaded": False,
-                "tokenizer_loaded": False
-            }
+        """서비스 상태 확인 (백그라운드 작업이 갱신한 상태 반환)"""
+        if self._health is None:
+            return self.refresh_health()
+        return self._health
 
 
 # 싱글톤 인스턴스
@@ -0,0 +1,236 @@
+"""
+KoELECTRA 체크포인트 로더
+
+- `from_pretrained` 로 분류 헤드를 포함한 전체 가중치를 그대로 로드합니다.
+  (파인튜닝된 모델의 분류 헤드를 다시 초기화하지 않음)
+- 가중치는 safetensors(`model.safetensors`) 를 우선 사용합니다. 파일을 mmap 으로
+  열어 필요한 텐서만 읽으므로 `torch.load` 처럼 pickle 을 풀거나 전체 state dict 를
+  한 번 더 복사하지 않습니다. `pytorch_model.bin` 만 있으면 한 번 변환해 둡니다.
+- 로드 전에 학습/변환 시 기록한 `checksums.json` 의 SHA-256 과 비교해 손상/교체된
+  가중치를 거부합니다. 매니페스트가 없으면 경고만 남기고 검증하지 않습니다
+  (로드 시점에 만든 매니페스트는 검증이 아니므로 만들지 않음).
+- 파일 해시는 (경로, 크기, 수정 시각) 별로 프로세스 안에 캐시되어 ONNX 내보내기
+  키 계산 등에서 가중치 파일을 다시 읽지 않습니다.
+- 로드한 모델은 (경로, 디바이스) 별로 프로세스 안에 캐시합니다.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+from transformers import ElectraForSequenceClassification, ElectraTokenizer
+
+logger = logging.getLogger(__name__)
+
+SAFETENSORS_WEIGHTS = "model.safetensors"
+PYTORCH_WEIGHTS = "pytorch_model.bin"
+CHECKSUM_MANIFEST = "checksums.json"
+
+
+class ChecksumMismatchError(ValueError):
+    """가중치 파일의 SHA-256 이 매니페스트와 다를 때"""
+
+
+@dataclass
+class LoadedModel:
+    """로드된 모델/토크나이저와 로딩 정보"""
+
+    model: ElectraForSequenceClassification
+    tokenizer: ElectraTokenizer
+    weights_file: str
+    load_seconds: float
+    # 체크포인트에 없어 새로 초기화된 가중치 (파인튜닝 전 기본 모델이면 분류 헤드)
+    missing_keys: List[str] = field(default_factory=list)
+
+    @property
+    def head_trained(self) -> bool:
+        """분류 헤드가 체크포인트에서 로드되었는지"""
+        return not any(key.startswith("classifier.") for key in self.missing_keys)
+
+    def info(self) -> Dict[str, Any]:
+        """로딩 정보"""
+        return {
+            "weights_file": self.weights_file,
+            "load_seconds": round(self.load_seconds, 3),
+            "head_trained": self.head_trained
+        }
+
+
+_cache: Dict[Tuple[str, str], LoadedModel] = {}
+_cache_lock = threading.Lock()
+
+# (경로, 크기, 수정 시각 ns) → SHA-256
+_digest_cache: Dict[Tuple[str, int, int], str] = {}
+_digest_lock = threading.Lock()
+
+
+def file_sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    """파일 SHA-256 (청크 단위로 읽음, 크기/수정 시각이 같으면 캐시된 값)"""
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _digest_lock:
+        cached = _digest_cache.get(key)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    with _digest_lock:
+        _digest_cache[key] = digest.hexdigest()
+    return digest.hexdigest()
+
+
+def write_checksums(model_dir: Path) -> Dict[str, str]:
+    """모델 디렉토리의 가중치 파일 SHA-256 매니페스트 작성 (학습 후 저장 시 호출)"""
+    checksums = {
+        name: file_sha256(model_dir / name)
+        for name in (SAFETENSORS_WEIGHTS, PYTORCH_WEIGHTS)
+        if (model_dir / name).exists()
+    }
+    with open(model_dir / CHECKSUM_MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(checksums, f, indent=2)
+    return checksums
+
+
+def verify_checksum(weights_path: Path) -> None:
+    """
+    학습/변환 시 기록한 매니페스트와 가중치 파일 SHA-256 비교
+
+    매니페스트나 해당 파일 항목이 없으면 경고만 남기고 검증하지 않습니다.
+    (매니페스트는 `write_checksums` 로 학습/변환 시에만 만듭니다)
+
+    Raises:
+        ChecksumMismatchError: 해시가 다를 때
+    """
+    manifest_path = weights_path.parent / CHECKSUM_MANIFEST
+    manifest: Dict[str, str] = {}
+    if manifest_path.exists():
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    expected = manifest.get(weights_path.name)
+    if expected is None:
+        logger.warning(
+            f"⚠️ {manifest_path} 에 {weights_path.name} 체크섬이 없어 검증하지 않습니다. "
+            "학습/변환 시 write_checksums 로 매니페스트를 만드세요."
+        )
+        return
+
+    actual = file_sha256(weights_path)
+    if actual != expected:
+        raise ChecksumMismatchError(
+            f"가중치 체크섬 불일치: {weights_path} (expected {expected[:12]}…, got {actual[:12]}…)"
+        )
+
+
+def convert_to_safetensors(model_dir: Path) -> Path:
+    """`pytorch_model.bin` 을 같은 키 이름의 `model.safetensors` 로 변환"""
+    from safetensors.torch import save_file
+
+    bin_path = model_dir / PYTORCH_WEIGHTS
+    verify_checksum(bin_path)
+
+    state_dict = torch.load(bin_path, map_location="cpu", weights_only=True)
+    output_path = model_dir / SAFETENSORS_WEIGHTS
+    save_file(
+        {k: v.contiguous() for k, v in state_dict.items()},
+        str(output_path),
+        metadata={"format": "pt"}
+    )
+    write_checksums(model_dir)
+    logger.info(f"✅ safetensors 변환 완료: {output_path}")
+    return output_path
+
+
+def _resolve_weights(model_dir: Path, convert: bool) -> Path:
+    """사용할 가중치 파일 결정 (safetensors 우선, 필요하면 변환)"""
+    safetensors_path = model_dir / SAFETENSORS_WEIGHTS
+    if safetensors_path.exists():
+        return safetensors_path
+
+    bin_path = model_dir / PYTORCH_WEIGHTS
+    if not bin_path.exists():
+        raise FileNotFoundError(f"가중치 파일이 없습니다: {model_dir}")
+    if convert:
+        try:
+            return convert_to_safetensors(model_dir)
+        except (ImportError, OSError) as e:
+            logger.warning(f"⚠️ safetensors 변환 실패, {PYTORCH_WEIGHTS} 를 사용합니다: {str(e)}")
+    return bin_path
+
+
+def load_sentiment_model(
+    model_path: str,
+    device: torch.device,
+    num_labels: int = 2,
+    verify: bool = True,
+    convert: bool = True
+) -> LoadedModel:
+    """
+    감성분류 모델/토크나이저 로드 (프로세스 안에서 캐시)
+
+    Args:
+        model_path: 모델 디렉토리
+        device: 모델을 올릴 디바이스
+        num_labels: 분류 레이블 수
+        verify: 가중치 SHA-256 검증 여부
+        convert: safetensors 가 없을 때 `pytorch_model.bin` 을 변환할지 여부
+
+    Raises:
+        FileNotFoundError: 가중치 파일이 없을 때
+        ChecksumMismatchError: 체크섬이 다를 때
+    """
+    model_dir = Path(model_path)
+    key = (str(model_dir.resolve()), str(device))
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        weights_path = _resolve_weights(model_dir, convert)
+        if verify:
+            verify_checksum(weights_path)
+
+        tokenizer = ElectraTokenizer.from_pretrained(str(model_dir), do_lower_case=False)
+        # low_cpu_mem_usage: 랜덤 초기화 없이 빈 모델에 체크포인트 텐서를 바로 채움
+        model, loading_info = ElectraForSequenceClassification.from_pretrained(
+            str(model_dir),
+            num_labels=num_labels,
+            use_safetensors=weights_path.name == SAFETENSORS_WEIGHTS,
+            low_cpu_mem_usage=True,
+            output_loading_info=True
+        )
+        model.to(device)
+        model.eval()
+
+        loaded = LoadedModel(
+            model=model,
+            tokenizer=tokenizer,
+            weights_file=weights_path.name,
+            load_seconds=time.perf_counter() - start,
+            missing_keys=list(loading_info.get("missing_keys", []))
+        )
+        if not loaded.head_trained:
+            logger.warning(
+                f"⚠️ {model_dir} 에 학습된 분류 헤드가 없어 새로 초기화했습니다. "
+                "파인튜닝 전이므로 예측은 의미가 없습니다."
+            )
+        logger.info(f"모델 로드 완료: {loaded.info()}")
+
+        _cache[key] = loaded
+        return loaded
+
+
+def clear_model_cache() -> None:
+    """프로세스 캐시 비우기 (가중치를 교체한 뒤 다시 로드할 때)"""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,220 @@
+"""
+KoELECTRA ONNX Runtime 추론 백엔드
+
+`ElectraForSequenceClassification` 을 ONNX 로 내보내고(배치/시퀀스 길이 동적 축),
+선택적으로 동적 INT8 양자화를 적용한 뒤 onnxruntime 세션으로 실행합니다.
+CPU 에서 eager PyTorch FP32 대신 사용하며, `INFERENCE_BACKEND=onnx` 로 선택합니다.
+
+- 내보낸 모델은 ONNX_MODEL_DIR 에 가중치 파일 SHA-256 접두사를 붙인 이름으로 저장되므로,
+  가중치가 바뀌면 (수정 시각과 무관하게) 새로 내보내고 이전 파일은 지웁니다.
+- `check_parity` 로 PyTorch 모델과 확률 차이/레이블 일치율을 확인합니다.
+"""
+
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import torch
+
+from app.koelectra.model_loader import PYTORCH_WEIGHTS, SAFETENSORS_WEIGHTS, file_sha256
+
+logger = logging.getLogger(__name__)
+
+ONNX_INPUT_NAMES = ["input_ids", "attention_mask", "token_type_ids"]
+
+PARITY_TEXTS = [
+    "이 영화는 정말 재미있고 감동적이었어요!",
+    "너무 지루하고 재미없었습니다.",
+    "연기가 훌륭하고 스토리도 완벽했습니다.",
+    "스토리가 뻔하고 연기도 어색했어요.",
+    "그냥 평범한 영화였어요.",
+    "웃음과 감동을 동시에 주는 멋진 작품이었어요. 배우들의 연기도 자연스럽고 음악도 좋았습니다.",
+]
+
+
+def export_onnx(model: Any, tokenizer: Any, output_path: Path, opset: int = 14) -> Path:
+    """
+    PyTorch 분류 모델을 ONNX 로 내보내기
+
+    배치 크기와 시퀀스 길이는 동적 축이므로 동적 패딩된 입력을 그대로 넣을 수 있습니다.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    sample = tokenizer(
+        ["샘플 문장입니다", "ONNX 내보내기용 두 번째 샘플 문장입니다"],
+        padding=True,
+        return_tensors="pt"
+    )
+    inputs = tuple(sample[name].cpu() for name in ONNX_INPUT_NAMES)
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in ONNX_INPUT_NAMES}
+    dynamic_axes["logits"] = {0: "batch"}
+
+    model_device = next(model.parameters()).device
+    model.to("cpu")
+    try:
+        start = time.perf_counter()
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                inputs,
+                str(output_path),
+                input_names=ONNX_INPUT_NAMES,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=opset,
+                do_constant_folding=True
+            )
+        logger.info(f"✅ ONNX 내보내기 완료: {output_path} ({time.perf_counter() - start:.2f}s)")
+    finally:
+        model.to(model_device)
+    return output_path
+
+
+def quantize_int8(fp32_path: Path, int8_path: Path) -> Path:
+    """가중치 동적 INT8 양자화 (활성값은 실행 시 양자화)"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    start = time.perf_counter()
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+    logger.info(
+        f"✅ INT8 양자화 완료: {int8_path} "
+        f"({fp32_path.stat().st_size / 1e6:.1f}MB → {int8_path.stat().st_size / 1e6:.1f}MB, "
+        f"{time.perf_counter() - start:.2f}s)"
+    )
+    return int8_path
+
+
+class OnnxSentimentBackend:
+    """onnxruntime 세션으로 로짓을 계산하는 추론 백엔드"""
+
+    def __init__(self, model_file: Path, intra_op_threads: int = 0, inter_op_threads: int = 1):
+        """
+        Args:
+            model_file: ONNX 모델 파일 경로
+            intra_op_threads: 연산 내부 병렬 스레드 수 (0 이면 onnxruntime 기본값: 물리 코어 수)
+            inter_op_threads: 연산 간 병렬 스레드 수 (순차 그래프이므로 1 권장)
+        """
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+
+        self.model_file = model_file
+        self.session = ort.InferenceSession(
+            str(model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.intra_op_threads = intra_op_threads
+
+    def logits(self, batch: Dict[str, torch.Tensor]) -> torch.Tensor:
+        """토크나이저 출력(batch) → 로짓 텐서 [batch, num_labels]"""
+        feed = {
+            name: batch[name].cpu().numpy().astype(np.int64)
+            for name in self.input_names
+            if name in batch
+        }
+        if "token_type_ids" in self.input_names and "token_type_ids" not in feed:
+            feed["token_type_ids"] = np.zeros_like(feed["input_ids"])
+        (logits,) = self.session.run(["logits"], feed)
+        return torch.from_numpy(logits)
+
+    def info(self) -> Dict[str, Any]:
+        """백엔드 정보"""
+        return {
+            "model_file": str(self.model_file),
+            "size_mb": round(self.model_file.stat().st_size / 1e6, 1),
+            "intra_op_threads": self.intra_op_threads
+        }
+
+
+def _probabilities(logits: torch.Tensor) -> np.ndarray:
+    return torch.nn.functional.softmax(logits.float(), dim=-1).cpu().numpy()
+
+
+def check_parity(
+    model: Any,
+    tokenizer: Any,
+    backend: OnnxSentimentBackend,
+    texts: Optional[List[str]] = None,
+    max_length: int = 512
+) -> Dict[str, Any]:
+    """
+    PyTorch 모델과 ONNX 백엔드의 출력 비교
+
+    Returns:
+        최대 확률 차이(max_abs_diff)와 예측 레이블 일치율(label_agreement)
+    """
+    texts = texts or PARITY_TEXTS
+    batch = tokenizer(texts, padding=True, truncation=True, max_length=max_length, return_tensors="pt")
+    device = next(model.parameters()).device
+    with torch.no_grad():
+        reference = _probabilities(model(**{k: v.to(device) for k, v in batch.items()}).logits)
+    candidate = _probabilities(backend.logits(dict(batch)))
+
+    return {
+        "samples": len(texts),
+        "max_abs_diff": float(np.abs(reference - candidate).max()),
+        "label_agreement": float(np.mean(reference.argmax(-1) == candidate.argmax(-1)))
+    }
+
+
+def weights_digest(source: Path, length: int = 12) -> str:
+    """
+    모델 디렉토리의 가중치 파일 SHA-256 접두사 (safetensors 우선, 로더와 같은 순서)
+
+    로더가 체크섬 검증에서 계산한 해시를 재사용하므로 파일을 다시 읽지 않습니다.
+    """
+    for name in (SAFETENSORS_WEIGHTS, PYTORCH_WEIGHTS):
+        weights_path = source / name
+        if weights_path.exists():
+            return file_sha256(weights_path)[:length]
+    raise FileNotFoundError(f"가중치 파일이 없습니다: {source}")
+
+
+def _remove_outdated(output: Path, stem: str, keep: str) -> None:
+    """다른 가중치에서 내보낸 (또는 SHA 없이 이름 붙인) 이전 ONNX 파일 삭제"""
+    pattern = re.compile(rf"{re.escape(stem)}(-[0-9a-f]{{12}})?(\.int8)?\.onnx")
+    for path in output.glob(f"{stem}*.onnx"):
+        if pattern.fullmatch(path.name) and not path.name.startswith(f"{stem}-{keep}."):
+            path.unlink(missing_ok=True)
+            logger.info(f"이전 ONNX 파일 삭제: {path}")
+
+
+def create_onnx_backend(
+    model: Any,
+    tokenizer: Any,
+    model_path: str,
+    output_dir: str,
+    quantize: bool = False,
+    intra_op_threads: int = 0,
+    inter_op_threads: int = 1
+) -> OnnxSentimentBackend:
+    """
+    필요하면 ONNX 내보내기/양자화를 수행하고 백엔드를 생성
+
+    내보낸 파일은 `{output_dir}/{모델 디렉토리 이름}-{가중치 SHA-256 12자}.onnx`
+    (INT8 은 `.int8.onnx`) 에 저장되어 같은 가중치로 시작할 때 재사용됩니다.
+    """
+    source = Path(model_path)
+    output = Path(output_dir)
+    digest = weights_digest(source)
+    fp32_path = output / f"{source.name}-{digest}.onnx"
+    if not fp32_path.exists():
+        export_onnx(model, tokenizer, fp32_path)
+        _remove_outdated(output, source.name, digest)
+
+    model_file = fp32_path
+    if quantize:
+        int8_path = output / f"{source.name}-{digest}.int8.onnx"
+        if not int8_path.exists():
+            quantize_int8(fp32_path, int8_path)
+        model_file = int8_path
+
+    return OnnxSentimentBackend(
+        model_file, intra_op_threads=intra_op_threads, inter_op_threads=inter_op_threads
+    )
@@ -17,45 +17,52 @@ from transformers import (
     ElectraForSequenceClassification,
     TrainingArguments,
     Trainer,
-    EarlyStoppingCallback
+    EarlyStoppingCallback,
+    DataCollatorWithPadding
 )
 from torch.utils.data import Dataset
 import logging
 from datetime import datetime
 
+from app.koelectra.model_loader import write_checksums
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class MovieReviewDataset(Dataset):
-    """영화 리뷰 데이터셋 클래스"""
+    """
+    영화 리뷰 데이터셋 클래스
+    
+    리뷰를 생성 시 한 번만 토큰화하고 패딩하지 않습니다. 패딩은 배치마다
+    DataCollatorWithPadding 이 배치 안의 가장 긴 리뷰 길이로 채웁니다.
+    max_length 는 잘라내기 상한입니다.
+    """
     
     def __init__(self, texts: List[str], labels: List[int], tokenizer, max_length: int = 512):
         self.texts = texts
         self.labels = labels
         self.tokenizer = tokenizer
         self.max_length = max_length
+        
+        # 토큰화 (패딩 없음)
+        self.encodings = tokenizer(
+            [str(text) for text in texts],
+            truncation=True,
+            max_length=max_length
+        )
+        # 토큰 길이 (로그 통계용). Trainer 의 LengthGroupedSampler 는 이 속성을 읽지 않고
+        # torch Dataset 이면 각 항목의 input_ids 길이를 직접 계산합니다.
+        self.lengths = [len(ids) for ids in self.encodings['input_ids']]
     
     def __len__(self):
         return len(self.texts)
     
     def __getitem__(self, idx):
-        text = str(self.texts[idx])
-        label = self.labels[idx]
-        
-        # 토큰화
-        encoding = self.tokenizer(
-            text,
-            truncation=True,
-            padding='max_length',
-            max_length=self.max_length,
-            return_tensors='pt'
-        )
-        
         return {
-            'input_ids': encoding['input_ids'].flatten(),
-            'attention_mask': encoding['attention_mask'].flatten(),
-            'labels': torch.tensor(label, dtype=torch.long)
+            'input_ids': self.encodings['input_ids'][idx],
+            'attention_mask': self.encodings['attention_mask'][idx],
+            'labels': self.labels[idx]
         }
 
 class KoELECTRATrainer:
@@ -143,6 +150,12 @@ class KoELECTRATrainer:
         train_dataset = MovieReviewDataset(train_texts, train_labels, self.tokenizer)
         val_dataset = MovieReviewDataset(val_texts, val_labels, self.tokenizer)
         
+        lengths = train_dataset.lengths
+        logger.info(
+            f"훈련 리뷰 토큰 길이 - 평균: {np.mean(lengths):.1f}, "
+            f"95%: {np.percentile(lengths, 95):.0f}, 최대: {max(lengths)}"
+        )
+        
         return train_dataset, val_dataset
     
     def compute_metrics(self, eval_pred):
@@ -156,8 +169,20 @@ class KoELECTRATrainer:
             'accuracy': accuracy,
         }
     
-    def train(self, epochs: int = 5, batch_size: int = 16, learning_rate: float = 2e-5):
-        """모델 훈련"""
+    def train(
+        self,
+        epochs: int = 5,
+        batch_size: int = 16,
+        learning_rate: float = 2e-5,
+        group_by_length: bool = True
+    ):
+        """
+        모델 훈련
+        
+        group_by_length 가 True 이면 비슷한 길이의 리뷰끼리 배치를 구성해
+        (LengthGroupedSampler, 길이는 항목별 input_ids 에서 계산) 배치별 동적
+        패딩 길이를 최소화합니다.
+        """
         logger.info("=== KoELECTRA 파인튜닝 시작 ===")
         
         # 데이터 로드
@@ -192,6 +217,14 @@ class KoELECTRATrainer:
             greater_is_better=True,
             report_to=None,  # 외부 로깅 비활성화
             save_total_limit=2,  # 최대 2개 체크포인트만 유지
+            group_by_length=group_by_length,  # 비슷한 길이끼리 배치 구성
+            save_safetensors=True,  # 서비스가 mmap 으로 로드하는 model.safetensors 로 저장
+        )
+        
+        # 배치 안의 가장 긴 리뷰 길이로 동적 패딩 (GPU 에서는 8의 배수로 맞춤)
+        data_collator = DataCollatorWithPadding(
+            self.tokenizer,
+            pad_to_multiple_of=8 if torch.cuda.is_available() else None
         )
         
         # 트레이너 생성
@@ -200,6 +233,7 @@ class KoELECTRATrainer:
             args=training_args,
             train_dataset=train_dataset,
             eval_dataset=val_dataset,
+            data_collator=data_collator,
             compute_metrics=self.compute_metrics,
             callbacks=[EarlyStoppingCallback(early_stopping_patience=3)]
         )
@@ -217,6 +251,7 @@ class KoELECTRATrainer:
         final_model_path = "app/koelectra/koelectra_model_finetuned"
         trainer.save_model(final_model_path)
         self.tokenizer.save_pretrained(final_model_path)
+        write_checksums(Path(final_model_path))  # 서비스 로딩 시 검증할 SHA-256
         
         logger.info(f"파인튜닝된 모델 저장 완료: {final_model_path}")
         
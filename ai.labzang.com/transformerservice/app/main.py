@@ -6,8 +6,10 @@ FastAPI 기반 한국어 감성분석 마이크로서비스
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
 import logging
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
 
 # 공통 모듈 경로 추가
@@ -20,6 +22,12 @@ except ImportError:
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger("transformerservice")
 
+try:
+    from common.metrics import setup_metrics
+except ImportError:
+    setup_metrics = None
+
+from app.config import config
 from app.koelectra.koelectra_router import router as koelectra_router
 
 # ============================================================================
@@ -85,6 +93,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Prometheus 메트릭 (GET /metrics)
+if setup_metrics is not None:
+    setup_metrics(app, "transformerservice")
+
 # ============================================================================
 # 라우터 등록
 # ============================================================================
@@ -112,13 +124,18 @@ async def root():
             "docs": "/docs",
             "redoc": "/redoc",
             "koelectra_sentiment": "/api/transformer/koelectra",
-            "health": "/health"
+            "health": "/health",
+            "metrics": "/metrics"
         }
     }
 
 @app.get("/health")
 async def health_check():
-    """전체 서비스 상태 확인"""
+    """
+    전체 서비스 상태 확인
+    
+    백그라운드 작업이 갱신해 둔 상태만 읽으며 추론을 실행하지 않습니다.
+    """
     try:
         # KoELECTRA 서비스 상태 확인
         from app.koelectra.koelectra_service import get_sentiment_service
@@ -126,14 +143,16 @@ async def health_check():
         sentiment_service = get_sentiment_service()
         koelectra_health = sentiment_service.health_check()
         
-        overall_status = "healthy" if koelectra_health["status"] == "healthy" else "degraded"
+        overall_status = "degraded" if koelectra_health["status"] == "error" else "healthy"
         
         return JSONResponse(
             status_code=200 if overall_status == "healthy" else 503,
             content={
                 "service": "TransformerService",
                 "status": overall_status,
-                "timestamp": "2024-12-12T12:00:00Z",
+                "timestamp": datetime.fromtimestamp(
+                    koelectra_health["checked_at"], tz=timezone.utc
+                ).isoformat(),
                 "components": {
                     "koelectra_sentiment": koelectra_health
                 },
@@ -209,9 +228,23 @@ async def general_exception_handler(request, exc):
 # 애플리케이션 시작/종료 이벤트
 # ============================================================================
 
+_health_task = None
+
+
+async def _refresh_health_loop(service):
+    """HEALTH_CHECK_INTERVAL 마다 서비스 상태 갱신 (추론 없음)"""
+    while True:
+        try:
+            service.refresh_health()
+        except Exception as e:
+            logger.warning(f"⚠️ 헬스체크 상태 갱신 실패: {str(e)}")
+        await asyncio.sleep(config.HEALTH_CHECK_INTERVAL)
+
+
 @app.on_event("startup")
 async def startup_event():
     """애플리케이션 시작 시 실행"""
+    global _health_task
     logger.info("🚀 TransformerService 시작 중...")
     logger.info("📊 KoELECTRA 감성분석 서비스 초기화...")
     
@@ -219,6 +252,8 @@ async def startup_event():
         # 서비스 사전 로딩 (선택사항)
         from app.koelectra.koelectra_service import get_sentiment_service
         service = get_sentiment_service()
+        service.start_batcher()
+        _health_task = asyncio.create_task(_refresh_health_loop(service))
         logger.info("✅ KoELECTRA 서비스 준비 완료")
         
     except Exception as e:
@@ -230,6 +265,11 @@ async def startup_event():
 async def shutdown_event():
     """애플리케이션 종료 시 실행"""
     logger.info("🛑 TransformerService 종료 중...")
+    if _health_task is not None:
+        _health_task.cancel()
+        await asyncio.gather(_health_task, return_exceptions=True)
+    from app.koelectra.koelectra_service import get_sentiment_service
+    await get_sentiment_service().stop_batcher()
     logger.info("👋 TransformerService 종료 완료!")
 
 # ============================================================================
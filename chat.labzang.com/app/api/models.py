@@ -1,14 +1,111 @@
 """API 요청/응답 모델."""
 
-from typing import List, Optional, Dict, Any
+from datetime import date, datetime, timedelta
+from typing import List, Literal, Optional, Dict, Any, Union
 from pydantic import BaseModel, Field, model_validator
 
+from app.repository.vector_repository import MetadataFilter, validate_metadata_key
+
+
+class MetadataFilterRequest(BaseModel):
+    """메타데이터 필터 (조건 사이는 AND, 목록은 그중 하나와 일치)."""
+
+    source: Optional[Union[str, List[str]]] = Field(None, description="문서 출처")
+    type: Optional[Union[str, List[str]]] = Field(None, description="문서 유형")
+    metadata: Dict[str, Any] = Field(
+        default_factory=dict, description="그 밖의 메타데이터 값 일치 조건 (키 → 값 또는 값 목록)"
+    )
+    date_from: Optional[Union[date, datetime]] = Field(None, description="이 날짜(시각) 이후")
+    date_to: Optional[Union[date, datetime]] = Field(
+        None, description="이 날짜(시각) 이전 (날짜만 주면 그날 포함)"
+    )
+
+    @model_validator(mode='after')
+    def check_keys(self) -> 'MetadataFilterRequest':
+        """SQL 에 들어가는 메타데이터 키 형식 검증 (source/type 중복 지정은 거부)."""
+        for key in self.metadata:
+            validate_metadata_key(key)
+        for key in ("source", "type"):
+            if getattr(self, key) is not None and key in self.metadata:
+                raise ValueError(f"'{key}' 는 {key} 필드와 metadata 중 한 곳에만 지정하세요.")
+        return self
+
+    def to_filter(self, date_field: str = "date") -> MetadataFilter:
+        """저장소 검색용 필터로 변환."""
+        conditions = dict(self.metadata)
+        if self.source is not None:
+            conditions["source"] = self.source
+        if self.type is not None:
+            conditions["type"] = self.type
+        equals: Dict[str, List[Any]] = {
+            key: list(value) if isinstance(value, (list, tuple)) else [value]
+            for key, value in conditions.items()
+        }
+
+        date_to = self.date_to
+        date_to_exclusive = False
+        if date_to is not None and not isinstance(date_to, datetime):
+            # 날짜만 주면 그날 전체를 포함하도록 다음 날 0시 미만으로 비교
+            date_to = date_to + timedelta(days=1)
+            date_to_exclusive = True
+
+        return MetadataFilter(
+            equals=equals,
+            date_field=date_field,
+            date_from=self.date_from.isoformat() if self.date_from is not None else None,
+            date_to=date_to.isoformat() if date_to is not None else None,
+            date_to_exclusive=date_to_exclusive,
+        )
+
 
 class SearchRequest(BaseModel):
     """벡터 검색 요청 모델."""
 
     query: str = Field(..., description="검색할 질문 또는 키워드")
     k: int = Field(default=5, ge=1, le=20, description="반환할 문서 개수")
+    hybrid: Optional[bool] = Field(
+        None, description="벡터 + 전문 검색 RRF 결합 여부 (없으면 설정 기본값)"
+    )
+    ef_search: Optional[int] = Field(
+        None, ge=1, le=1000, description="HNSW 탐색 폭 (없으면 설정 기본값)"
+    )
+    probes: Optional[int] = Field(
+        None, ge=1, le=10000, description="IVFFlat 탐색 리스트 수 (없으면 설정 기본값)"
+    )
+    filters: Optional[MetadataFilterRequest] = Field(None, description="메타데이터 필터")
+
+
+class RetrieveRequest(BaseModel):
+    """검색 전용 요청 모델 (`/retrieve`)."""
+
+    question: str = Field(..., description="질문 내용")
+    k: int = Field(default=3, ge=1, le=20, description="반환할 문서 개수")
+    ef_search: Optional[int] = Field(
+        None, ge=1, le=1000, description="HNSW 탐색 폭 (없으면 설정 기본값)"
+    )
+    probes: Optional[int] = Field(
+        None, ge=1, le=10000, description="IVFFlat 탐색 리스트 수 (없으면 설정 기본값)"
+    )
+    filters: Optional[MetadataFilterRequest] = Field(None, description="메타데이터 필터")
+
+
+class DocumentRequest(BaseModel):
+    """문서 추가 요청 모델."""
+
+    content: str = Field(..., description="문서 내용")
+    metadata: Optional[Dict[str, Any]] = Field(None, description="문서 메타데이터")
+    id: Optional[str] = Field(
+        None,
+        description="문서 ID (같은 ID로 다시 보내면 바뀐 청크만 교체, 없으면 삽입만 하고 삭제하지 않음)",
+    )
+
+
+class DocumentListRequest(BaseModel):
+    """여러 문서 추가 요청 모델."""
+
+    documents: List[Dict[str, Any]] = Field(
+        ..., description='[{"content": "...", "metadata": {...}, "id": "..."}]'
+    )
 
 
 class DocumentResponse(BaseModel):
@@ -16,7 +113,14 @@ class DocumentResponse(BaseModel):
 
     content: str = Field(..., description="문서 내용")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="문서 메타데이터")
-    score: Optional[float] = Field(None, description="유사도 점수")
+    score: Optional[float] = Field(
+        None, description="검색 점수 (의미는 score_type 에 따라 다름)"
+    )
+    score_type: Optional[Literal["distance", "rrf", "rerank"]] = Field(
+        None,
+        description="점수 종류: distance(벡터 거리, 작을수록 유사) | rrf(하이브리드 RRF, 클수록 관련) "
+        "| rerank(cross-encoder 점수, 클수록 관련)",
+    )
 
 
 class SearchResponse(BaseModel):
@@ -32,6 +136,13 @@ class RAGRequest(BaseModel):
 
     question: str = Field(..., description="질문 내용")
     k: int = Field(default=2, ge=1, le=10, description="검색에 사용할 문서 개수")
+    ef_search: Optional[int] = Field(
+        None, ge=1, le=1000, description="HNSW 탐색 폭 (없으면 설정 기본값)"
+    )
+    probes: Optional[int] = Field(
+        None, ge=1, le=10000, description="IVFFlat 탐색 리스트 수 (없으면 설정 기본값)"
+    )
+    filters: Optional[MetadataFilterRequest] = Field(None, description="메타데이터 필터")
 
 
 class RAGResponse(BaseModel):
@@ -49,6 +160,10 @@ class RAGResponse(BaseModel):
     retrieved_count: Optional[int] = Field(
         None, description="검색된 문서 개수 (프론트엔드 호환)"
     )
+    timings: Optional[Dict[str, float]] = Field(
+        None, description="단계별 소요 시간(초): embed, retrieve, generate, total"
+    )
+    cached: bool = Field(False, description="시맨틱 캐시에서 반환된 답변인지 여부")
 
     @model_validator(mode='after')
     def set_retrieved_fields(self) -> 'RAGResponse':
@@ -60,11 +175,45 @@ class RAGResponse(BaseModel):
         return self
 
 
+class ChatRequest(BaseModel):
+    """세션 대화 요청 모델."""
+
+    session_id: str = Field(..., description="대화 세션 ID", min_length=1)
+    message: str = Field(..., description="사용자 메시지", min_length=1)
+    max_new_tokens: int = Field(512, description="최대 생성 토큰 수", ge=1, le=2048)
+
+
+class ChatResponse(BaseModel):
+    """세션 대화 응답 모델."""
+
+    session_id: str = Field(..., description="대화 세션 ID")
+    answer: str = Field(..., description="생성된 응답")
+    history_tokens: int = Field(..., description="저장된 히스토리(요약 포함) 토큰 수")
+    compacted: bool = Field(False, description="이번 턴에서 히스토리가 요약으로 압축되었는지 여부")
+
+
 class HealthResponse(BaseModel):
     """헬스체크 응답 모델."""
 
     status: str = Field(..., description="서비스 상태")
     version: str = Field(..., description="애플리케이션 버전")
-    database: str = Field(..., description="데이터베이스 연결 상태")
+    database: str = Field(
+        ..., description="데이터베이스 연결 상태 (connected, disconnected, timeout, initializing)"
+    )
+    database_latency_ms: Optional[float] = Field(
+        None, description="마지막 풀 기반 DB ping 지연(ms)"
+    )
+    checked_at: Optional[float] = Field(
+        None, description="상태를 마지막으로 갱신한 시각 (unix timestamp)"
+    )
     openai_configured: bool = Field(..., description="OpenAI API 키 설정 여부")
+    db_pool: Optional[Dict[str, int]] = Field(
+        None, description="DB 커넥션 풀 상태 (checked_out, overflow 등)"
+    )
+    semantic_cache: Optional[Dict[str, Any]] = Field(
+        None, description="시맨틱 답변 캐시 통계 (hit_rate, latency_saved_seconds 등)"
+    )
+    reranker: Optional[Dict[str, Any]] = Field(
+        None, description="재정렬기 통계 (캐시 적중률, 배치 수)"
+    )
 
@@ -0,0 +1,64 @@
+"""관리용 API 라우트 (벡터 인덱스)."""
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, Field
+
+from app.core.executor import run_blocking
+from app.core.vector_index import VectorIndexManager
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+class IndexRebuildRequest(BaseModel):
+    """벡터 인덱스 재생성 요청 모델."""
+
+    method: Optional[str] = Field(None, description="hnsw 또는 ivfflat (없으면 현재 방식)")
+    k: int = Field(default=10, ge=1, le=100, description="recall 측정 시 검색 문서 수")
+    samples: int = Field(default=20, ge=1, le=500, description="recall 측정 질의 수")
+    ef_search: Optional[int] = Field(None, ge=1, le=1000, description="HNSW 탐색 폭")
+    probes: Optional[int] = Field(None, ge=1, le=10000, description="IVFFlat 탐색 리스트 수")
+
+
+def get_index_manager(request: Request) -> VectorIndexManager:
+    """lifespan 에서 만든 인덱스 관리자 반환."""
+    manager = getattr(request.app.state, "index_manager", None)
+    if manager is None:
+        raise HTTPException(
+            status_code=503, detail="벡터 인덱스가 비활성화되어 있습니다 (VECTOR_INDEX_METHOD)."
+        )
+    return manager
+
+
+@router.get("/index")
+async def index_status(fastapi_request: Request) -> dict:
+    """현재 벡터 인덱스 상태 (존재 여부, 크기, 정의)."""
+    manager = get_index_manager(fastapi_request)
+    try:
+        return await run_blocking(manager.status)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"인덱스 조회 중 오류 발생: {str(e)}")
+
+
+@router.post("/index/rebuild")
+async def rebuild_index(request: IndexRebuildRequest, fastapi_request: Request) -> dict:
+    """
+    벡터 인덱스를 다시 만들고 결과를 보고합니다.
+
+    인덱스 크기, 빌드 시간, 정확한 검색 대비 recall@k 와 평균 지연을 반환합니다.
+    """
+    manager = get_index_manager(fastapi_request)
+    try:
+        return await run_blocking(
+            manager.rebuild,
+            method=request.method,
+            k=request.k,
+            samples=request.samples,
+            ef_search=request.ef_search,
+            probes=request.probes,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"인덱스 재생성 중 오류 발생: {str(e)}")
@@ -1,23 +1,82 @@
-"""벡터 검색 API 라우트."""
+"""벡터 검색 API 라우트.
 
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends
+`/search` 와, 이전 api_server 의 `/retrieve` 를 같은 검색 경로로 제공합니다.
+"""
+
+import time
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Depends, Request
 from langchain_core.documents import Document
 
-from app.api.models import SearchRequest, SearchResponse, DocumentResponse
+from app.api.models import (
+    DocumentResponse,
+    MetadataFilterRequest,
+    RetrieveRequest,
+    SearchRequest,
+    SearchResponse,
+)
 from app.core.vectorstore import get_vectorstore, VectorStoreType
+from app.config import settings
+from app.core.executor import run_blocking
+from app.core.lexical import hybrid_retrieve
+from app.core.metrics import observe_stage
+from app.core.vector_index import resolve_search_params
 
 router = APIRouter(prefix="/search", tags=["search"])
+retrieve_router = APIRouter(tags=["search"])
+
+
+def get_vectorstore_dependency(request: Request) -> VectorStoreType:
+    """벡터스토어 의존성 주입 (lifespan 에서 생성한 공유 인스턴스)."""
+    vectorstore = getattr(request.app.state, "vectorstore", None)
+    return vectorstore if vectorstore is not None else get_vectorstore()
 
 
-def get_vectorstore_dependency() -> VectorStoreType:
-    """벡터스토어 의존성 주입."""
-    return get_vectorstore()
+async def search_documents(
+    fastapi_request: Request,
+    vectorstore: VectorStoreType,
+    query: str,
+    k: int,
+    *,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    filters: Optional[MetadataFilterRequest] = None,
+    hybrid: Optional[bool] = None,
+) -> Tuple[List[Tuple[Document, float]], str]:
+    """공유 저장소로 검색 (블로킹 DB 호출은 제한된 스레드 풀에서 실행).
+
+    Returns:
+        (문서, 점수) 목록과 점수 종류 ("distance" 또는 하이브리드 검색이면 "rrf").
+    """
+    repository = getattr(fastapi_request.app.state, "vector_repository", None)
+    if repository is None:
+        if filters is not None:
+            raise HTTPException(status_code=400, detail="메타데이터 필터는 벡터 저장소가 필요합니다.")
+        docs_with_scores = await run_blocking(vectorstore.similarity_search_with_score, query, k=k)
+        return docs_with_scores, "distance"
+
+    start = time.perf_counter()
+    embedding = await run_blocking(vectorstore.embeddings.embed_query, query)
+    observe_stage("embed", time.perf_counter() - start)
+
+    metadata_filter = filters.to_filter(settings.metadata_date_field) if filters else None
+    search_params = resolve_search_params(ef_search, probes, metadata_filter)
+    start = time.perf_counter()
+    use_hybrid = settings.use_hybrid_search if hybrid is None else hybrid
+    if use_hybrid:
+        docs_with_scores = await run_blocking(
+            hybrid_retrieve, repository, query, embedding, k, search_params
+        )
+    else:
+        docs_with_scores = await run_blocking(repository.search, embedding, k, **search_params)
+    observe_stage("retrieve", time.perf_counter() - start)
+    return docs_with_scores, "rrf" if use_hybrid else "distance"
 
 
 @router.post("", response_model=SearchResponse)
 async def vector_search(
     request: SearchRequest,
+    fastapi_request: Request,
     vectorstore: VectorStoreType = Depends(get_vectorstore_dependency),
 ) -> SearchResponse:
     """
@@ -25,11 +84,20 @@ async def vector_search(
 
     - **query**: 검색할 질문 또는 키워드
     - **k**: 반환할 문서 개수 (1-20)
+    - **ef_search** / **probes**: ANN 검색 정확도/속도 조절 (선택)
+    - **hybrid**: 벡터 + 전문 검색 RRF 결합 (선택, 점수는 클수록 관련)
+    - **filters**: source / type / 메타데이터 값 / 날짜 범위 필터 (선택, SQL 에서 적용)
     """
     try:
-        # 유사도 검색 수행
-        docs_with_scores = vectorstore.similarity_search_with_score(
-            request.query, k=request.k
+        docs_with_scores, score_type = await search_documents(
+            fastapi_request,
+            vectorstore,
+            request.query,
+            request.k,
+            ef_search=request.ef_search,
+            probes=request.probes,
+            filters=request.filters,
+            hybrid=request.hybrid,
         )
 
         # 응답 모델로 변환
@@ -38,6 +106,7 @@ async def vector_search(
                 content=doc.page_content,
                 metadata=doc.metadata,
                 score=float(score),
+                score_type=score_type,
             )
             for doc, score in docs_with_scores
         ]
@@ -47,6 +116,10 @@ async def vector_search(
             documents=documents,
             count=len(documents),
         )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"검색 중 오류 발생: {str(e)}")
 
@@ -56,3 +129,42 @@ async def search_health() -> dict:
     """검색 서비스 헬스체크."""
     return {"status": "healthy", "service": "vector_search"}
 
+
+@retrieve_router.post("/retrieve")
+async def retrieve(
+    request: RetrieveRequest,
+    fastapi_request: Request,
+    vectorstore: VectorStoreType = Depends(get_vectorstore_dependency),
+) -> dict:
+    """
+    검색만 수행합니다 (이전 api_server 의 응답 형식).
+
+    - **question**: 질문
+    - **k**: 반환할 문서 개수
+    """
+    try:
+        docs_with_scores, _ = await search_documents(
+            fastapi_request,
+            vectorstore,
+            request.question,
+            request.k,
+            ef_search=request.ef_search,
+            probes=request.probes,
+            filters=request.filters,
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"검색 중 오류 발생: {str(e)}")
+
+    return {
+        "question": request.question,
+        "k": request.k,
+        "results": [
+            {"content": doc.page_content, "metadata": doc.metadata}
+            for doc, _ in docs_with_scores
+        ],
+        "count": len(docs_with_scores),
+    }
@@ -0,0 +1,119 @@
+"""동시 요청 수에 따른 처리량(throughput) 벤치마크.
+
+실행 중인 서버의 `/search` 또는 `/rag` 엔드포인트에 동시 요청 수를 늘려가며
+요청을 보내고, 동시성 단계별 처리량과 지연 시간(p50/p95)을 출력합니다.
+이벤트 루프가 블로킹되지 않는다면 동시 요청 수가 늘어날수록
+처리량도 (DB 풀/스레드 풀 한도까지) 함께 증가해야 합니다.
+
+사용 예시:
+    python -m app.benchmark.concurrency_bench --endpoint /search
+    python -m app.benchmark.concurrency_bench --endpoint /rag --requests 32 --concurrency 1 2 4 8
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+
+def _payload(endpoint: str, text: str) -> Dict:
+    """엔드포인트에 맞는 요청 본문 생성."""
+    if endpoint.startswith("/rag"):
+        return {"question": text, "k": 2}
+    return {"query": text, "k": 5}
+
+
+async def _run_level(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    text: str,
+    total_requests: int,
+    concurrency: int,
+) -> Dict[str, float]:
+    """주어진 동시성으로 total_requests 개의 요청을 보내고 결과를 집계."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one_request() -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.post(endpoint, json=_payload(endpoint, text))
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+            except httpx.HTTPError:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(total_requests)))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies) or [0.0]
+    return {
+        "concurrency": concurrency,
+        "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "errors": errors,
+    }
+
+
+async def run_benchmark(
+    base_url: str,
+    endpoint: str,
+    text: str,
+    total_requests: int,
+    levels: List[int],
+    timeout: float,
+) -> List[Dict[str, float]]:
+    """동시성 단계별로 벤치마크를 실행하고 결과 목록을 반환."""
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        # 워밍업 (모델/커넥션 풀 초기화 비용 제외)
+        await _run_level(client, endpoint, text, 1, 1)
+
+        results = []
+        for level in levels:
+            result = await _run_level(client, endpoint, text, total_requests, level)
+            results.append(result)
+            print(
+                f"concurrency={result['concurrency']:>3}  "
+                f"throughput={result['throughput']:7.2f} req/s  "
+                f"p50={result['p50_ms']:8.1f} ms  "
+                f"p95={result['p95_ms']:8.1f} ms  "
+                f"errors={result['errors']}"
+            )
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="RAG API 동시성 벤치마크")
+    parser.add_argument("--url", default="http://localhost:8000", help="서버 주소")
+    parser.add_argument("--endpoint", default="/search", help="/search 또는 /rag")
+    parser.add_argument("--text", default="pgvector란 무엇인가요?", help="질의 문장")
+    parser.add_argument("--requests", type=int, default=64, help="단계별 요청 수")
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="동시성 단계"
+    )
+    parser.add_argument("--timeout", type=float, default=120.0, help="요청 타임아웃(초)")
+    args = parser.parse_args()
+
+    asyncio.run(
+        run_benchmark(
+            args.url,
+            args.endpoint,
+            args.text,
+            args.requests,
+            args.concurrency,
+            args.timeout,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -24,19 +24,120 @@ class Settings(BaseSettings):
     # .env / 환경변수의 DATABASE_URL을 읽어올 필드
     database_url_env: Optional[str] = Field(default=None, alias="DATABASE_URL")
 
+    # 커넥션 풀 설정 (벡터스토어가 공유하는 SQLAlchemy 엔진)
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))  # 상시 유지할 커넥션 수
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))  # pool_size 초과 허용 커넥션 수
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # 커넥션 대기 최대 시간(초)
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "300"))  # 커넥션 재생성 주기(초)
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # 체크아웃 전 ping
+
+    # 블로킹 작업용 스레드 풀 설정 (app.core.executor)
+    db_executor_workers: int = int(os.getenv("DB_EXECUTOR_WORKERS", "15"))  # DB 검색 동시 실행 수
+    llm_executor_workers: int = int(os.getenv("LLM_EXECUTOR_WORKERS", "1"))  # 로컬 모델 동시 생성 수
+
     # OpenAI 설정
     openai_api_key: Optional[str] = os.getenv("OPENAI_API_KEY")
 
+    # 벡터스토어 / 임베딩 설정 (app.core.vectorstore)
+    collection_name: str = os.getenv("COLLECTION_NAME", "langchain_collection")  # PGVector 컬렉션 이름
+    embedding_provider: str = os.getenv("EMBEDDING_PROVIDER", "auto")  # auto, openai, korean, simple
+    seed_sample_documents: bool = os.getenv("SEED_SAMPLE_DOCUMENTS", "true").lower() == "true"  # 빈 컬렉션에 샘플 문서 추가
+
     # LLM 설정
-    llm_provider: str = os.getenv("LLM_PROVIDER", "openai")  # openai, korean_local, midm 등
+    llm_provider: str = os.getenv("LLM_PROVIDER", "openai")  # openai, korean_local, korean, midm
     local_model_dir: Optional[str] = os.getenv("LOCAL_MODEL_DIR")  # 로컬 모델 디렉터리 경로
 
+    # 문서 수집 설정 (app.service.embedding_ingest_service)
+    ingest_batch_size: int = int(os.getenv("INGEST_BATCH_SIZE", "64"))  # 배치당 임베딩/기록 문서 수
+    ingest_workers: int = int(os.getenv("INGEST_WORKERS", "2"))  # 동시에 처리할 배치 수 (ingest 풀 크기)
+
+    # 문서 청킹 설정 (app.core.chunking)
+    chunk_unit: str = os.getenv("CHUNK_UNIT", "char")  # char 또는 token
+    chunk_size: int = int(os.getenv("CHUNK_SIZE", "500"))  # 청크 최대 길이 (CHUNK_UNIT 단위)
+    chunk_overlap: int = int(os.getenv("CHUNK_OVERLAP", "50"))  # 앞 청크와 겹칠 길이
+    chunk_tokenizer: Optional[str] = os.getenv("CHUNK_TOKENIZER")  # token 단위용 토크나이저 (기본: 임베딩 모델)
+
+    # 벡터 인덱스 설정 (app.core.vector_index)
+    vector_index_method: str = os.getenv("VECTOR_INDEX_METHOD", "hnsw")  # hnsw, ivfflat, none
+    vector_index_auto_create: bool = os.getenv("VECTOR_INDEX_AUTO_CREATE", "true").lower() == "true"  # 시작 시 인덱스 생성
+    hnsw_m: int = int(os.getenv("HNSW_M", "16"))  # HNSW 노드당 연결 수
+    hnsw_ef_construction: int = int(os.getenv("HNSW_EF_CONSTRUCTION", "64"))  # HNSW 빌드 탐색 폭
+    hnsw_ef_search: int = int(os.getenv("HNSW_EF_SEARCH", "40"))  # 기본 HNSW 검색 탐색 폭
+    ivfflat_lists: int = int(os.getenv("IVFFLAT_LISTS", "0"))  # IVFFlat 리스트 수 (0: 자동)
+    ivfflat_probes: int = int(os.getenv("IVFFLAT_PROBES", "10"))  # 기본 IVFFlat 탐색 리스트 수
+    hnsw_iterative_scan: Optional[str] = os.getenv("HNSW_ITERATIVE_SCAN")  # 필터 검색 시 iterative scan (pgvector 0.8+: relaxed_order)
+    metadata_index: bool = os.getenv("METADATA_INDEX", "true").lower() == "true"  # cmetadata GIN + 날짜 B-tree 인덱스 생성
+    metadata_date_field: str = os.getenv("METADATA_DATE_FIELD", "date")  # 날짜 범위 필터에 쓰는 메타데이터 키
+
+    # 하이브리드 검색 설정 (app.core.lexical)
+    use_hybrid_search: bool = os.getenv("USE_HYBRID_SEARCH", "true").lower() == "true"  # 벡터 + 전문 검색 RRF 결합
+    hybrid_rrf_k: int = int(os.getenv("HYBRID_RRF_K", "60"))  # RRF 상수 (1 / (rrf_k + 순위))
+    hybrid_candidates: int = int(os.getenv("HYBRID_CANDIDATES", "0"))  # 검색 방식별 후보 수 (0: max(4k, 20))
+    lexical_tokenizer: str = os.getenv("LEXICAL_TOKENIZER", "okt")  # okt (konlpy), simple
+
+    # 재정렬 설정 (app.core.reranker)
+    use_reranker: bool = os.getenv("USE_RERANKER", "false").lower() == "true"  # cross-encoder 재정렬 사용 여부
+    reranker_model: str = os.getenv("RERANKER_MODEL", "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1")  # 다국어 cross-encoder
+    reranker_fetch_k: int = int(os.getenv("RERANKER_FETCH_K", "20"))  # 재정렬 전 후보 수
+    reranker_context_tokens: int = int(os.getenv("RERANKER_CONTEXT_TOKENS", "1024"))  # 컨텍스트 토큰 예산
+    reranker_batch_size: int = int(os.getenv("RERANKER_BATCH_SIZE", "32"))  # 한 번의 forward 에 넣을 최대 쌍 수
+    reranker_max_length: int = int(os.getenv("RERANKER_MAX_LENGTH", "512"))  # (질문, 문서) 쌍 최대 토큰 수
+    reranker_cache_entries: int = int(os.getenv("RERANKER_CACHE_ENTRIES", "10000"))  # (질문, 문서) 점수 캐시 크기
+    reranker_workers: int = int(os.getenv("RERANKER_WORKERS", "1"))  # rerank 풀 크기
+
+    # RAG 설정
+    rag_default_k: int = int(os.getenv("RAG_DEFAULT_K", "2"))  # 기본 검색 문서 개수
+    rag_prompt_version: str = os.getenv("RAG_PROMPT_VERSION", "v1")  # RAG 프롬프트 버전
+
     # Chat Service 설정 (QLoRA)
     chat_model_path: Optional[str] = os.getenv("CHAT_MODEL_PATH")  # QLoRA 모델 경로 또는 Hugging Face 모델 ID
     chat_adapter_path: Optional[str] = os.getenv("CHAT_ADAPTER_PATH")  # LoRA 어댑터 경로 (선택사항)
     use_chat_service: bool = os.getenv("USE_CHAT_SERVICE", "false").lower() == "true"  # Chat Service 사용 여부
 
+    # Chat Service 동적 배칭 설정 (app.service.generation_scheduler)
+    use_chat_batching: bool = os.getenv("USE_CHAT_BATCHING", "true").lower() == "true"  # 배칭 스케줄러 사용 여부
+    chat_batch_max_size: int = int(os.getenv("CHAT_BATCH_MAX_SIZE", "8"))  # 배치당 최대 요청 수
+    chat_batch_max_tokens: int = int(os.getenv("CHAT_BATCH_MAX_TOKENS", "8192"))  # 배치 토큰 예산
+    chat_batch_max_wait_ms: float = float(os.getenv("CHAT_BATCH_MAX_WAIT_MS", "20"))  # 배치 대기 시간(ms)
+
+    # 대화 세션 설정 (app.service.conversation_service)
+    session_backend: str = os.getenv("SESSION_BACKEND", "memory")  # memory 또는 redis
+    redis_url: Optional[str] = os.getenv("REDIS_URL")  # redis 백엔드 연결 URL (rediss:// 이면 TLS)
+    session_lock_stripes: int = int(os.getenv("SESSION_LOCK_STRIPES", "64"))  # 세션 락 풀 크기
+    session_max_sessions: int = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))  # 메모리 저장소 최대 세션 수
+    session_ttl_seconds: int = int(os.getenv("SESSION_TTL_SECONDS", "86400"))  # 세션 유지 시간(초)
+    session_max_history_tokens: int = int(os.getenv("SESSION_MAX_HISTORY_TOKENS", "1024"))  # 히스토리 토큰 예산
+    session_keep_recent_turns: int = int(os.getenv("SESSION_KEEP_RECENT_TURNS", "2"))  # 압축 시 남길 최근 턴 수
+    session_summary_max_tokens: int = int(os.getenv("SESSION_SUMMARY_MAX_TOKENS", "128"))  # 요약 최대 토큰 수
+
+    # 임베딩 캐시 설정 (app.core.embedding_cache)
+    use_embedding_cache: bool = os.getenv("USE_EMBEDDING_CACHE", "true").lower() == "true"  # 캐시 사용 여부
+    embedding_cache_max_mb: int = int(os.getenv("EMBEDDING_CACHE_MAX_MB", "64"))  # 메모리 LRU 상한(MB)
+    embedding_cache_path: Optional[str] = os.getenv("EMBEDDING_CACHE_PATH")  # sqlite 디스크 캐시 경로 (선택)
+
+    # 시맨틱 답변 캐시 설정 (app.core.semantic_cache)
+    use_semantic_cache: bool = os.getenv("USE_SEMANTIC_CACHE", "true").lower() == "true"  # 캐시 사용 여부
+    semantic_cache_threshold: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))  # 적중 코사인 유사도
+    semantic_cache_ttl_seconds: float = float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "3600"))  # 항목 유지 시간(초)
+    semantic_cache_max_entries: int = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "1000"))  # 최대 항목 수
+
+    # 접두사 KV 캐시 설정 (app.core.llm.prefix_cache, 로컬 HF 모델 전용)
+    use_prefix_cache: bool = os.getenv("USE_PREFIX_CACHE", "true").lower() == "true"  # 접두사 캐시 사용 여부
+    prefix_cache_max_entries: int = int(os.getenv("PREFIX_CACHE_MAX_ENTRIES", "32"))  # 모델당 최대 접두사 수
+    # 모델당 캐시 토큰 합 상한. 7B fp16 기준 토큰당 KV 약 0.5MB → 2048 토큰 ≈ 1GB
+    prefix_cache_max_tokens: int = int(os.getenv("PREFIX_CACHE_MAX_TOKENS", "2048"))
+
+    # 시작 설정 (app.core.startup)
+    startup_warmup: bool = os.getenv("STARTUP_WARMUP", "true").lower() == "true"  # 준비 전 워밍업 생성 실행
+    startup_warmup_tokens: int = int(os.getenv("STARTUP_WARMUP_TOKENS", "8"))  # 워밍업 생성 토큰 수
+    startup_db_retries: int = int(os.getenv("STARTUP_DB_RETRIES", "30"))  # DB 연결 재시도 횟수 (2초 간격)
+
+    # 헬스체크 설정 (app.core.health)
+    health_check_interval_seconds: float = float(os.getenv("HEALTH_CHECK_INTERVAL_SECONDS", "15"))  # 상태 갱신 주기(초)
+    health_check_timeout_seconds: float = float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "3"))  # DB ping 제한 시간(초)
+
     # 애플리케이션 설정
+
     app_name: str = "LangChain RAG API"
     app_version: str = "1.0.0"
     debug: bool = os.getenv("DEBUG", "false").lower() == "true"
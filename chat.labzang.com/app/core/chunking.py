@@ -0,0 +1,169 @@
+"""한국어 문장 경계를 고려한 문서 청킹.
+
+문서를 통째로 하나의 벡터로 만들면 긴 문서의 검색 품질이 떨어지고,
+내용 일부만 바뀌어도 전체를 다시 임베딩해야 합니다. 이 모듈은 문서를
+문장 단위로 나눈 뒤 글자 수 또는 토큰 수 기준 윈도우로 묶고(겹침 포함),
+각 청크에 (문서 ID, 청크 내용) 해시 기반 ID를 붙입니다.
+같은 내용의 청크는 항상 같은 ID를 가지므로, 수집 시 이미 저장된 청크는
+임베딩 없이 건너뛰고 바뀐 청크만 교체할 수 있습니다.
+
+교체(사라진 청크 삭제)는 호출자가 명시한 문서 ID 가 있을 때만 합니다.
+ID 가 없는 문서의 청크는 내용 해시만으로 ID 를 만들며 삽입 전용입니다
+(`metadata["source"]` 는 여러 문서가 공유할 수 있어 ID 로 쓰지 않습니다).
+"""
+
+import hashlib
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import settings
+
+# 문장 끝: 마침표/물음표/느낌표(전각 포함)와 말줄임표 뒤의 공백, 또는 줄바꿈.
+# "2.5", "v1.0" 처럼 공백이 뒤따르지 않는 마침표에서는 나누지 않습니다.
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。！？…])[\"'”’)\]]*\s+|\n+")
+
+
+def split_sentences(text: str) -> List[str]:
+    """텍스트를 문장 단위로 분리."""
+    return [s.strip() for s in _SENTENCE_BOUNDARY.split(text) if s and s.strip()]
+
+
+def content_hash(text: str) -> str:
+    """텍스트 내용 해시 (sha256 hex)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class KoreanSentenceChunker:
+    """문장을 윈도우 크기까지 묶고, 이전 청크의 끝 문장을 겹쳐 넣는 청커."""
+
+    def __init__(
+        self,
+        *,
+        chunk_size: int = 500,
+        chunk_overlap: int = 50,
+        length_function: Callable[[str], int] = len,
+    ):
+        """청커를 초기화합니다.
+
+        Args:
+            chunk_size: 청크 최대 길이 (length_function 단위).
+            chunk_overlap: 앞 청크와 겹칠 최대 길이.
+            length_function: 길이 측정 함수 (글자 수: len, 토큰 수: 토크나이저).
+        """
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap 은 chunk_size 보다 작아야 합니다.")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.length_function = length_function
+
+    def _split_long(self, sentence: str) -> List[str]:
+        """윈도우보다 긴 문장은 어절 단위로 나눔 (어절도 길면 글자 단위)."""
+        pieces: List[str] = []
+        current = ""
+        for word in sentence.split(" "):
+            candidate = f"{current} {word}" if current else word
+            if current and self.length_function(candidate) > self.chunk_size:
+                pieces.append(current)
+                candidate = word
+            current = candidate
+            while self.length_function(current) > self.chunk_size:
+                cut = max(1, len(current) * self.chunk_size // self.length_function(current))
+                pieces.append(current[:cut])
+                current = current[cut:]
+        if current:
+            pieces.append(current)
+        return pieces
+
+    def split_text(self, text: str) -> List[str]:
+        """텍스트를 청크 목록으로 분리."""
+        sentences: List[str] = []
+        for sentence in split_sentences(text):
+            if self.length_function(sentence) > self.chunk_size:
+                sentences.extend(self._split_long(sentence))
+            else:
+                sentences.append(sentence)
+
+        chunks: List[str] = []
+        window: List[str] = []
+        for sentence in sentences:
+            candidate = " ".join(window + [sentence])
+            if window and self.length_function(candidate) > self.chunk_size:
+                chunks.append(" ".join(window))
+                # 겹침: 앞 청크의 끝 문장들을 overlap 길이 안에서 이어받음
+                overlap: List[str] = []
+                for previous in reversed(window):
+                    if self.length_function(" ".join([previous] + overlap + [sentence])) > self.chunk_size:
+                        break
+                    if self.length_function(" ".join([previous] + overlap)) > self.chunk_overlap:
+                        break
+                    overlap.insert(0, previous)
+                window = overlap
+            window.append(sentence)
+        if window:
+            chunks.append(" ".join(window))
+        return chunks
+
+    def chunk_document(
+        self,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        doc_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """문서를 청크로 나누고 해시 기반 ID와 메타데이터를 붙입니다.
+
+        Args:
+            content: 문서 내용.
+            metadata: 문서 메타데이터 (모든 청크에 복사).
+            doc_id: 문서 ID. 있으면 청크 ID 에 포함되고 metadata["doc_id"] 로
+                저장되어, 같은 ID 로 다시 보낼 때 바뀐 청크만 교체됩니다. 없으면
+                청크 ID 는 청크 내용 해시입니다 (삽입 전용).
+
+        Returns:
+            [{"id", "content", "metadata"}] — metadata 에 chunk_index,
+            content_hash (doc_id 가 있으면 doc_id 도) 가 추가됩니다.
+        """
+        metadata = dict(metadata or {})
+        doc_id = str(doc_id) if doc_id not in (None, "") else None
+
+        chunks = []
+        for index, chunk in enumerate(self.split_text(content)):
+            chunk_hash = content_hash(chunk)
+            chunk_metadata = {**metadata, "chunk_index": index, "content_hash": chunk_hash}
+            if doc_id is not None:
+                chunk_metadata["doc_id"] = doc_id
+            else:
+                # 호출자가 넣은 doc_id 가 교체 대상으로 오인되지 않도록 제거
+                chunk_metadata.pop("doc_id", None)
+            chunks.append(
+                {
+                    "id": content_hash(f"{doc_id}\0{chunk_hash}") if doc_id is not None else chunk_hash,
+                    "content": chunk,
+                    "metadata": chunk_metadata,
+                }
+            )
+        return chunks
+
+
+def _token_length_function(model_name: str) -> Callable[[str], int]:
+    """임베딩 모델 토크나이저 기준 토큰 수 함수."""
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    return lambda text: len(tokenizer.encode(text, add_special_tokens=False))
+
+
+def create_chunker() -> KoreanSentenceChunker:
+    """설정값으로 청커 생성 (CHUNK_UNIT=token 이면 임베딩 모델 토크나이저 사용)."""
+    length_function: Callable[[str], int] = len
+    if settings.chunk_unit == "token":
+        model_name = settings.chunk_tokenizer or os.getenv(
+            "EMBEDDING_MODEL_NAME", "BAAI/bge-small-ko-v1.5"
+        )
+        length_function = _token_length_function(model_name)
+
+    return KoreanSentenceChunker(
+        chunk_size=settings.chunk_size,
+        chunk_overlap=settings.chunk_overlap,
+        length_function=length_function,
+    )
@@ -0,0 +1,216 @@
+"""임베딩 결과 캐시.
+
+같은 문자열을 다시 임베딩하지 않도록 (모델 이름, 정규화한 텍스트 해시)를
+키로 벡터를 보관하는 `Embeddings` 래퍼입니다. 반복 질의, 같은 문서의
+재수집 등에서 임베딩 모델 호출을 건너뜁니다.
+
+- 1차: 프로세스 내 LRU (벡터 바이트 합으로 메모리 상한 제한)
+- 2차(선택): sqlite 파일 (EMBEDDING_CACHE_PATH 설정 시, 재시작 후에도 유지)
+
+질의용/문서용 임베딩이 다른 모델도 있으므로 두 경우는 키를 분리합니다.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.config import settings
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화 (유니코드 NFC, 공백 정리)."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def embedding_model_name(embeddings: Embeddings) -> str:
+    """임베딩 객체의 모델 이름 (없으면 클래스 이름)."""
+    for attr in ("model_name", "model"):
+        value = getattr(embeddings, attr, None)
+        if isinstance(value, str) and value:
+            return value
+    return type(embeddings).__name__
+
+
+class SqliteEmbeddingStore:
+    """sqlite 파일에 벡터를 float32 BLOB 으로 저장하는 2차 캐시."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """키 목록 중 저장된 벡터 조회."""
+        if not keys:
+            return {}
+        placeholders = ",".join("?" for _ in keys)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", keys
+            ).fetchall()
+        return {key: np.frombuffer(blob, dtype=np.float32).tolist() for key, blob in rows}
+
+    def set_many(self, items: Dict[str, List[float]]) -> None:
+        """벡터 저장 (이미 있으면 덮어씀)."""
+        if not items:
+            return
+        rows = [
+            (key, np.asarray(vector, dtype=np.float32).tobytes())
+            for key, vector in items.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """임베딩 결과를 LRU(+ 선택적 sqlite)에 캐시하는 `Embeddings` 래퍼."""
+
+    def __init__(
+        self,
+        underlying: Embeddings,
+        *,
+        model_name: Optional[str] = None,
+        max_bytes: int = 64 * 1024 * 1024,
+        store: Optional[SqliteEmbeddingStore] = None,
+    ):
+        """캐시 래퍼를 초기화합니다.
+
+        Args:
+            underlying: 실제 임베딩 모델.
+            model_name: 키에 포함할 모델 이름 (없으면 underlying 에서 추출).
+            max_bytes: 메모리 LRU 에 보관할 벡터 바이트 합 상한.
+            store: 선택적 디스크 저장소.
+        """
+        self.underlying = underlying
+        self.model_name = model_name or embedding_model_name(underlying)
+        self.max_bytes = max_bytes
+        self.store = store
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        # 메트릭
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _key(self, kind: str, text: str) -> str:
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{self.model_name}:{kind}:{digest}"
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        """메모리 LRU 에 저장 (float32 기준 바이트로 상한 계산)."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return
+            self._memory[key] = vector
+            self._bytes += len(vector) * 4
+            while self._memory and self._bytes > self.max_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._bytes -= len(evicted) * 4
+
+    def _embed(self, kind: str, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(kind, text) for text in texts]
+        found: Dict[str, List[float]] = {}
+
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+        self.hits += sum(1 for key in keys if key in found)
+
+        missing = list(dict.fromkeys(key for key in keys if key not in found))
+        if missing and self.store is not None:
+            from_disk = self.store.get_many(missing)
+            self.disk_hits += len(from_disk)
+            for key, vector in from_disk.items():
+                self._remember(key, vector)
+            found.update(from_disk)
+            missing = [key for key in missing if key not in found]
+
+        if missing:
+            # 같은 배치 안의 중복 텍스트는 한 번만 임베딩
+            texts_by_key = dict(zip(keys, texts))
+            missing_texts = [texts_by_key[key] for key in missing]
+            if kind == "query":
+                computed = [self.underlying.embed_query(text) for text in missing_texts]
+            else:
+                computed = self.underlying.embed_documents(missing_texts)
+            new_items = {key: list(vector) for key, vector in zip(missing, computed)}
+            self.misses += len(new_items)
+            for key, vector in new_items.items():
+                self._remember(key, vector)
+            if self.store is not None:
+                self.store.set_many(new_items)
+            found.update(new_items)
+
+        return [found[key] for key in keys]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """문서 임베딩 (캐시에 없는 텍스트만 한 번의 배치로 계산)."""
+        return self._embed("document", texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """질의 임베딩."""
+        return self._embed("query", [text])[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 통계."""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "model": self.model_name,
+            "entries": len(self._memory),
+            "memory_bytes": self._bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+_store: Optional[SqliteEmbeddingStore] = None
+_store_lock = threading.Lock()
+
+
+def _get_store() -> Optional[SqliteEmbeddingStore]:
+    """EMBEDDING_CACHE_PATH 가 설정되어 있으면 공유 sqlite 저장소 반환."""
+    global _store
+    if not settings.embedding_cache_path:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = SqliteEmbeddingStore(settings.embedding_cache_path)
+            print(f"💾 임베딩 디스크 캐시: {settings.embedding_cache_path}")
+        return _store
+
+
+def wrap_embeddings(embeddings: Embeddings) -> Embeddings:
+    """설정에 따라 임베딩을 캐시 래퍼로 감쌈 (USE_EMBEDDING_CACHE=false 면 그대로)."""
+    if not settings.use_embedding_cache or isinstance(embeddings, CachedEmbeddings):
+        return embeddings
+    return CachedEmbeddings(
+        embeddings,
+        max_bytes=settings.embedding_cache_max_mb * 1024 * 1024,
+        store=_get_store(),
+    )
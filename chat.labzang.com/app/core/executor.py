@@ -0,0 +1,109 @@
+"""블로킹 작업 실행을 위한 제한된(bounded) 스레드 풀.
+
+psycopg2 기반 PGVector 검색과 로컬 Hugging Face 모델 생성은 비동기 드라이버가
+없어 이벤트 루프에서 직접 호출하면 같은 uvicorn 워커의 다른 요청이 모두
+멈춥니다. 이 모듈은 용도별로 크기가 제한된 스레드 풀을 제공하여 블로킹
+호출을 루프 밖에서 실행합니다.
+
+- ``"db"``  : 벡터 검색 등 DB I/O (커넥션 풀 크기에 맞춰 제한)
+- ``"llm"`` : 로컬 모델 추론 (CPU 경합을 막기 위해 작게 제한)
+- ``"ingest"`` : 문서 수집용 배치 임베딩 + 일괄 기록 (검색 풀과 분리)
+- ``"rerank"`` : cross-encoder 재정렬 (생성과 분리해 생성 중에도 재정렬 가능)
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from app.config import settings
+
+T = TypeVar("T")
+
+_executors: Dict[str, ThreadPoolExecutor] = {}
+
+
+def _max_workers(pool: str) -> int:
+    """풀 이름에 해당하는 최대 워커 수 반환."""
+    if pool == "db":
+        return settings.db_executor_workers
+    if pool == "llm":
+        return settings.llm_executor_workers
+    if pool == "ingest":
+        return settings.ingest_workers
+    if pool == "rerank":
+        return settings.reranker_workers
+    raise ValueError(f"알 수 없는 executor 풀: {pool}")
+
+
+def get_executor(pool: str = "db") -> ThreadPoolExecutor:
+    """용도별 공유 스레드 풀 반환 (첫 호출 시 생성)."""
+    executor = _executors.get(pool)
+    if executor is None:
+        executor = ThreadPoolExecutor(
+            max_workers=_max_workers(pool),
+            thread_name_prefix=f"{pool}-worker",
+        )
+        _executors[pool] = executor
+    return executor
+
+
+async def run_blocking(
+    func: Callable[..., T],
+    *args: Any,
+    pool: str = "db",
+    **kwargs: Any,
+) -> T:
+    """동기 함수를 제한된 스레드 풀에서 실행하고 결과를 기다립니다.
+
+    Args:
+        func: 실행할 동기 함수.
+        *args: 함수 위치 인자.
+        pool: 사용할 풀 이름 ("db" 또는 "llm").
+        **kwargs: 함수 키워드 인자.
+
+    Returns:
+        함수 반환값.
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(func, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(pool), call)
+
+
+def executor_queue_depths() -> Dict[str, int]:
+    """풀별로 워커를 기다리는 작업 수 (메트릭용)."""
+    return {name: executor._work_queue.qsize() for name, executor in _executors.items()}
+
+
+def has_native_async(llm: Any) -> bool:
+    """LLM이 자체 비동기 구현(`_agenerate`)을 가지고 있는지 확인.
+
+    ChatOpenAI 처럼 실제 비동기 HTTP 클라이언트를 쓰는 모델은 True,
+    HuggingFacePipeline 처럼 기본 구현(기본 스레드 풀 위임)만 있는
+    모델은 False 를 반환합니다.
+    """
+    from langchain_core.language_models.chat_models import BaseChatModel
+    from langchain_core.language_models.llms import BaseLLM
+
+    for base in (BaseChatModel, BaseLLM):
+        if isinstance(llm, base):
+            return type(llm)._agenerate is not base._agenerate
+    return False
+
+
+async def ainvoke_chain(chain: Any, value: Any, llm: Any = None) -> Any:
+    """체인을 이벤트 루프를 막지 않고 실행합니다.
+
+    LLM이 비동기를 지원하면 `ainvoke` 를 사용하고, 그렇지 않으면
+    (로컬 HF 모델, 더미 체인 등) "llm" 풀에서 `invoke` 를 실행합니다.
+    """
+    if llm is not None and has_native_async(llm):
+        return await chain.ainvoke(value)
+    return await run_blocking(chain.invoke, value, pool="llm")
+
+
+def shutdown_executors() -> None:
+    """모든 스레드 풀 종료."""
+    for executor in _executors.values():
+        executor.shutdown(wait=False, cancel_futures=True)
+    _executors.clear()
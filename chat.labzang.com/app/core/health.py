@@ -0,0 +1,103 @@
+"""캐시된 구성 요소 상태 (헬스체크용).
+
+이전 `/health` 는 프로브마다 `psycopg2.connect` 로 새 커넥션(TLS 핸드셰이크
+포함)을 열었습니다. 쿠버네티스처럼 몇 초마다 프로브가 오면 이 비용이 실제
+요청과 경쟁합니다. 이제 백그라운드 작업이 `HEALTH_CHECK_INTERVAL_SECONDS`
+마다 공유 커넥션 풀로 `SELECT 1` 을 보내 결과를 저장하고, `/health` 는 저장된
+상태만 읽습니다.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from app.config import settings
+
+
+class HealthMonitor:
+    """주기적으로 DB 상태를 갱신해 두는 백그라운드 작업."""
+
+    def __init__(self, interval: float, timeout: float):
+        """상태 모니터를 초기화합니다.
+
+        Args:
+            interval: 상태 갱신 주기(초).
+            timeout: DB ping 제한 시간(초). 넘으면 "timeout" 으로 기록합니다.
+        """
+        self.interval = interval
+        self.timeout = timeout
+        self.snapshot: Dict[str, Any] = {
+            "database": "unknown",
+            "database_latency_ms": None,
+            "checked_at": None,
+            "consecutive_failures": 0,
+        }
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> Dict[str, Any]:
+        """DB 를 한 번 ping 하고 상태를 갱신합니다."""
+        from app.core.executor import run_blocking
+        from app.core.vectorstore import ping_database
+
+        snapshot: Dict[str, Any] = {"database_latency_ms": None, "error": None}
+        try:
+            latency = await asyncio.wait_for(
+                run_blocking(ping_database, pool="db"), timeout=self.timeout
+            )
+            if latency is None:
+                snapshot["database"] = "initializing"
+            else:
+                snapshot["database"] = "connected"
+                snapshot["database_latency_ms"] = round(latency * 1000, 2)
+        except asyncio.TimeoutError:
+            snapshot["database"] = "timeout"
+        except Exception as e:
+            snapshot["database"] = "disconnected"
+            snapshot["error"] = str(e)
+
+        failed = snapshot["database"] in ("timeout", "disconnected")
+        snapshot["consecutive_failures"] = (
+            self.snapshot["consecutive_failures"] + 1 if failed else 0
+        )
+        snapshot["checked_at"] = time.time()
+        self.snapshot = snapshot
+        return snapshot
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ 헬스체크 갱신 실패: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """백그라운드 갱신 작업 시작 (이미 실행 중이면 무시)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """백그라운드 갱신 작업 종료."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def status(self) -> Dict[str, Any]:
+        """마지막 갱신 결과 (갱신 후 경과 시간 포함)."""
+        snapshot = dict(self.snapshot)
+        checked_at = snapshot.get("checked_at")
+        snapshot["age_seconds"] = (
+            round(time.time() - checked_at, 3) if checked_at is not None else None
+        )
+        return snapshot
+
+
+def create_health_monitor() -> HealthMonitor:
+    """설정값으로 상태 모니터 생성."""
+    return HealthMonitor(
+        interval=settings.health_check_interval_seconds,
+        timeout=settings.health_check_timeout_seconds,
+    )
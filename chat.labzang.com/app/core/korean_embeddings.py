@@ -4,6 +4,8 @@ import os
 from langchain_core.embeddings import Embeddings
 from typing import List
 
+from app.core.embedding_cache import wrap_embeddings
+
 # OpenAI 임베딩 사용 여부 (기본값: false)
 USE_OPENAI_EMBEDDINGS = os.getenv("USE_OPENAI_EMBEDDINGS", "false").lower() == "true"
 
@@ -26,11 +28,13 @@ def init_korean_embeddings() -> Embeddings:
     - sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2 (다국어, 빠름)
     - BAAI/bge-small-ko-v1.5 (한국어 특화, 최신)
     - jhgan/ko-sroberta-multitask (한국어 특화)
+
+    반환되는 임베딩은 `app.core.embedding_cache` 의 캐시 래퍼로 감싸져 있습니다.
     """
     if USE_OPENAI_EMBEDDINGS:
         from langchain_openai import OpenAIEmbeddings
         print("Using OpenAI embeddings (text-embedding-3-small)")
-        return OpenAIEmbeddings(model="text-embedding-3-small")
+        return wrap_embeddings(OpenAIEmbeddings(model="text-embedding-3-small"))
 
     if not HF_EMBEDDINGS_AVAILABLE:
         raise ImportError("Hugging Face embeddings를 사용할 수 없습니다.")
@@ -55,7 +59,7 @@ def init_korean_embeddings() -> Embeddings:
     )
 
     print("✓ Korean embedding model initialized!")
-    return embeddings
+    return wrap_embeddings(embeddings)
 
 
 
@@ -0,0 +1,106 @@
+"""하이브리드 검색용 한국어 질의 토큰화.
+
+회사명/제품명 같은 고유명사는 밀집(dense) 임베딩만으로는 자주 놓칩니다.
+`VectorRepository.hybrid_search` 는 벡터 검색과 Postgres 전문 검색
+(`to_tsvector('simple', document)`)을 한 SQL 에서 RRF 로 결합하며,
+이 모듈은 그 전문 검색에 넣을 tsquery 를 만듭니다.
+
+- `simple` 사전은 어절 단위로만 나누므로 "삼성전자의" 같은 어절이 그대로
+  저장됩니다. 질의는 Okt(konlpy, mlservice 의 워드클라우드와 동일)로 명사/
+  영문/숫자만 뽑고 접두어 검색(`삼성전자:*`)으로 만들어 조사가 붙은 어절과도
+  일치시킵니다.
+- konlpy(JVM) 가 없으면 공백 분리 + 흔한 조사 제거로 대체합니다.
+"""
+
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from app.config import settings
+
+# Okt 가 없을 때 어절 끝에서 제거할 조사 (긴 것부터)
+_PARTICLES = (
+    "에서는", "으로는", "에게서", "이라는", "에서", "에게", "으로", "부터", "까지",
+    "처럼", "보다", "이라", "라는", "은", "는", "이", "가", "을", "를", "의", "에",
+    "로", "와", "과", "도", "만",
+)
+_WORD = re.compile(r"[0-9A-Za-z가-힣]+")
+_OKT_TAGS = ("Noun", "Alpha", "Number", "Foreign")
+
+
+def _simple_tokens(text: str) -> List[str]:
+    """공백 분리 후 어절 끝 조사를 제거한 토큰."""
+    tokens = []
+    for word in _WORD.findall(text):
+        for particle in _PARTICLES:
+            if len(word) > len(particle) + 1 and word.endswith(particle):
+                word = word[: -len(particle)]
+                break
+        tokens.append(word)
+    return tokens
+
+
+_tokenizer: Optional[Callable[[str], List[str]]] = None
+_tokenizer_lock = threading.Lock()
+
+
+def get_query_tokenizer() -> Callable[[str], List[str]]:
+    """프로세스당 한 번만 만드는 질의 토크나이저 (LEXICAL_TOKENIZER=okt|simple)."""
+    global _tokenizer
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                _tokenizer = _simple_tokens
+                if settings.lexical_tokenizer == "okt":
+                    try:
+                        from konlpy.tag import Okt
+
+                        okt = Okt()
+                        _tokenizer = lambda text: [
+                            word for word, tag in okt.pos(text, norm=True) if tag in _OKT_TAGS
+                        ]
+                        print("✅ 하이브리드 검색 토크나이저: Okt")
+                    except Exception as e:
+                        print(f"⚠️ Okt 를 사용할 수 없어 단순 토크나이저로 대체합니다: {e}")
+    return _tokenizer
+
+
+def build_tsquery(text: str) -> Optional[str]:
+    """질의 문자열 → `to_tsquery('simple', ...)` 입력 (토큰이 없으면 None).
+
+    각 토큰은 접두어 검색으로 만들고 OR 로 묶습니다. 순위는 `ts_rank_cd` 가
+    일치한 토큰 수와 근접도로 매깁니다.
+    """
+    seen = []
+    for token in get_query_tokenizer()(text):
+        # tsquery 특수문자가 들어가지 않도록 글자/숫자만 남김
+        token = "".join(_WORD.findall(token)).lower()
+        if len(token) >= 2 and token not in seen:
+            seen.append(token)
+    if not seen:
+        return None
+    return " | ".join(f"{token}:*" for token in seen)
+
+
+def hybrid_retrieve(
+    repository: Any,
+    query: str,
+    embedding: Sequence[float],
+    k: int,
+    search_params: Optional[Dict[str, Any]] = None,
+) -> List[Tuple[Document, float]]:
+    """질의에 검색할 토큰이 있으면 하이브리드 검색, 없으면 벡터 검색 (블로킹)."""
+    search_params = search_params or {}
+    tsquery = build_tsquery(query)
+    if tsquery is None:
+        return repository.search(embedding, k, **search_params)
+    return repository.hybrid_search(
+        embedding,
+        tsquery,
+        k,
+        candidates=settings.hybrid_candidates or None,
+        rrf_k=settings.hybrid_rrf_k,
+        **search_params,
+    )
@@ -44,5 +44,12 @@ def create_llm_from_config(settings: Settings) -> Optional[LLMType]:
         model_dir = settings.local_model_dir if settings.local_model_dir else None
         return create_midm_local_llm(model_dir)
 
+    elif provider == "korean":
+        # 이전 api_server 방식 (USE_OLLAMA / USE_HUGGINGFACE 로 백엔드 선택)
+        from app.core.korean_llm import init_korean_llm
+
+        print("🏠 한국어 LLM (Ollama/Hugging Face)을 사용합니다.")
+        return init_korean_llm()
+
     else:
         raise ValueError(f"지원하지 않는 LLM provider: {provider}")
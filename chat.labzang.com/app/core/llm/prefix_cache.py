@@ -0,0 +1,358 @@
+"""로컬 Hugging Face 모델용 프롬프트 접두사 KV 캐시.
+
+RAG 프롬프트는 항상 같은 지시문 머리말로 시작하고, 멀티턴 대화는 매 턴마다
+이전 대화 전체를 다시 인코딩합니다. CPU 에서는 이 prefill 단계가 지연의
+대부분을 차지하므로, 공유 접두사의 `past_key_values` 를 보관해 두었다가
+새로 추가된 토큰만 prefill 하도록 합니다.
+
+- 키는 접두사의 토큰 ID 튜플이며, 조회 시 가장 긴 일치 접두사를 사용합니다.
+  (예: 지난 턴의 히스토리 캐시에서 이어서 이번 턴 히스토리만 추가 계산)
+- 항목 수와 전체 토큰 수로 제한되는 LRU 캐시입니다.
+- `generate` 는 전달받은 캐시를 수정하므로 항상 복사본을 넘깁니다.
+- 배치 생성(`prepare_batch`)은 접두사 KV 를 배치 크기만큼 복제해 넘기고,
+  각 행의 패딩을 접두사와 나머지 토큰 사이에 넣어 모든 행이 같은 접두사
+  위치를 공유하도록 합니다 (패딩은 attention mask 로 가림).
+
+`past_key_values` 와 전체 `input_ids` 를 함께 받는 `generate` 는
+transformers 4.38 이상(cache_position 지원)이 필요합니다. 그보다 낮은 버전에서는
+`get_prefix_cache` 가 None 을 반환해 캐시 없이 생성합니다.
+"""
+
+import copy
+import functools
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+TokenKey = Tuple[int, ...]
+
+MIN_TRANSFORMERS_VERSION = "4.38.0"
+
+
+class PrefixKVCache:
+    """공유 프롬프트 접두사의 past_key_values 를 보관하는 LRU 캐시."""
+
+    def __init__(self, *, max_entries: int = 32, max_tokens: int = 2048):
+        """캐시를 초기화합니다.
+
+        Args:
+            max_entries: 보관할 최대 접두사 수.
+            max_tokens: 보관할 접두사 토큰 수의 합 상한 (KV 메모리 상한).
+        """
+        self.max_entries = max_entries
+        self.max_tokens = max_tokens
+        self._entries: "OrderedDict[TokenKey, Any]" = OrderedDict()
+        self._tokens = 0
+        self._lock = threading.Lock()
+
+        # 메트릭
+        self.hits = 0
+        self.misses = 0
+        self.reused_tokens = 0
+        self.prefilled_tokens = 0
+
+    def _longest_prefix(self, ids: TokenKey) -> Tuple[int, Optional[Any]]:
+        """ids 의 접두사 중 캐시에 있는 가장 긴 항목 반환 (길이, 캐시)."""
+        best_len, best_cache = 0, None
+        for key, cache in self._entries.items():
+            if best_len < len(key) <= len(ids) and ids[: len(key)] == key:
+                best_len, best_cache = len(key), cache
+        if best_cache is not None:
+            self._entries.move_to_end(ids[:best_len])
+        return best_len, best_cache
+
+    def _store(self, key: TokenKey, cache: Any) -> None:
+        """항목을 저장하고 LRU 정책으로 한도를 맞춤."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        self._entries[key] = cache
+        self._tokens += len(key)
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._tokens > self.max_tokens
+        ):
+            evicted, _ = self._entries.popitem(last=False)
+            self._tokens -= len(evicted)
+
+    def get_or_build(self, model: Any, prefix_ids: List[int]) -> Any:
+        """접두사의 KV 캐시를 반환 (없으면 가장 긴 캐시에서 이어서 prefill).
+
+        반환값은 캐시에 보관된 원본이므로 수정하지 말고 복사해서 사용해야 합니다.
+        """
+        import torch
+
+        key = tuple(prefix_ids)
+        with self._lock:
+            cached_len, cached = self._longest_prefix(key)
+
+        if cached_len == len(key):
+            self.hits += 1
+            self.reused_tokens += cached_len
+            return cached
+
+        if cached is not None:
+            self.hits += 1
+            self.reused_tokens += cached_len
+        else:
+            self.misses += 1
+
+        new_ids = torch.tensor([prefix_ids[cached_len:]], device=model.device)
+        past = copy.deepcopy(cached) if cached is not None else None
+        with torch.no_grad():
+            outputs = model(
+                input_ids=new_ids,
+                attention_mask=torch.ones(1, len(key), dtype=torch.long, device=model.device),
+                past_key_values=past,
+                use_cache=True,
+            )
+        self.prefilled_tokens += len(key) - cached_len
+
+        with self._lock:
+            self._store(key, outputs.past_key_values)
+        return outputs.past_key_values
+
+    def prepare(
+        self,
+        model: Any,
+        tokenizer: Any,
+        prompt: str,
+        prefix: str,
+        *,
+        max_length: int = 2048,
+    ) -> Optional[Dict[str, Any]]:
+        """`generate` 에 넘길 입력과 접두사 KV 캐시(복사본)를 준비합니다.
+
+        접두사가 비어 있거나 토큰화 결과가 프롬프트와 일치하지 않으면
+        None 을 반환하므로, 호출자는 일반 생성 경로를 사용하면 됩니다.
+
+        Returns:
+            {"input_ids", "attention_mask", "past_key_values"} 또는 None.
+        """
+        import torch
+
+        if not prefix or not prompt.startswith(prefix):
+            return None
+
+        full_ids = tokenizer(prompt, truncation=True, max_length=max_length)["input_ids"]
+        prefix_ids = tokenizer(prefix)["input_ids"]
+
+        # 경계의 토큰 병합 차이를 피하기 위해 실제로 일치하는 구간만 캐시
+        shared = 0
+        for a, b in zip(prefix_ids, full_ids):
+            if a != b:
+                break
+            shared += 1
+        # 최소 한 토큰은 새로 계산해야 generate 가 다음 토큰을 만들 수 있음
+        shared = min(shared, len(full_ids) - 1)
+        if shared <= 0:
+            return None
+
+        cache = self.get_or_build(model, full_ids[:shared])
+        input_ids = torch.tensor([full_ids], device=model.device)
+        return {
+            "input_ids": input_ids,
+            "attention_mask": torch.ones_like(input_ids),
+            "past_key_values": copy.deepcopy(cache),
+        }
+
+    def prepare_batch(
+        self,
+        model: Any,
+        tokenizer: Any,
+        prompts: List[str],
+        prefix: str,
+        *,
+        max_length: int = 2048,
+    ) -> Optional[Dict[str, Any]]:
+        """배치 `generate` 에 넘길 입력과 배치 크기로 복제한 접두사 KV 캐시.
+
+        각 행은 [접두사][패딩][나머지 프롬프트] 순서입니다. 왼쪽 패딩 대신
+        접두사 뒤에 패딩을 넣어야 모든 행의 접두사가 같은 위치(0..P-1)에
+        있어 하나의 KV 캐시를 공유할 수 있습니다. position id 는 `generate`
+        가 attention mask 누적합으로 계산하므로 패딩을 건너뛰어 이어집니다.
+
+        모든 프롬프트가 접두사로 시작하지 않거나 토큰화 결과가 일치하지
+        않으면 None 을 반환합니다 (호출자는 왼쪽 패딩 경로 사용).
+
+        Returns:
+            {"input_ids", "attention_mask", "past_key_values"} 또는 None.
+        """
+        import torch
+
+        if not prefix or not prompts or not all(p.startswith(prefix) for p in prompts):
+            return None
+
+        prefix_ids = tokenizer(prefix)["input_ids"]
+        rows = [tokenizer(p, truncation=True, max_length=max_length)["input_ids"] for p in prompts]
+
+        # 모든 행이 실제로 공유하는 구간만 캐시 (각 행은 최소 한 토큰을 새로 계산)
+        shared = len(prefix_ids)
+        for ids in rows:
+            matched = 0
+            for a, b in zip(prefix_ids, ids):
+                if a != b:
+                    break
+                matched += 1
+            shared = min(shared, matched, len(ids) - 1)
+        if shared <= 0:
+            return None
+
+        cache = self.get_or_build(model, rows[0][:shared])
+
+        pad_token_id = tokenizer.pad_token_id
+        if pad_token_id is None:
+            pad_token_id = tokenizer.eos_token_id
+        width = max(len(ids) for ids in rows) - shared
+        input_ids, attention_mask = [], []
+        for ids in rows:
+            suffix = ids[shared:]
+            padding = width - len(suffix)
+            input_ids.append(ids[:shared] + [pad_token_id] * padding + suffix)
+            attention_mask.append([1] * shared + [0] * padding + [1] * len(suffix))
+
+        return {
+            "input_ids": torch.tensor(input_ids, device=model.device),
+            "attention_mask": torch.tensor(attention_mask, device=model.device),
+            "past_key_values": expand_cache(cache, len(prompts)),
+        }
+
+    def clear(self) -> None:
+        """모든 항목 삭제."""
+        with self._lock:
+            self._entries.clear()
+            self._tokens = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 사용 통계."""
+        return {
+            "entries": len(self._entries),
+            "cached_tokens": self._tokens,
+            "hits": self.hits,
+            "misses": self.misses,
+            "reused_tokens": self.reused_tokens,
+            "prefilled_tokens": self.prefilled_tokens,
+        }
+
+
+def expand_cache(cache: Any, batch_size: int) -> Any:
+    """배치 1 의 past_key_values 를 batch_size 행으로 복제한 새 캐시.
+
+    새 텐서를 만들므로 캐시에 보관된 원본은 수정되지 않습니다.
+    (레거시 튜플과 `DynamicCache` 모두 지원)
+    """
+    legacy = cache.to_legacy_cache() if hasattr(cache, "to_legacy_cache") else cache
+    expanded = tuple(
+        tuple(tensor.repeat(batch_size, *([1] * (tensor.dim() - 1))) for tensor in layer)
+        for layer in legacy
+    )
+    if hasattr(cache, "from_legacy_cache"):
+        return type(cache).from_legacy_cache(expanded)
+    return expanded
+
+
+# 모델별 캐시 (모델이 해제되면 캐시도 함께 해제)
+_caches: "weakref.WeakKeyDictionary[Any, PrefixKVCache]" = weakref.WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def transformers_supports_prefix_cache() -> bool:
+    """설치된 transformers 가 past_key_values + 전체 input_ids 생성을 지원하는지."""
+    try:
+        import transformers
+        from packaging.version import Version
+    except ImportError:
+        return False
+    if Version(transformers.__version__) < Version(MIN_TRANSFORMERS_VERSION):
+        print(
+            f"⚠️ transformers {transformers.__version__} 에서는 접두사 KV 캐시를 쓸 수 없습니다 "
+            f"({MIN_TRANSFORMERS_VERSION} 이상 필요). 캐시 없이 생성합니다."
+        )
+        return False
+    return True
+
+
+def get_prefix_cache(model: Any) -> Optional[PrefixKVCache]:
+    """모델에 연결된 접두사 캐시 반환.
+
+    USE_PREFIX_CACHE=false 이거나 transformers 가 4.38 미만이면 None.
+    """
+    if not settings.use_prefix_cache or not transformers_supports_prefix_cache():
+        return None
+    with _caches_lock:
+        cache = _caches.get(model)
+        if cache is None:
+            cache = PrefixKVCache(
+                max_entries=settings.prefix_cache_max_entries,
+                max_tokens=settings.prefix_cache_max_tokens,
+            )
+            _caches[model] = cache
+        return cache
+
+
+def generate_text(
+    model: Any,
+    tokenizer: Any,
+    prompt: str,
+    *,
+    prefix: Optional[str] = None,
+    max_new_tokens: int = 512,
+    temperature: float = 0.7,
+    top_p: float = 0.9,
+    do_sample: bool = True,
+    max_length: int = 2048,
+) -> str:
+    """HF 모델로 텍스트를 생성합니다 (가능하면 접두사 KV 캐시 사용).
+
+    Args:
+        model: Hugging Face 모델.
+        tokenizer: 모델 토크나이저.
+        prompt: 전체 프롬프트.
+        prefix: 여러 요청이 공유하는 프롬프트 접두사 (없으면 캐시 미사용).
+        max_new_tokens: 최대 생성 토큰 수.
+        temperature: 생성 온도.
+        top_p: Top-p 샘플링.
+        do_sample: 샘플링 사용 여부.
+        max_length: 입력 최대 토큰 수.
+
+    Returns:
+        생성된 텍스트 (프롬프트 제외).
+    """
+    import torch
+
+    from app.core.metrics import GenerationTimer
+
+    timer = GenerationTimer()
+    inputs = None
+    cache = get_prefix_cache(model) if prefix else None
+    if cache is not None:
+        inputs = cache.prepare(model, tokenizer, prompt, prefix, max_length=max_length)
+    if inputs is None:
+        inputs = dict(
+            tokenizer(
+                prompt, return_tensors="pt", truncation=True, max_length=max_length
+            ).to(model.device)
+        )
+
+    pad_token_id = tokenizer.pad_token_id
+    if pad_token_id is None:
+        pad_token_id = tokenizer.eos_token_id
+
+    with torch.no_grad():
+        outputs = model.generate(
+            **inputs,
+            max_new_tokens=max_new_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            do_sample=do_sample,
+            pad_token_id=pad_token_id,
+            eos_token_id=tokenizer.eos_token_id,
+            logits_processor=[timer],
+        )
+    timer.observe()
+
+    generated = outputs[0][inputs["input_ids"].shape[1] :]
+    return tokenizer.decode(generated, skip_special_tokens=True).strip()
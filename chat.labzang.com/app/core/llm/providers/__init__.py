@@ -8,7 +8,7 @@
 - `korean_hf_local.py` → `create_local_korean_llm(model_dir=...)`
 
 이 모듈에서는 공통 인터페이스만 정의하고, 실제 선택/주입은
-사용자가 애플리케이션 엔트리포인트(`app/main.py` 또는 `app/api_server.py`)에서
+사용자가 애플리케이션 엔트리포인트(`app/main.py`)에서
 수행하는 것을 권장합니다.
 """
 
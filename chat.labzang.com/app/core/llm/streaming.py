@@ -0,0 +1,152 @@
+"""토큰 스트리밍 유틸리티.
+
+로컬 Hugging Face 모델은 `max_new_tokens` 만큼 생성이 끝나야 결과를
+반환하므로 CPU 환경에서는 첫 글자를 보기까지 수십 초가 걸립니다.
+이 모듈은 `TextIteratorStreamer` 로 생성 중인 토큰을 받아 비동기
+이터레이터로 전달합니다. 생성 자체는 제한된 "llm" 스레드 풀에서 실행됩니다.
+`prefix` 를 넘기면 접두사 KV 캐시(app.core.llm.prefix_cache)를 재사용합니다.
+소비자가 중간에 닫히면(클라이언트 연결 끊김 → `aclose()`) 생성도 다음
+스텝에서 멈춰, 단일 워커 "llm" 풀이 끝까지 점유되지 않습니다.
+"""
+
+import asyncio
+import queue
+import threading
+from typing import Any, AsyncIterator, Optional
+
+from app.core.executor import get_executor
+from app.core.llm.prefix_cache import get_prefix_cache
+from app.core.metrics import GenerationTimer
+
+_END = object()
+
+# streamer 대기 한 번의 최대 시간(초). 생성이 멈춰도 대기 스레드가 계속 묶여 있지 않도록 함
+STREAMER_POLL_SECONDS = 1.0
+
+
+class StopOnEvent:
+    """`threading.Event` 가 설정되면 생성을 멈추는 stopping criteria.
+
+    사용법: `generate(..., stopping_criteria=[StopOnEvent(event)])`.
+    """
+
+    def __init__(self, event: threading.Event):
+        self.event = event
+
+    def __call__(self, input_ids: Any, scores: Any, **kwargs: Any) -> Any:
+        import torch
+
+        return torch.full(
+            (input_ids.shape[0],), self.event.is_set(), dtype=torch.bool, device=input_ids.device
+        )
+
+
+def get_hf_model_and_tokenizer(llm: Any):
+    """HuggingFacePipeline 기반 LLM이면 (model, tokenizer) 반환, 아니면 None."""
+    pipe = getattr(llm, "pipeline", None)
+    model = getattr(pipe, "model", None)
+    tokenizer = getattr(pipe, "tokenizer", None)
+    if model is None or tokenizer is None:
+        return None
+    return model, tokenizer
+
+
+async def astream_hf_generate(
+    model: Any,
+    tokenizer: Any,
+    prompt: str,
+    *,
+    prefix: Optional[str] = None,
+    max_new_tokens: int = 512,
+    temperature: float = 0.7,
+    top_p: float = 0.9,
+    do_sample: bool = True,
+    max_length: int = 2048,
+) -> AsyncIterator[str]:
+    """HF 모델의 `generate` 를 실행하면서 생성된 텍스트 조각을 순서대로 반환.
+
+    Args:
+        model: `generate` 를 지원하는 Hugging Face 모델.
+        tokenizer: 모델 토크나이저.
+        prompt: 입력 프롬프트.
+        prefix: 여러 요청이 공유하는 프롬프트 접두사 (KV 캐시 재사용).
+        max_new_tokens: 최대 생성 토큰 수.
+        temperature: 생성 온도.
+        top_p: Top-p 샘플링.
+        do_sample: 샘플링 사용 여부.
+        max_length: 입력 최대 토큰 수 (초과 시 잘림).
+
+    Yields:
+        디코딩된 텍스트 조각.
+    """
+    import torch
+    from transformers import TextIteratorStreamer
+
+    streamer = TextIteratorStreamer(
+        tokenizer, skip_prompt=True, skip_special_tokens=True, timeout=STREAMER_POLL_SECONDS
+    )
+    stop_event = threading.Event()
+    pad_token_id = tokenizer.pad_token_id
+    if pad_token_id is None:
+        pad_token_id = tokenizer.eos_token_id
+
+    def generate() -> None:
+        if stop_event.is_set():
+            # llm 풀에서 차례를 기다리는 동안 소비자가 이미 닫힘
+            streamer.end()
+            return
+        timer = GenerationTimer()
+        try:
+            # 접두사 prefill 도 블로킹 연산이므로 생성 스레드 안에서 준비
+            inputs = None
+            cache = get_prefix_cache(model) if prefix else None
+            if cache is not None:
+                inputs = cache.prepare(model, tokenizer, prompt, prefix, max_length=max_length)
+            if inputs is None:
+                inputs = dict(
+                    tokenizer(
+                        prompt, return_tensors="pt", truncation=True, max_length=max_length
+                    ).to(model.device)
+                )
+            with torch.no_grad():
+                model.generate(
+                    **inputs,
+                    streamer=streamer,
+                    max_new_tokens=max_new_tokens,
+                    temperature=temperature,
+                    top_p=top_p,
+                    do_sample=do_sample,
+                    pad_token_id=pad_token_id,
+                    eos_token_id=tokenizer.eos_token_id,
+                    logits_processor=[timer],
+                    stopping_criteria=[StopOnEvent(stop_event)],
+                )
+            timer.observe()
+        except Exception:
+            # 소비자가 무한 대기하지 않도록 스트림 종료 신호를 보냄
+            streamer.end()
+            raise
+
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_executor("llm"), generate)
+
+    try:
+        while True:
+            # streamer 는 블로킹 큐이므로 다음 조각을 기다리는 동안 루프를 막지 않음
+            try:
+                text = await loop.run_in_executor(None, next, streamer, _END)
+            except queue.Empty:
+                # 아직 조각이 없음 (prefill 중이거나 생성 스레드가 대기 중)
+                if future.done():
+                    break
+                continue
+            if text is _END:
+                break
+            if text:
+                yield text
+    finally:
+        # 정상 종료든 aclose() 든 남은 생성을 멈춤
+        stop_event.set()
+
+    # 생성 스레드에서 발생한 예외 전파
+    await future
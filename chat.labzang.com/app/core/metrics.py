@@ -0,0 +1,185 @@
+"""Prometheus 메트릭 (`GET /metrics`).
+
+RAG 요청의 단계별 지연(embed, retrieve, rerank, prompt_build, prefill, decode,
+serialize)을 히스토그램으로 기록해 어느 단계가 느려졌는지 확인할 수 있게
+합니다. 커넥션 풀, 스레드 풀 큐, 생성 스케줄러 큐 같은 현재 상태 값은
+스크레이프 시점에만 읽습니다 (요청 경로에 비용 없음).
+
+`prometheus-client` 가 없으면 기록 함수는 아무것도 하지 않고 `/metrics` 는
+503 을 반환합니다.
+"""
+
+import time
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        Counter,
+        Histogram,
+        generate_latest,
+    )
+    from prometheus_client.core import GaugeMetricFamily
+
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+# RAG 단계 (RAGResult.timings 키와 같은 이름)
+STAGES = (
+    "embed",
+    "cache_lookup",
+    "retrieve",
+    "rerank",
+    "prompt_build",
+    "ttft",
+    "generate",
+    "prefill",
+    "decode",
+    "serialize",
+)
+
+_LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+_TOKENS_PER_SECOND_BUCKETS = (1, 2, 5, 10, 20, 30, 50, 75, 100, 200, 500, 1000)
+
+if PROMETHEUS_AVAILABLE:
+    STAGE_SECONDS = Histogram(
+        "rag_stage_seconds", "RAG 단계별 소요 시간(초)", ["stage"], buckets=_LATENCY_BUCKETS
+    )
+    RAG_REQUEST_SECONDS = Histogram(
+        "rag_request_seconds",
+        "RAG 요청 전체 소요 시간(초)",
+        ["endpoint", "cached"],
+        buckets=_LATENCY_BUCKETS,
+    )
+    HTTP_REQUEST_SECONDS = Histogram(
+        "http_request_duration_seconds",
+        "HTTP 요청 처리 시간(초)",
+        ["method", "path", "status"],
+        buckets=_LATENCY_BUCKETS,
+    )
+    TOKENS_PER_SECOND = Histogram(
+        "llm_decode_tokens_per_second",
+        "로컬 모델 decode 단계 초당 생성 토큰 수",
+        buckets=_TOKENS_PER_SECOND_BUCKETS,
+    )
+    GENERATED_TOKENS = Counter("llm_generated_tokens_total", "로컬 모델이 생성한 토큰 수")
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """단계 하나의 소요 시간 기록."""
+    if PROMETHEUS_AVAILABLE:
+        STAGE_SECONDS.labels(stage=stage).observe(seconds)
+
+
+def observe_rag(endpoint: str, timings: Dict[str, float], cached: bool) -> None:
+    """RAG 요청의 단계별 소요 시간(`RAGResult.timings`)과 전체 시간 기록."""
+    if not PROMETHEUS_AVAILABLE:
+        return
+    for stage, seconds in timings.items():
+        if stage in STAGES:
+            STAGE_SECONDS.labels(stage=stage).observe(seconds)
+    if "total" in timings:
+        RAG_REQUEST_SECONDS.labels(endpoint=endpoint, cached=str(cached).lower()).observe(
+            timings["total"]
+        )
+
+
+def observe_http(method: str, path: str, status: int, seconds: float) -> None:
+    """HTTP 요청 처리 시간 기록 (path 는 라우트 템플릿)."""
+    if PROMETHEUS_AVAILABLE:
+        HTTP_REQUEST_SECONDS.labels(method=method, path=path, status=str(status)).observe(seconds)
+
+
+class GenerationTimer:
+    """`model.generate` 의 prefill / decode 시간을 나누어 재는 logits processor.
+
+    logits processor 는 forward 한 번마다 호출되므로 첫 호출 시점이 prefill
+    (프롬프트 전체 forward) 이 끝난 시점입니다. 이후 호출 수가 생성 토큰 수입니다.
+
+    사용법: `generate(..., logits_processor=[timer])` 후 `timer.observe()`.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.steps = 0
+
+    def __call__(self, input_ids: Any, scores: Any) -> Any:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.steps += 1
+        return scores
+
+    def observe(self, batch_size: int = 1) -> None:
+        """prefill/decode 시간, 생성 토큰 수, 초당 토큰 수 기록."""
+        if not PROMETHEUS_AVAILABLE or self.first_token_at is None:
+            return
+        finished = time.perf_counter()
+        decode_seconds = finished - self.first_token_at
+        STAGE_SECONDS.labels(stage="prefill").observe(self.first_token_at - self.started)
+        STAGE_SECONDS.labels(stage="decode").observe(decode_seconds)
+        GENERATED_TOKENS.inc(self.steps * batch_size)
+        # 첫 토큰은 prefill forward 에서 나오므로 decode 토큰 수는 steps - 1
+        if self.steps > 1 and decode_seconds > 0:
+            TOKENS_PER_SECOND.observe((self.steps - 1) * batch_size / decode_seconds)
+
+
+class RuntimeCollector:
+    """스크레이프 시점에 커넥션 풀, 스레드 풀 큐, 생성 큐 상태를 읽는 collector."""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    def collect(self) -> Iterable[Any]:
+        from app.core.executor import executor_queue_depths
+        from app.core.vectorstore import get_pool_status
+
+        pool = GaugeMetricFamily(
+            "db_pool_connections", "DB 커넥션 풀 상태", labels=["state"]
+        )
+        for state, value in get_pool_status().items():
+            pool.add_metric([state], value)
+        yield pool
+
+        executor = GaugeMetricFamily(
+            "executor_queue_depth", "스레드 풀별 대기 작업 수", labels=["pool"]
+        )
+        for name, depth in executor_queue_depths().items():
+            executor.add_metric([name], depth)
+        yield executor
+
+        scheduler = getattr(self.app.state, "chat_scheduler", None)
+        queue = GaugeMetricFamily("generation_queue_depth", "생성 배칭 스케줄러 대기 요청 수")
+        queue.add_metric([], scheduler.metrics()["queue_depth"] if scheduler is not None else 0)
+        yield queue
+
+        answer_cache = getattr(self.app.state, "answer_cache", None)
+        if answer_cache is not None:
+            cache = GaugeMetricFamily("semantic_cache_entries", "시맨틱 답변 캐시 항목 수")
+            cache.add_metric([], answer_cache.stats().get("entries", 0))
+            yield cache
+
+
+_collector_registered = False
+
+
+def register_runtime_collector(app: Any) -> None:
+    """앱 상태를 읽는 collector 등록 (프로세스당 한 번)."""
+    global _collector_registered
+    if PROMETHEUS_AVAILABLE and not _collector_registered:
+        REGISTRY.register(RuntimeCollector(app))
+        _collector_registered = True
+
+
+def render_metrics() -> Optional[bytes]:
+    """Prometheus 텍스트 형식 출력 (prometheus-client 가 없으면 None)."""
+    if not PROMETHEUS_AVAILABLE:
+        return None
+    return generate_latest(REGISTRY)
+
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST if PROMETHEUS_AVAILABLE else "text/plain"
@@ -6,10 +6,28 @@
   기준으로 체인을 구성하거나, 키가 없을 때는 더미 체인을 반환합니다.
 - 주입 방식: 사용자는 `app.core.llm` 패키지에서 생성한 LLM 인스턴스를
   `create_rag_chain(vectorstore, llm=my_llm)` 형태로 전달해 사용할 수 있습니다.
+- `RAGPipeline`: 질문 임베딩 1회, 벡터 검색 1회로 답변과 출처 문서를 함께
+  반환합니다. 답변에 사용된 문서와 응답의 `sources` 가 항상 일치합니다.
+- 질문 임베딩이 이전 질문과 충분히 비슷하면 시맨틱 캐시
+  (`app.core.semantic_cache`)의 답변/출처를 검색·생성 없이 반환합니다.
+- 저장소(`VectorRepository`)가 주어지면 ANN 인덱스를 사용하는 SQL 로
+  검색하고, 요청별 `ef_search` / `probes` 를 적용합니다. `hybrid=True` 면
+  전문 검색 결과와 RRF 로 결합합니다 (`app.core.lexical`).
+- 재정렬기가 주어지면 후보를 넉넉히 가져와 cross-encoder 로 점수화하고,
+  컨텍스트 토큰 예산 안의 상위 k 개만 프롬프트에 넣습니다 (`app.core.reranker`).
+- 로컬 HF 모델은 모든 프롬프트가 공유하는 지시문 머리말의 KV 캐시를
+  재사용합니다 (`app.core.llm.prefix_cache`).
+- `RAGChainRegistry`: (LLM provider, k, 프롬프트 버전) 별 파이프라인을
+  lifespan 에서 한 번만 만들고 모든 요청이 재사용합니다.
 """
 
-from typing import Optional
+import copy
+import threading
+import time
+import traceback
+from typing import Any, AsyncIterator, Dict, Hashable, List, Optional, Tuple, TypedDict
 
+from langchain_core.documents import Document
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnablePassthrough, RunnableLambda
 from langchain_core.output_parsers import StrOutputParser
@@ -18,6 +36,110 @@ from langchain_openai import ChatOpenAI
 from langchain_community.vectorstores import PGVector
 
 from app.config import settings
+from app.core.executor import ainvoke_chain, has_native_async, run_blocking
+from app.core.lexical import hybrid_retrieve
+from app.core.reranker import CrossEncoderReranker
+from app.core.llm.prefix_cache import generate_text
+from app.core.llm.streaming import astream_hf_generate, get_hf_model_and_tokenizer
+from app.core.semantic_cache import SemanticAnswerCache
+
+# RAG 프롬프트 (모든 경로에서 같은 머리말을 사용)
+RAG_PROMPT_HEADER = "다음 컨텍스트를 바탕으로 질문에 답해주세요:"
+RAG_PROMPT_TEMPLATE = RAG_PROMPT_HEADER + """
+
+컨텍스트:
+{context}
+
+질문: {question}
+
+답변:"""
+
+# 프롬프트 버전별 템플릿 (버전을 올리면 레지스트리가 새 체인을 만듭니다)
+RAG_PROMPT_TEMPLATES: Dict[str, str] = {
+    "v1": RAG_PROMPT_TEMPLATE,
+}
+
+
+class RAGResult(TypedDict):
+    """RAGPipeline 실행 결과."""
+
+    answer: str
+    source_docs: List[Document]
+    scores: List[float]
+    score_type: str
+    timings: Dict[str, float]
+    cached: bool
+
+
+def format_context(docs: List[Document]) -> str:
+    """검색된 문서를 프롬프트 컨텍스트 문자열로 변환."""
+    return "\n\n".join(
+        f"문서 {i + 1}:\n{doc.page_content}" for i, doc in enumerate(docs)
+    )
+
+
+def build_rag_prompt(
+    question: str,
+    docs: List[Document],
+    prompt_version: str = "v1",
+) -> str:
+    """Chat Service 등 문자열 프롬프트를 받는 생성기를 위한 RAG 프롬프트."""
+    return RAG_PROMPT_TEMPLATES[prompt_version].format(
+        context=format_context(docs), question=question
+    )
+
+
+def shared_prompt_prefix(prompt: str) -> Optional[str]:
+    """프롬프트에서 공통 지시문 머리말까지의 접두사 (KV 캐시 키로 사용)."""
+    index = prompt.find(RAG_PROMPT_HEADER)
+    if index < 0:
+        return None
+    return prompt[: index + len(RAG_PROMPT_HEADER)]
+
+
+def _sources_payload(
+    docs: List[Document], scores: List[float], score_type: str
+) -> List[Dict[str, Any]]:
+    """SSE "sources" 이벤트용 문서 목록."""
+    return [
+        {
+            "content": doc.page_content,
+            "metadata": doc.metadata,
+            "score": score,
+            "score_type": score_type,
+        }
+        for doc, score in zip(docs, scores)
+    ]
+
+
+async def _achat(chat_service: Any, message: str, **kwargs: Any) -> str:
+    """Chat Service 로 응답 생성.
+
+    배칭 스케줄러처럼 `achat` 을 제공하면 그대로 기다리고, 아니면
+    동기 `chat` 을 제한된 LLM 풀에서 실행합니다.
+    """
+    achat = getattr(chat_service, "achat", None)
+    if achat is not None:
+        return await achat(message, **kwargs)
+    return await run_blocking(chat_service.chat, message, pool="llm", **kwargs)
+
+
+def _default_llm() -> Optional[BaseLanguageModel]:
+    """주입된 LLM이 없을 때 사용할 기본 LLM (OpenAI 키가 있을 때만)."""
+    if settings.openai_api_key:
+        return ChatOpenAI(model="gpt-3.5-turbo", temperature=0)
+    return None
+
+
+def _dummy_answer(question: str, docs: List[Document]) -> str:
+    """LLM이 없을 때 검색 결과만으로 만드는 더미 응답."""
+    context = "\n".join([f"- {doc.page_content}" for doc in docs])
+    return f"""🔍 검색된 관련 문서들:
+{context}
+
+💡 더미 응답: 위의 문서들이 '{question}' 질문과 관련된 내용입니다.
+실제 AI 응답을 받으려면 OpenAI API 키를 설정해주세요.
+하지만 벡터 검색 기능은 정상적으로 작동하고 있습니다!"""
 
 
 def create_rag_chain(
@@ -34,17 +156,7 @@ def create_rag_chain(
         LangChain Runnable 객체 (invoke(question: str) 지원).
     """
     # 프롬프트 템플릿
-    prompt = ChatPromptTemplate.from_template(
-        """
-다음 컨텍스트를 바탕으로 질문에 답해주세요:
-
-컨텍스트: {context}
-
-질문: {question}
-
-답변:
-"""
-    )
+    prompt = ChatPromptTemplate.from_template(RAG_PROMPT_TEMPLATE)
 
     # 검색기 설정
     retriever = vectorstore.as_retriever(search_kwargs={"k": 2})
@@ -52,7 +164,7 @@ def create_rag_chain(
     # 1) 외부에서 LLM을 직접 주입한 경우
     if llm is not None:
         rag_chain = (
-            {"context": retriever, "question": RunnablePassthrough()}
+            {"context": retriever | format_context, "question": RunnablePassthrough()}
             | prompt
             | llm
             | StrOutputParser()
@@ -63,7 +175,7 @@ def create_rag_chain(
     if settings.openai_api_key:
         default_llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0)
         rag_chain = (
-            {"context": retriever, "question": RunnablePassthrough()}
+            {"context": retriever | format_context, "question": RunnablePassthrough()}
             | prompt
             | default_llm
             | StrOutputParser()
@@ -73,15 +185,566 @@ def create_rag_chain(
     # 3) OpenAI 설정이 없을 때: 벡터 검색 결과만 보여주는 더미 체인
     def dummy_rag_function(question: str) -> str:
         """OpenAI API 키가 없을 때 사용하는 더미 RAG 함수."""
-        docs = retriever.invoke(question)
-        context = "\n".join([f"- {doc.page_content}" for doc in docs])
+        return _dummy_answer(question, retriever.invoke(question))
 
-        return f"""🔍 검색된 관련 문서들:
-{context}
+    return RunnableLambda(dummy_rag_function)
 
-💡 더미 응답: 위의 문서들이 '{question}' 질문과 관련된 내용입니다.
-실제 AI 응답을 받으려면 OpenAI API 키를 설정해주세요.
-하지만 벡터 검색 기능은 정상적으로 작동하고 있습니다!"""
 
-    return RunnableLambda(dummy_rag_function)
+class RAGPipeline:
+    """임베딩 1회, 검색 1회로 답변과 출처를 함께 반환하는 RAG 파이프라인.
+
+    기존 체인은 출처 조회용 검색과 체인 내부 retriever 검색을 각각 수행해
+    임베딩/pgvector 검색이 질문당 두 번 일어났고, 답변 근거와 반환 문서가
+    서로 다를 수 있었습니다. 이 파이프라인은 검색 결과를 그대로 프롬프트에
+    넣어 생성하므로 두 문제가 모두 사라집니다.
+    """
+
+    def __init__(
+        self,
+        vectorstore,
+        llm: Optional[BaseLanguageModel] = None,
+        *,
+        k: int = 2,
+        prompt_version: str = "v1",
+        provider: str = "",
+        answer_cache: Optional[SemanticAnswerCache] = None,
+        repository: Any = None,
+        hybrid: bool = False,
+        reranker: Optional[CrossEncoderReranker] = None,
+    ):
+        """RAG 파이프라인을 초기화합니다.
+
+        Args:
+            vectorstore: 검색에 사용할 PGVector 인스턴스.
+            llm: 선택적 LLM 인스턴스. 없으면 OpenAI 기본 LLM 또는 더미 응답을 사용.
+            k: 기본 검색 문서 개수 (요청마다 `arun(k=...)` 로 재정의 가능).
+            prompt_version: 사용할 프롬프트 버전 (`RAG_PROMPT_TEMPLATES` 키).
+            provider: LLM provider 이름 (시맨틱 캐시 범위 구분용).
+            answer_cache: 선택적 시맨틱 답변 캐시.
+            repository: 선택적 `VectorRepository` (없으면 PGVector 검색 사용).
+            hybrid: 저장소 검색 시 벡터 + 전문 검색 RRF 결합 여부.
+            reranker: 선택적 cross-encoder 재정렬기.
+        """
+        self.vectorstore = vectorstore
+        self.llm = llm if llm is not None else _default_llm()
+        self.k = k
+        self.prompt_version = prompt_version
+        self.provider = provider
+        self.answer_cache = answer_cache
+        self.repository = repository
+        self.hybrid = hybrid and repository is not None
+        self.reranker = reranker
+        # 재정렬 예산 계산용 생성 토크나이저 복사본 (원본, 복사본)
+        self._budget_tokenizer: Optional[Tuple[Any, Any]] = None
+        self.prompt = ChatPromptTemplate.from_template(RAG_PROMPT_TEMPLATES[prompt_version])
+        self.generation_chain = (
+            self.prompt | self.llm | StrOutputParser() if self.llm is not None else None
+        )
+
+    @property
+    def score_type(self) -> str:
+        """반환 점수 종류: rerank(재정렬) > rrf(하이브리드) > distance(벡터 거리)."""
+        if self.reranker is not None:
+            return "rerank"
+        if self.hybrid:
+            return "rrf"
+        return "distance"
+
+    def embed(self, question: str) -> List[float]:
+        """질문 임베딩 (블로킹)."""
+        return self.vectorstore.embeddings.embed_query(question)
+
+    def retrieve(
+        self,
+        question: str,
+        k: Optional[int] = None,
+        embedding: Optional[List[float]] = None,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[Tuple[Document, float]], Dict[str, float]]:
+        """질문을 한 번 임베딩하고, 그 벡터로 한 번 검색합니다 (블로킹).
+
+        Args:
+            embedding: 이미 계산한 질문 임베딩 (있으면 다시 임베딩하지 않음).
+            search_params: 저장소 검색 인자 (ef_search, probes, filters).
+
+        Returns:
+            (문서, 점수) 목록과 단계별 소요 시간(초). 점수는 벡터 검색이면
+            거리(작을수록 유사), 하이브리드 검색이면 RRF 점수(클수록 관련).
+        """
+        timings: Dict[str, float] = {}
+
+        if embedding is None:
+            start = time.perf_counter()
+            embedding = self.embed(question)
+            timings["embed"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if self.hybrid:
+            docs_with_scores = hybrid_retrieve(
+                self.repository, question, embedding, k or self.k, search_params
+            )
+        elif self.repository is not None:
+            docs_with_scores = self.repository.search(
+                embedding, k or self.k, **(search_params or {})
+            )
+        else:
+            # PGVector 검색에는 필터를 적용할 수 없으므로 필터 없는 검색으로 답하지 않음
+            if (search_params or {}).get("filters") is not None:
+                raise ValueError("메타데이터 필터는 벡터 저장소가 필요합니다.")
+            docs_with_scores = self.vectorstore.similarity_search_with_score_by_vector(
+                embedding, k=k or self.k
+            )
+        timings["retrieve"] = time.perf_counter() - start
+
+        return docs_with_scores, timings
+
+    def _generation_tokenizer(self, chat_service: Any = None) -> Any:
+        """답변을 생성할 모델 토크나이저의 복사본 (알 수 없으면 None).
+
+        원본은 "llm" 스레드가 생성 중에 쓰고 있으므로, "rerank" 스레드에서 함께 쓰면
+        HF fast 토크나이저가 "Already borrowed" 오류를 낼 수 있어 복사본을 씁니다.
+        """
+        tokenizer = None
+        if chat_service is not None:
+            # 배칭 스케줄러면 감싼 QLoRAChatService 의 토크나이저 사용
+            inner = getattr(chat_service, "chat_service", chat_service)
+            tokenizer = getattr(inner, "tokenizer", None)
+        if tokenizer is None:
+            hf = get_hf_model_and_tokenizer(self.llm)
+            tokenizer = hf[1] if hf is not None else None
+        if tokenizer is None:
+            return None
+        if self._budget_tokenizer is None or self._budget_tokenizer[0] is not tokenizer:
+            self._budget_tokenizer = (tokenizer, copy.deepcopy(tokenizer))
+        return self._budget_tokenizer[1]
+
+    async def aretrieve(
+        self,
+        question: str,
+        k: Optional[int],
+        embedding: Optional[List[float]],
+        search_params: Optional[Dict[str, Any]],
+        timings: Dict[str, float],
+        chat_service: Any = None,
+    ) -> List[Tuple[Document, float]]:
+        """검색 (+ 재정렬기가 있으면 후보 over-fetch 후 재정렬).
+
+        재정렬 점수는 cross-encoder 점수(클수록 관련)입니다. 컨텍스트 토큰
+        예산은 답변을 생성할 모델의 토크나이저로 셉니다.
+        """
+        k = k or self.k
+        fetch_k = max(k, settings.reranker_fetch_k) if self.reranker is not None else k
+        docs_with_scores, retrieve_timings = await run_blocking(
+            self.retrieve, question, fetch_k, embedding, search_params
+        )
+        timings.update(retrieve_timings)
+        if self.reranker is None:
+            return docs_with_scores
+
+        start = time.perf_counter()
+        docs_with_scores = await run_blocking(
+            self.reranker.rerank,
+            question,
+            [doc for doc, _ in docs_with_scores],
+            top_n=k,
+            max_context_tokens=settings.reranker_context_tokens,
+            tokenizer=self._generation_tokenizer(chat_service),
+            pool="rerank",
+        )
+        timings["rerank"] = time.perf_counter() - start
+        return docs_with_scores
+
+    async def agenerate(
+        self,
+        question: str,
+        docs: List[Document],
+        *,
+        chat_service: Any = None,
+        timings: Optional[Dict[str, float]] = None,
+    ) -> Tuple[str, str]:
+        """검색된 문서를 컨텍스트로 답변을 생성합니다.
+
+        chat_service(또는 배칭 스케줄러)가 주어지면 우선 사용하고, 실패하면
+        LLM 체인으로 fallback 합니다. LLM도 없으면 더미 응답을 반환합니다.
+        `timings` 를 넘기면 프롬프트 구성 시간(`prompt_build`)을 기록합니다.
+
+        Returns:
+            (답변, 실제로 답변을 만든 생성기: "chat_service" | "llm" | "dummy")
+        """
+        timings = timings if timings is not None else {}
+        if chat_service is not None:
+            try:
+                start = time.perf_counter()
+                prompt = build_rag_prompt(question, docs, self.prompt_version)
+                timings["prompt_build"] = time.perf_counter() - start
+                answer = await _achat(
+                    chat_service,
+                    prompt,
+                    max_new_tokens=512,
+                    temperature=0.7,
+                )
+                return answer, "chat_service"
+            except Exception as chat_error:
+                print(f"❌ Chat Service 오류: {chat_error}")
+                traceback.print_exc()
+                print("🔄 RAG 체인으로 fallback...")
+
+        if self.generation_chain is None:
+            return _dummy_answer(question, docs), "dummy"
+
+        start = time.perf_counter()
+        variables = {"context": format_context(docs), "question": question}
+
+        hf = get_hf_model_and_tokenizer(self.llm)
+        if hf is not None:
+            model, tokenizer = hf
+            # 파이프라인 대신 직접 생성해 공통 머리말의 KV 캐시를 재사용
+            prompt = self.prompt.invoke(variables).to_string()
+            timings["prompt_build"] = time.perf_counter() - start
+            answer = await run_blocking(
+                generate_text,
+                model,
+                tokenizer,
+                prompt,
+                pool="llm",
+                prefix=shared_prompt_prefix(prompt),
+            )
+            return answer, "llm"
+
+        timings["prompt_build"] = time.perf_counter() - start
+        return await ainvoke_chain(self.generation_chain, variables, self.llm), "llm"
+
+    @staticmethod
+    def _scope_generator(chat_service: Any) -> str:
+        """캐시 범위에 들어가는 생성기 이름."""
+        return "chat_service" if chat_service is not None else "llm"
+
+    def _cache_scope(
+        self,
+        k: Optional[int],
+        chat_service: Any,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> Hashable:
+        """같은 답변을 재사용할 수 있는 범위.
+
+        (provider, k, 프롬프트 버전, 생성기, 검색 방식, 메타데이터 필터)
+        """
+        generator = self._scope_generator(chat_service)
+        filters = (search_params or {}).get("filters")
+        return (
+            self.provider,
+            k or self.k,
+            self.prompt_version,
+            generator,
+            self.hybrid,
+            self.reranker is not None,
+            filters.cache_key() if filters is not None else None,
+        )
+
+    async def _lookup_cache(
+        self,
+        question: str,
+        k: Optional[int],
+        chat_service: Any,
+        search_params: Optional[Dict[str, Any]],
+        timings: Dict[str, float],
+    ):
+        """질문을 임베딩하고 시맨틱 캐시를 조회합니다.
+
+        Returns:
+            (질문 임베딩, 캐시 항목 또는 None).
+        """
+        start = time.perf_counter()
+        embedding = await run_blocking(self.embed, question)
+        timings["embed"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        hit = self.answer_cache.lookup(embedding, self._cache_scope(k, chat_service, search_params))
+        timings["cache_lookup"] = time.perf_counter() - start
+        return embedding, hit
+
+    async def arun(
+        self,
+        question: str,
+        *,
+        k: Optional[int] = None,
+        chat_service: Any = None,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> RAGResult:
+        """검색과 생성을 한 번에 수행합니다.
+
+        시맨틱 캐시가 있으면 먼저 조회하고, 적중하면 저장된 답변과 출처를
+        바로 반환합니다.
+
+        Args:
+            question: 질문.
+            k: 검색 문서 개수 (없으면 기본값).
+            chat_service: 선택적 QLoRA Chat Service.
+            search_params: 저장소 검색 인자 (ef_search, probes, filters).
+
+        Returns:
+            {answer, source_docs, scores, score_type, timings, cached}
+        """
+        total_start = time.perf_counter()
+        timings: Dict[str, float] = {}
+        embedding = None
+
+        if self.answer_cache is not None:
+            generation = self.answer_cache.generation
+            embedding, hit = await self._lookup_cache(
+                question, k, chat_service, search_params, timings
+            )
+            if hit is not None:
+                timings["total"] = time.perf_counter() - total_start
+                return RAGResult(
+                    answer=hit.answer,
+                    source_docs=hit.source_docs,
+                    scores=hit.scores,
+                    score_type=self.score_type,
+                    timings=timings,
+                    cached=True,
+                )
+
+        docs_with_scores = await self.aretrieve(
+            question, k, embedding, search_params, timings, chat_service
+        )
+        source_docs = [doc for doc, _ in docs_with_scores]
+        scores = [float(score) for _, score in docs_with_scores]
+
+        start = time.perf_counter()
+        answer, generator = await self.agenerate(
+            question, source_docs, chat_service=chat_service, timings=timings
+        )
+        timings["generate"] = time.perf_counter() - start
+        timings["total"] = time.perf_counter() - total_start
+
+        # fallback 답변이나 더미 답변은 캐시 범위의 생성기가 만든 것이 아니므로 저장하지 않음
+        if self.answer_cache is not None and generator == self._scope_generator(chat_service):
+            self.answer_cache.store(
+                embedding,
+                self._cache_scope(k, chat_service, search_params),
+                answer=answer,
+                source_docs=source_docs,
+                scores=scores,
+                cost_seconds=timings["total"],
+                generation=generation,
+            )
+
+        return RAGResult(
+            answer=answer,
+            source_docs=source_docs,
+            scores=scores,
+            score_type=self.score_type,
+            timings=timings,
+            cached=False,
+        )
+
+    async def astream_answer(
+        self,
+        question: str,
+        docs: List[Document],
+        *,
+        chat_service: Any = None,
+        timings: Optional[Dict[str, float]] = None,
+    ) -> AsyncIterator[str]:
+        """검색된 문서를 컨텍스트로 답변을 토큰 단위로 생성합니다.
+
+        - Chat Service / HuggingFacePipeline: `TextIteratorStreamer`
+        - 비동기 지원 LLM (ChatOpenAI 등): 체인의 `astream`
+        - 그 외: 전체 답변을 한 번에 반환
+        """
+        timings = timings if timings is not None else {}
+        if chat_service is not None:
+            start = time.perf_counter()
+            prompt = build_rag_prompt(question, docs, self.prompt_version)
+            timings["prompt_build"] = time.perf_counter() - start
+            async for text in chat_service.astream_chat(
+                prompt,
+                max_new_tokens=512,
+                temperature=0.7,
+            ):
+                yield text
+            return
+
+        if self.generation_chain is None:
+            yield _dummy_answer(question, docs)
+            return
+
+        start = time.perf_counter()
+        variables = {"context": format_context(docs), "question": question}
+
+        hf = get_hf_model_and_tokenizer(self.llm)
+        if hf is not None:
+            model, tokenizer = hf
+            # LLM 체인이 받는 것과 같은 문자열 프롬프트로 변환
+            prompt = self.prompt.invoke(variables).to_string()
+            timings["prompt_build"] = time.perf_counter() - start
+            async for text in astream_hf_generate(
+                model, tokenizer, prompt, prefix=shared_prompt_prefix(prompt)
+            ):
+                yield text
+            return
+
+        timings["prompt_build"] = time.perf_counter() - start
+        if has_native_async(self.llm):
+            async for text in self.generation_chain.astream(variables):
+                yield text
+            return
+
+        yield await ainvoke_chain(self.generation_chain, variables, self.llm)
+
+    async def astream(
+        self,
+        question: str,
+        *,
+        k: Optional[int] = None,
+        chat_service: Any = None,
+        search_params: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """검색 결과를 먼저 보내고, 이어서 생성 토큰을 이벤트로 보냅니다.
+
+        Yields:
+            {"event": "sources" | "token" | "done", "data": ...} 형식의 이벤트.
+            "done" 이벤트의 timings 에는 첫 토큰까지 걸린 시간(`ttft`)이 포함됩니다.
+        """
+        total_start = time.perf_counter()
+        timings: Dict[str, float] = {}
+        embedding = None
+
+        if self.answer_cache is not None:
+            generation = self.answer_cache.generation
+            embedding, hit = await self._lookup_cache(
+                question, k, chat_service, search_params, timings
+            )
+            if hit is not None:
+                yield {
+                    "event": "sources",
+                    "data": _sources_payload(hit.source_docs, hit.scores, self.score_type),
+                }
+                timings["ttft"] = time.perf_counter() - total_start
+                yield {"event": "token", "data": {"text": hit.answer}}
+                timings["total"] = time.perf_counter() - total_start
+                yield {"event": "done", "data": {"timings": timings, "cached": True}}
+                return
+
+        docs_with_scores = await self.aretrieve(
+            question, k, embedding, search_params, timings, chat_service
+        )
+        source_docs = [doc for doc, _ in docs_with_scores]
+        scores = [float(score) for _, score in docs_with_scores]
+        yield {"event": "sources", "data": _sources_payload(source_docs, scores, self.score_type)}
+
+        start = time.perf_counter()
+        chunks: List[str] = []
+        async for text in self.astream_answer(
+            question, source_docs, chat_service=chat_service, timings=timings
+        ):
+            if "ttft" not in timings:
+                timings["ttft"] = time.perf_counter() - total_start
+            chunks.append(text)
+            yield {"event": "token", "data": {"text": text}}
+
+        timings["generate"] = time.perf_counter() - start
+        timings["total"] = time.perf_counter() - total_start
+
+        # 스트리밍은 fallback 하지 않으므로 더미 답변(LLM 없음)만 제외
+        if self.answer_cache is not None and (
+            chat_service is not None or self.generation_chain is not None
+        ):
+            self.answer_cache.store(
+                embedding,
+                self._cache_scope(k, chat_service, search_params),
+                answer="".join(chunks),
+                source_docs=source_docs,
+                scores=scores,
+                cost_seconds=timings["total"],
+                generation=generation,
+            )
+
+        yield {"event": "done", "data": {"timings": timings, "cached": False}}
+
+
+class RAGChainRegistry:
+    """(LLM provider, k, 프롬프트 버전) 별 RAGPipeline 레지스트리.
+
+    프롬프트 템플릿과 runnable 그래프는 키별로 한 번만 만들어지고 이후
+    요청은 같은 객체를 재사용합니다. 요청별 `k` 는 검색 인자로만 전달되므로
+    그래프를 다시 만들지 않습니다. 생성 횟수/소요 시간과 재사용 횟수를
+    `stats()` 로 확인할 수 있어, 체인 구성 비용과 생성 단계(콜백/트레이싱
+    포함) 비용을 분리해서 측정할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        vectorstore,
+        llm: Optional[BaseLanguageModel] = None,
+        *,
+        provider: str,
+        default_k: int = 2,
+        default_prompt_version: str = "v1",
+        answer_cache: Optional[SemanticAnswerCache] = None,
+        repository: Any = None,
+        hybrid: bool = False,
+        reranker: Optional[CrossEncoderReranker] = None,
+    ):
+        self.vectorstore = vectorstore
+        self.llm = llm
+        self.provider = provider
+        self.default_k = default_k
+        self.default_prompt_version = default_prompt_version
+        self.answer_cache = answer_cache
+        self.repository = repository
+        self.hybrid = hybrid
+        self.reranker = reranker
+        self._pipelines: Dict[Tuple[str, int, str], RAGPipeline] = {}
+        self._lock = threading.Lock()
+        self._builds = 0
+        self._hits = 0
+        self._build_seconds = 0.0
+
+    def get(
+        self,
+        *,
+        k: Optional[int] = None,
+        prompt_version: Optional[str] = None,
+    ) -> RAGPipeline:
+        """키에 해당하는 파이프라인 반환 (없을 때만 생성)."""
+        key = (
+            self.provider,
+            k or self.default_k,
+            prompt_version or self.default_prompt_version,
+        )
+        pipeline = self._pipelines.get(key)
+        if pipeline is not None:
+            self._hits += 1
+            return pipeline
+
+        with self._lock:
+            pipeline = self._pipelines.get(key)
+            if pipeline is None:
+                start = time.perf_counter()
+                pipeline = RAGPipeline(
+                    self.vectorstore,
+                    llm=self.llm,
+                    k=key[1],
+                    prompt_version=key[2],
+                    provider=key[0],
+                    answer_cache=self.answer_cache,
+                    repository=self.repository,
+                    hybrid=self.hybrid,
+                    reranker=self.reranker,
+                )
+                self._build_seconds += time.perf_counter() - start
+                self._builds += 1
+                self._pipelines[key] = pipeline
+                print(f"🔗 RAG 체인 생성: provider={key[0]}, k={key[1]}, prompt={key[2]}")
+            return pipeline
 
+    def stats(self) -> Dict[str, Any]:
+        """레지스트리 사용 통계."""
+        return {
+            "pipelines": len(self._pipelines),
+            "builds": self._builds,
+            "hits": self._hits,
+            "build_seconds": round(self._build_seconds, 4),
+        }
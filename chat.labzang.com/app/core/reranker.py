@@ -0,0 +1,211 @@
+"""cross-encoder 기반 검색 결과 재정렬.
+
+`RAGRequest.k` 개 문서를 모두 프롬프트에 넣으면 로컬 LLM 의 prefill 시간이
+길어집니다. 재정렬을 켜면 pgvector 에서 후보를 넉넉히(`RERANKER_FETCH_K`)
+가져온 뒤 (질문, 문서) 쌍을 cross-encoder 한 번의 배치 forward 로 점수화하고,
+점수 순으로 컨텍스트 토큰 예산 안에 드는 상위 문서만 남깁니다.
+예산은 프롬프트를 실제로 만드는 생성 모델의 토크나이저로 계산합니다.
+
+- 점수는 (질문, 문서 ID) 별 LRU 캐시에 저장되어, 같은 질문에서 다시 나온
+  문서는 모델을 거치지 않습니다.
+- 모델은 첫 사용 시 한 번만 로드하고, 추론은 "rerank" 스레드 풀에서 실행합니다.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+from app.config import settings
+
+
+def document_key(doc: Document) -> str:
+    """캐시용 문서 ID (청크 내용 해시가 있으면 사용, 없으면 내용 해시)."""
+    metadata = doc.metadata or {}
+    content_hash = metadata.get("content_hash")
+    if content_hash:
+        return f"{metadata.get('doc_id', '')}:{content_hash}"
+    return hashlib.sha256(doc.page_content.encode("utf-8")).hexdigest()
+
+
+class CrossEncoderReranker:
+    """(질문, 문서) 쌍을 한 번의 배치로 점수화하는 재정렬기."""
+
+    def __init__(
+        self,
+        model_name: str,
+        *,
+        device: str = "cpu",
+        batch_size: int = 32,
+        max_length: int = 512,
+        cache_max_entries: int = 10000,
+    ):
+        """재정렬기를 초기화합니다 (모델은 첫 호출 시 로드).
+
+        Args:
+            model_name: Hugging Face cross-encoder 모델 이름 또는 경로.
+            device: 추론 디바이스.
+            batch_size: 한 번의 forward 에 넣을 최대 쌍 수.
+            max_length: (질문, 문서) 쌍 최대 토큰 수.
+            cache_max_entries: 점수 캐시 최대 항목 수.
+        """
+        self.model_name = model_name
+        self.device = device
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.cache_max_entries = cache_max_entries
+        self._model = None
+        self._tokenizer = None
+        self._load_lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._batches = 0
+
+    def _load(self) -> None:
+        if self._model is not None:
+            return
+        with self._load_lock:
+            if self._model is None:
+                from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+                print(f"🔧 재정렬 모델 로딩: {self.model_name}")
+                self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+                model.to(self.device)
+                model.eval()
+                self._model = model
+
+    def count_tokens(self, text: str) -> int:
+        """cross-encoder 토크나이저 기준 토큰 수."""
+        self._load()
+        return len(self._tokenizer.encode(text, add_special_tokens=False))
+
+    def _token_counts(self, texts: List[str], tokenizer: Any = None) -> List[int]:
+        """문서별 토큰 수 (한 번의 배치 인코딩).
+
+        생성 모델 토크나이저가 없으면 cross-encoder 토크나이저로 근사합니다.
+        """
+        if tokenizer is None:
+            self._load()
+            tokenizer = self._tokenizer
+        encoded = tokenizer(texts, add_special_tokens=False)["input_ids"]
+        return [len(ids) for ids in encoded]
+
+    def _predict(self, query: str, texts: List[str]) -> List[float]:
+        """(질문, 문서) 쌍 점수 (동적 패딩, batch_size 개씩 forward)."""
+        import torch
+
+        self._load()
+        scores: List[float] = []
+        with torch.inference_mode():
+            for start in range(0, len(texts), self.batch_size):
+                batch = texts[start : start + self.batch_size]
+                inputs = self._tokenizer(
+                    [query] * len(batch),
+                    batch,
+                    padding=True,
+                    truncation=True,
+                    max_length=self.max_length,
+                    return_tensors="pt",
+                ).to(self.device)
+                logits = self._model(**inputs).logits
+                # 단일 출력(관련도)이면 그대로, 2-클래스면 "관련" 로짓 사용
+                logits = logits[:, -1] if logits.shape[-1] > 1 else logits.squeeze(-1)
+                scores.extend(logits.float().cpu().tolist())
+                with self._cache_lock:
+                    self._batches += 1
+        return scores
+
+    def score(self, query: str, docs: Sequence[Document]) -> List[float]:
+        """문서별 관련도 점수 (캐시에 없는 문서만 모델로 계산)."""
+        keys = [(query, document_key(doc)) for doc in docs]
+        scores: List[Optional[float]] = [None] * len(docs)
+        missing: List[int] = []
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is None:
+                    missing.append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    scores[i] = cached
+            self._hits += len(docs) - len(missing)
+            self._misses += len(missing)
+
+        if missing:
+            computed = self._predict(query, [docs[i].page_content for i in missing])
+            with self._cache_lock:
+                for i, value in zip(missing, computed):
+                    scores[i] = value
+                    self._cache[keys[i]] = value
+                    self._cache.move_to_end(keys[i])
+                while len(self._cache) > self.cache_max_entries:
+                    self._cache.popitem(last=False)
+        return [float(s) for s in scores]
+
+    def rerank(
+        self,
+        query: str,
+        docs: Sequence[Document],
+        *,
+        top_n: int,
+        max_context_tokens: Optional[int] = None,
+        tokenizer: Any = None,
+    ) -> List[Tuple[Document, float]]:
+        """점수 순으로 최대 top_n 개를 토큰 예산 안에서 선택 (블로킹).
+
+        예산을 넘더라도 가장 관련도가 높은 문서 하나는 항상 포함합니다.
+
+        Args:
+            tokenizer: 컨텍스트 예산을 셀 생성 모델 토크나이저
+                (없으면 cross-encoder 토크나이저로 근사).
+
+        Returns:
+            (문서, cross-encoder 점수) 목록 (점수가 클수록 관련).
+        """
+        if not docs:
+            return []
+        ranked = sorted(zip(docs, self.score(query, docs)), key=lambda x: x[1], reverse=True)
+        if not max_context_tokens:
+            return ranked[:top_n]
+
+        token_counts = self._token_counts([doc.page_content for doc, _ in ranked], tokenizer)
+        selected: List[Tuple[Document, float]] = []
+        used_tokens = 0
+        for (doc, score), tokens in zip(ranked, token_counts):
+            if len(selected) >= top_n:
+                break
+            if selected and used_tokens + tokens > max_context_tokens:
+                continue
+            used_tokens += tokens
+            selected.append((doc, score))
+        return selected
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중률과 forward 배치 수."""
+        lookups = self._hits + self._misses
+        return {
+            "model": self.model_name,
+            "loaded": self._model is not None,
+            "cache_entries": len(self._cache),
+            "cache_hits": self._hits,
+            "cache_misses": self._misses,
+            "cache_hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            "batches": self._batches,
+        }
+
+
+def create_reranker() -> Optional[CrossEncoderReranker]:
+    """설정값으로 재정렬기 생성 (USE_RERANKER=false 이면 None)."""
+    if not settings.use_reranker:
+        return None
+    return CrossEncoderReranker(
+        settings.reranker_model,
+        batch_size=settings.reranker_batch_size,
+        max_length=settings.reranker_max_length,
+        cache_max_entries=settings.reranker_cache_entries,
+    )
@@ -0,0 +1,178 @@
+"""RAG 답변 시맨틱 캐시.
+
+질문 임베딩 간 코사인 유사도가 임계값 이상인 이전 질문이 있으면 저장된
+답변과 출처 문서를 그대로 반환해, 거의 같은 질문에 대해 검색과 LLM 생성을
+다시 수행하지 않도록 합니다.
+
+- 조회 키는 `RAGPipeline` 이 검색용으로 이미 계산한 질문 임베딩입니다
+  (추가 임베딩 호출 없음).
+- 답변은 (provider, k, 프롬프트 버전, 생성기) 범위가 같은 항목끼리만 재사용합니다.
+- TTL 이 지난 항목은 조회 시 제거되고, 최대 항목 수를 넘으면 LRU 로 제거됩니다.
+- 문서가 추가되면 `invalidate()` 로 전체를 비웁니다. 무효화 이전에 시작된
+  요청의 결과는 세대(generation) 번호로 걸러져 저장되지 않습니다.
+"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+from app.config import settings
+
+
+@dataclass
+class CachedAnswer:
+    """캐시에 저장된 RAG 결과."""
+
+    vector: np.ndarray
+    scope: Hashable
+    answer: str
+    source_docs: List[Any]
+    scores: List[float]
+    cost_seconds: float
+    created_at: float = field(default_factory=time.time)
+
+
+class SemanticAnswerCache:
+    """질문 임베딩 코사인 유사도 기반 답변 캐시 (TTL + LRU)."""
+
+    def __init__(
+        self,
+        *,
+        threshold: float = 0.95,
+        ttl_seconds: float = 3600,
+        max_entries: int = 1000,
+    ):
+        """캐시를 초기화합니다.
+
+        Args:
+            threshold: 캐시 적중으로 볼 최소 코사인 유사도.
+            ttl_seconds: 항목 유지 시간(초).
+            max_entries: 최대 항목 수 (초과 시 가장 오래 사용하지 않은 항목 제거).
+        """
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, CachedAnswer]" = OrderedDict()
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self.generation = 0
+
+        # 메트릭
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.latency_saved_seconds = 0.0
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else array
+
+    def _expire(self, now: float) -> None:
+        expired = [
+            key for key, entry in self._entries.items()
+            if now - entry.created_at > self.ttl_seconds
+        ]
+        for key in expired:
+            del self._entries[key]
+        self.evictions += len(expired)
+
+    def lookup(self, vector: Sequence[float], scope: Hashable) -> Optional[CachedAnswer]:
+        """가장 유사한 같은 범위의 항목이 임계값 이상이면 반환."""
+        query = self._normalize(vector)
+        with self._lock:
+            self._expire(time.time())
+            candidates = [
+                (key, entry) for key, entry in self._entries.items()
+                if entry.scope == scope and entry.vector.shape == query.shape
+            ]
+            if candidates:
+                matrix = np.stack([entry.vector for _, entry in candidates])
+                similarities = matrix @ query
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    key, entry = candidates[best]
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self.latency_saved_seconds += entry.cost_seconds
+                    return entry
+            self.misses += 1
+            return None
+
+    def store(
+        self,
+        vector: Sequence[float],
+        scope: Hashable,
+        *,
+        answer: str,
+        source_docs: List[Any],
+        scores: List[float],
+        cost_seconds: float,
+        generation: int,
+    ) -> None:
+        """결과 저장 (조회 이후 무효화되었다면 저장하지 않음).
+
+        Args:
+            generation: 요청 시작 시점의 `self.generation` 값.
+        """
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[next(self._ids)] = CachedAnswer(
+                vector=self._normalize(vector),
+                scope=scope,
+                answer=answer,
+                source_docs=list(source_docs),
+                scores=list(scores),
+                cost_seconds=cost_seconds,
+            )
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        """문서가 바뀌었을 때 전체 항목 삭제."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """적중률, 절약된 지연 시간 등 캐시 통계."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "latency_saved_seconds": round(self.latency_saved_seconds, 3),
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+def create_answer_cache(embeddings: Any = None) -> Optional[SemanticAnswerCache]:
+    """설정값으로 시맨틱 캐시 생성 (USE_SEMANTIC_CACHE=false 이면 None).
+
+    더미 임베딩(`SimpleEmbeddings`)은 모든 질문이 같은 벡터라 어떤 질문이든
+    첫 번째 캐시 답변에 적중하므로, 이때도 캐시를 만들지 않습니다.
+    """
+    if not settings.use_semantic_cache:
+        return None
+    from app.core.vectorstore import is_stub_embeddings
+
+    if embeddings is not None and is_stub_embeddings(embeddings):
+        print("⚠️ 더미 임베딩을 사용 중이라 시맨틱 캐시를 끕니다.")
+        return None
+    return SemanticAnswerCache(
+        threshold=settings.semantic_cache_threshold,
+        ttl_seconds=settings.semantic_cache_ttl_seconds,
+        max_entries=settings.semantic_cache_max_entries,
+    )
@@ -0,0 +1,119 @@
+"""단계별 병렬 시작과 준비 상태(readiness) 추적.
+
+이전에는 lifespan 이 DB 대기 → 벡터스토어 → LLM → QLoRA 모델을 차례로
+기다려 콜드 스타트가 각 단계 시간의 합이었습니다. 이제 lifespan 은 시작
+작업을 백그라운드로 띄우고 바로 요청을 받으며(`/health/live`), DB 풀,
+임베딩, LLM 처럼 서로 독립적인 단계는 동시에 로드합니다. 모든 필수 단계와
+워밍업 생성이 끝나야 `/health/ready` 가 200 을 반환하므로, 컨테이너는
+실제로 빠르게 응답할 수 있을 때만 트래픽을 받습니다.
+"""
+
+import asyncio
+import time
+import traceback
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class StartupTracker:
+    """시작 단계별 상태와 소요 시간."""
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.started_at = time.time()
+        self.ready_at: Optional[float] = None
+        self.failed = False
+        self._ready = asyncio.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    async def wait_ready(self) -> None:
+        await self._ready.wait()
+
+    def mark_ready(self) -> None:
+        self.ready_at = time.time()
+        self._ready.set()
+        print(f"✅ 애플리케이션 준비 완료! ({self.ready_at - self.started_at:.2f}s)")
+
+    def skip(self, name: str, reason: str) -> None:
+        self.stages[name] = {"status": "skipped", "reason": reason}
+
+    async def stage(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[T]],
+        *,
+        required: bool = True,
+    ) -> Optional[T]:
+        """한 단계를 실행하고 상태를 기록합니다.
+
+        Args:
+            name: 단계 이름.
+            func: 실행할 코루틴 함수.
+            required: 실패 시 앱 전체를 준비 불가(failed)로 표시할지 여부.
+                선택 단계가 실패하면 None 을 반환하고 계속 진행합니다.
+        """
+        stage = {"status": "running", "required": required}
+        self.stages[name] = stage
+        start = time.perf_counter()
+        print(f"⏳ 시작 단계: {name}")
+        try:
+            result = await func()
+        except Exception as e:
+            stage.update(status="failed", error=str(e))
+            print(f"❌ 시작 단계 실패: {name} - {e}")
+            traceback.print_exc()
+            if required:
+                self.failed = True
+                raise
+            return None
+        finally:
+            stage["seconds"] = round(time.perf_counter() - start, 3)
+        stage["status"] = "ready"
+        print(f"✅ 시작 단계 완료: {name} ({stage['seconds']:.2f}s)")
+        return result
+
+    def status(self) -> Dict[str, Any]:
+        """준비 상태 요약 (`/health/ready` 응답)."""
+        return {
+            "ready": self.ready,
+            "failed": self.failed,
+            "elapsed_seconds": round((self.ready_at or time.time()) - self.started_at, 3),
+            "stages": self.stages,
+        }
+
+
+def warmup_generation(llm: Any, chat_service: Any, max_new_tokens: int) -> bool:
+    """로컬 모델로 짧은 생성을 한 번 실행 (블로킹).
+
+    첫 요청이 CUDA/MKL 커널 초기화와 RAG 머리말 KV 캐시 생성 비용을
+    치르지 않도록 합니다. 원격 API LLM 은 비용이 들므로 건너뜁니다.
+
+    Returns:
+        워밍업을 실행했으면 True.
+    """
+    from app.core.llm.prefix_cache import generate_text
+    from app.core.llm.streaming import get_hf_model_and_tokenizer
+    from app.core.rag_chain import build_rag_prompt, shared_prompt_prefix
+
+    prompt = build_rag_prompt("안녕하세요", [])
+    if chat_service is not None:
+        chat_service.chat(prompt, max_new_tokens=max_new_tokens, do_sample=False)
+        return True
+
+    hf = get_hf_model_and_tokenizer(llm)
+    if hf is None:
+        return False
+    model, tokenizer = hf
+    generate_text(
+        model,
+        tokenizer,
+        prompt,
+        prefix=shared_prompt_prefix(prompt),
+        max_new_tokens=max_new_tokens,
+        do_sample=False,
+    )
+    return True
@@ -0,0 +1,302 @@
+"""pgvector ANN 인덱스(HNSW / IVFFlat) 관리.
+
+PGVector 가 만드는 `langchain_pg_embedding.embedding` 컬럼은 차원이 없는
+`vector` 타입이라 그대로는 ANN 인덱스를 만들 수 없고, 모든 유사도 검색이
+순차 스캔이 됩니다. 여기서는 컬렉션별 부분(partial) 식 인덱스를 만듭니다.
+
+    CREATE INDEX ... USING hnsw ((embedding::vector(384)) vector_cosine_ops)
+    WHERE collection_id = '<컬렉션 UUID>'
+
+`VectorRepository.search` 가 같은 식과 조건으로 정렬하므로 플래너가 이
+인덱스를 사용합니다. opclass 는 벡터스토어의 거리 전략(cosine/l2/inner)에
+맞춰 고릅니다. `rebuild()` 는 인덱스를 다시 만들고 인덱스 크기, 빌드 시간,
+정확한 검색 대비 recall@k 를 보고합니다.
+
+하이브리드 검색을 쓰면 전문 검색 식(`to_tsvector('simple', document)`)에
+대한 컬렉션별 GIN 인덱스도 함께 만듭니다. 메타데이터 필터용으로
+`cmetadata` jsonb GIN(jsonb_path_ops, `@>` 전용) 인덱스와 날짜 필드 B-tree
+인덱스도 만듭니다.
+"""
+
+import math
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.repository.vector_repository import (
+    DISTANCE_OPERATORS,
+    EMBEDDING_TABLE,
+    TSVECTOR_EXPRESSION,
+    MetadataFilter,
+    VectorRepository,
+    validate_metadata_key,
+)
+
+INDEX_METHODS = ("hnsw", "ivfflat")
+
+
+class VectorIndexManager:
+    """한 컬렉션의 ANN 인덱스 생성/재생성/평가."""
+
+    def __init__(
+        self,
+        repository: VectorRepository,
+        *,
+        method: str = "hnsw",
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 64,
+        ivfflat_lists: int = 0,
+        lexical: bool = False,
+        metadata: bool = False,
+        date_field: str = "date",
+    ):
+        """인덱스 관리자를 초기화합니다.
+
+        Args:
+            repository: 대상 컬렉션의 저장소.
+            method: "hnsw" 또는 "ivfflat".
+            hnsw_m: HNSW 노드당 연결 수.
+            hnsw_ef_construction: HNSW 빌드 시 탐색 폭.
+            ivfflat_lists: IVFFlat 리스트 수 (0 이면 행 수에 맞춰 자동 결정).
+            lexical: 하이브리드 검색용 전문 검색 GIN 인덱스도 관리할지 여부.
+            metadata: 메타데이터 필터용 GIN / 날짜 B-tree 인덱스도 관리할지 여부.
+            date_field: 날짜 범위 필터에 쓰는 메타데이터 키.
+        """
+        if method not in INDEX_METHODS:
+            raise ValueError(f"지원하지 않는 인덱스 방식: {method}")
+        self.repository = repository
+        self.method = method
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.ivfflat_lists = ivfflat_lists
+        self.lexical = lexical
+        self.metadata = metadata
+        self.date_field = validate_metadata_key(date_field)
+
+    @property
+    def opclass(self) -> str:
+        """거리 전략에 맞는 인덱스 opclass."""
+        return DISTANCE_OPERATORS[self.repository.distance][1]
+
+    def index_name(self, method: Optional[str] = None) -> str:
+        """컬렉션/방식별 인덱스 이름 (Postgres 식별자 길이 63자 이내)."""
+        collection = re.sub(r"[^a-z0-9_]", "_", self.repository.collection_name.lower())
+        return f"ix_{EMBEDDING_TABLE}_{collection}_{method or self.method}"[:63]
+
+    def _lists_for(self, rows: int) -> int:
+        """IVFFlat 권장 리스트 수 (100만 행 이하: rows/1000, 초과: sqrt(rows))."""
+        if self.ivfflat_lists:
+            return self.ivfflat_lists
+        if rows <= 1_000_000:
+            return max(1, rows // 1000)
+        return max(1, int(math.sqrt(rows)))
+
+    def _lexical_sql(self) -> str:
+        return (
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.index_name('fts')} "
+            f"ON {EMBEDDING_TABLE} USING gin ({TSVECTOR_EXPRESSION}) "
+            f"WHERE {self.repository.collection_predicate()}"
+        )
+
+    def _metadata_sql(self) -> List[str]:
+        expr = self.repository.metadata_expression
+        predicate = self.repository.collection_predicate()
+        return [
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.index_name('meta')} "
+            f"ON {EMBEDDING_TABLE} USING gin ({expr} jsonb_path_ops) WHERE {predicate}",
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.index_name('meta_' + self.date_field)} "
+            f"ON {EMBEDDING_TABLE} (({expr} ->> '{self.date_field}')) WHERE {predicate}",
+        ]
+
+    def _create_sql(self, dimensions: int, rows: int) -> str:
+        expr = self.repository.embedding_expression(dimensions)
+        if self.method == "hnsw":
+            options = f"WITH (m = {int(self.hnsw_m)}, ef_construction = {int(self.hnsw_ef_construction)})"
+        else:
+            options = f"WITH (lists = {self._lists_for(rows)})"
+        return (
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.index_name()} "
+            f"ON {EMBEDDING_TABLE} USING {self.method} ({expr} {self.opclass}) "
+            f"{options} WHERE {self.repository.collection_predicate()}"
+        )
+
+    def _autocommit(self):
+        # CREATE/DROP INDEX CONCURRENTLY 는 트랜잭션 밖에서 실행해야 함
+        return self.repository.engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+    def status(self) -> Dict[str, Any]:
+        """인덱스 존재 여부, 크기, 정의."""
+        with self.repository.engine.connect() as conn:
+            row = conn.execute(
+                text(
+                    "SELECT indexdef, pg_relation_size(to_regclass(:name)) FROM pg_indexes "
+                    "WHERE indexname = :name AND schemaname = current_schema()"
+                ),
+                {"name": self.index_name()},
+            ).fetchone()
+        return {
+            "index": self.index_name(),
+            "method": self.method,
+            "opclass": self.opclass,
+            "exists": row is not None,
+            "definition": row[0] if row else None,
+            "size_bytes": int(row[1]) if row else 0,
+        }
+
+    def ensure_index(self) -> bool:
+        """인덱스가 없으면 생성 (컬렉션이 비어 있으면 차원을 알 수 없어 건너뜀).
+
+        Returns:
+            인덱스가 (이미 또는 새로) 존재하면 True.
+        """
+        dimensions = self.repository.dimensions()
+        if dimensions is None:
+            print("⚠️ 컬렉션이 비어 있어 벡터 인덱스 생성을 건너뜁니다.")
+            return False
+
+        rows = self.repository.count()
+        start = time.perf_counter()
+        with self._autocommit() as conn:
+            conn.execute(text(self._create_sql(dimensions, rows)))
+            if self.lexical:
+                conn.execute(text(self._lexical_sql()))
+            if self.metadata:
+                for sql in self._metadata_sql():
+                    conn.execute(text(sql))
+        print(
+            f"✅ 벡터 인덱스 준비: {self.index_name()} "
+            f"({self.method}, {self.opclass}, {time.perf_counter() - start:.2f}s)"
+        )
+        return True
+
+    def drop_index(self) -> None:
+        """모든 방식의 이 컬렉션 인덱스 삭제."""
+        with self._autocommit() as conn:
+            for method in INDEX_METHODS:
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {self.index_name(method)}"))
+
+    def measure_recall(
+        self,
+        *,
+        k: int = 10,
+        samples: int = 20,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """저장된 임베딩을 질의로 사용해 ANN 검색과 정확한 검색 결과 비교.
+
+        Returns:
+            recall@k 와 두 검색의 평균 지연(ms).
+        """
+        with self.repository.engine.connect() as conn:
+            queries: List[str] = [
+                row[0]
+                for row in conn.execute(
+                    text(
+                        f"SELECT embedding::text FROM {EMBEDDING_TABLE} "
+                        f"WHERE {self.repository.collection_predicate()} "
+                        "ORDER BY random() LIMIT :samples"
+                    ),
+                    {"samples": samples},
+                )
+            ]
+        if not queries:
+            return {"recall_at_k": None, "k": k, "samples": 0}
+
+        recalls: List[float] = []
+        ann_seconds = exact_seconds = 0.0
+        for literal in queries:
+            embedding = [float(x) for x in literal.strip("[]").split(",")]
+
+            start = time.perf_counter()
+            ann = self.repository.search(embedding, k, ef_search=ef_search, probes=probes)
+            ann_seconds += time.perf_counter() - start
+
+            start = time.perf_counter()
+            exact = self.repository.search(embedding, k, exact=True)
+            exact_seconds += time.perf_counter() - start
+
+            expected = {doc.page_content for doc, _ in exact}
+            if expected:
+                found = {doc.page_content for doc, _ in ann}
+                recalls.append(len(found & expected) / len(expected))
+
+        return {
+            "recall_at_k": round(sum(recalls) / len(recalls), 4) if recalls else None,
+            "k": k,
+            "samples": len(queries),
+            "ann_avg_ms": round(ann_seconds / len(queries) * 1000, 2),
+            "exact_avg_ms": round(exact_seconds / len(queries) * 1000, 2),
+        }
+
+    def rebuild(
+        self,
+        *,
+        method: Optional[str] = None,
+        k: int = 10,
+        samples: int = 20,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """인덱스를 삭제 후 다시 만들고 크기/빌드 시간/recall 을 보고 (블로킹).
+
+        Args:
+            method: 새 인덱스 방식 (없으면 현재 방식 유지).
+            k: recall 측정 시 검색 문서 수.
+            samples: recall 측정에 사용할 질의 수.
+            ef_search: recall 측정 시 HNSW 탐색 폭.
+            probes: recall 측정 시 IVFFlat 탐색 리스트 수.
+        """
+        if method is not None:
+            if method not in INDEX_METHODS:
+                raise ValueError(f"지원하지 않는 인덱스 방식: {method}")
+            self.method = method
+
+        self.drop_index()
+        start = time.perf_counter()
+        created = self.ensure_index()
+        build_seconds = time.perf_counter() - start
+
+        report = self.status()
+        report["rows"] = self.repository.count()
+        report["build_seconds"] = round(build_seconds, 3)
+        if created:
+            report.update(
+                self.measure_recall(k=k, samples=samples, ef_search=ef_search, probes=probes)
+            )
+        return report
+
+
+def resolve_search_params(
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    filters: Optional[MetadataFilter] = None,
+) -> Dict[str, Any]:
+    """요청별 검색 파라미터 (ANN 값이 없으면 설정 기본값)."""
+    params: Dict[str, Any] = {
+        "ef_search": ef_search or settings.hnsw_ef_search,
+        "probes": probes or settings.ivfflat_probes,
+    }
+    if filters is not None and not filters.is_empty():
+        params["filters"] = filters
+        params["iterative_scan"] = settings.hnsw_iterative_scan
+    return params
+
+
+def create_index_manager(repository: VectorRepository) -> Optional[VectorIndexManager]:
+    """설정값으로 인덱스 관리자 생성 (VECTOR_INDEX_METHOD=none 이면 None)."""
+    if settings.vector_index_method not in INDEX_METHODS:
+        return None
+    return VectorIndexManager(
+        repository,
+        method=settings.vector_index_method,
+        hnsw_m=settings.hnsw_m,
+        hnsw_ef_construction=settings.hnsw_ef_construction,
+        ivfflat_lists=settings.ivfflat_lists,
+        lexical=settings.use_hybrid_search,
+        metadata=settings.metadata_index,
+        date_field=settings.metadata_date_field,
+    )
@@ -5,16 +5,29 @@
 
 연결 정보는 `app.config.Settings.database_url` 을 통해 주입되며,
 이는 `.env` 의 `DATABASE_URL` 값(없으면 기존 POSTGRES_* 조합)을 사용합니다.
+
+벡터스토어와 SQLAlchemy 엔진(커넥션 풀)은 프로세스당 한 번만 생성되어
+모든 요청이 공유합니다. 요청마다 새 커넥션(TLS 핸드셰이크 포함)을
+여는 비용을 없애기 위함입니다.
 """
 
-from typing import List
+import time
+from typing import Any, Dict, List, Optional
 
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import PGVector
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
 
 from app.config import settings
+from app.core.embedding_cache import wrap_embeddings
+
+# 프로세스 전역 공유 인스턴스
+_engine: Optional[Engine] = None
+_vectorstore: Optional[PGVector] = None
 
 
 class SimpleEmbeddings(Embeddings):
@@ -29,11 +42,29 @@ class SimpleEmbeddings(Embeddings):
         return [0.1, 0.2, 0.3, 0.4, 0.5]
 
 
+def is_stub_embeddings(embeddings: Any) -> bool:
+    """더미 임베딩인지 (캐시 래퍼 안쪽까지 확인). 모든 텍스트가 같은 벡터가 됩니다."""
+    return isinstance(getattr(embeddings, "underlying", embeddings), SimpleEmbeddings)
+
+
 def get_embeddings() -> Embeddings:
-    """임베딩 모델 반환."""
-    if settings.openai_api_key:
-        return OpenAIEmbeddings()
-    return SimpleEmbeddings()
+    """임베딩 모델 반환 (같은 텍스트는 다시 계산하지 않도록 캐시 래퍼 적용).
+
+    EMBEDDING_PROVIDER:
+    - auto: OpenAI 키가 있으면 OpenAI, 없으면 한국어 HF 모델 (없으면 더미)
+    - openai / korean / simple: 해당 임베딩 고정
+    """
+    provider = settings.embedding_provider.lower()
+    if provider == "openai" or (provider == "auto" and settings.openai_api_key):
+        return wrap_embeddings(OpenAIEmbeddings())
+    if provider in ("auto", "korean"):
+        from app.core.korean_embeddings import HF_EMBEDDINGS_AVAILABLE, init_korean_embeddings
+
+        if HF_EMBEDDINGS_AVAILABLE or provider == "korean":
+            # init_korean_embeddings 는 이미 캐시 래퍼를 적용해 반환
+            return init_korean_embeddings()
+        print("⚠️ 한국어 임베딩을 사용할 수 없어 더미 임베딩을 사용합니다.")
+    return wrap_embeddings(SimpleEmbeddings())
 
 
 def get_connection_string() -> str:
@@ -41,17 +72,95 @@ def get_connection_string() -> str:
     return settings.database_url
 
 
-def get_vectorstore() -> "PGVector":
-    """PGVector 벡터스토어 인스턴스 반환 (Neon 등 외부 Postgres 사용)."""
-    embeddings = get_embeddings()
-    connection_string = get_connection_string()
+def get_engine() -> Engine:
+    """공유 SQLAlchemy 엔진 반환.
 
-    vectorstore = PGVector(
-        connection_string=connection_string,
-        embedding_function=embeddings,
-        collection_name="langchain_collection",
+    크기가 제한된 `QueuePool` 을 사용하며, 체크아웃 전에 ping 을 보내
+    Neon 등에서 끊긴 유휴 커넥션을 자동으로 교체합니다.
+    """
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            get_connection_string(),
+            poolclass=QueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+        )
+        print(
+            f"🔌 DB 커넥션 풀 생성 (pool_size={settings.db_pool_size}, "
+            f"max_overflow={settings.db_max_overflow})"
+        )
+    return _engine
+
+
+def create_vectorstore(
+    engine: Optional[Engine] = None, embeddings: Optional[Embeddings] = None
+) -> "PGVector":
+    """새 PGVector 인스턴스 생성.
+
+    Args:
+        engine: 사용할 SQLAlchemy 엔진. 없으면 공유 엔진을 사용합니다.
+        embeddings: 사용할 임베딩. 없으면 `get_embeddings()` 로 생성합니다.
+    """
+    return PGVector(
+        connection_string=get_connection_string(),
+        embedding_function=embeddings or get_embeddings(),
+        collection_name=settings.collection_name,
+        connection=engine or get_engine(),
     )
-    return vectorstore
+
+
+def get_vectorstore(embeddings: Optional[Embeddings] = None) -> "PGVector":
+    """PGVector 벡터스토어 인스턴스 반환 (Neon 등 외부 Postgres 사용).
+
+    첫 호출 시 한 번만 생성되며, 이후에는 같은 인스턴스를 재사용합니다.
+    시작 시 미리 로드한 임베딩을 넘기면 그것을 사용합니다.
+    """
+    global _vectorstore
+    if _vectorstore is None:
+        _vectorstore = create_vectorstore(embeddings=embeddings)
+    return _vectorstore
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """공유 커넥션 풀 상태 반환 (엔진이 아직 없으면 빈 dict)."""
+    if _engine is None:
+        return {}
+
+    pool = _engine.pool
+    return {
+        "pool_size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.db_max_overflow,
+    }
+
+
+def ping_database() -> Optional[float]:
+    """공유 풀의 커넥션으로 `SELECT 1` 을 실행하고 지연(초)을 반환 (블로킹).
+
+    새 커넥션을 열지 않고 풀에서 빌려 쓰며, 엔진이 아직 없으면 None 을 반환합니다.
+    """
+    if _engine is None:
+        return None
+
+    start = time.perf_counter()
+    with _engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    return time.perf_counter() - start
+
+
+def dispose_vectorstore() -> None:
+    """공유 벡터스토어를 해제하고 풀의 커넥션을 모두 닫습니다."""
+    global _engine, _vectorstore
+    _vectorstore = None
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
 
 
 def add_sample_documents(vectorstore: "PGVector") -> None:
@@ -81,13 +190,15 @@ def add_sample_documents(vectorstore: "PGVector") -> None:
     vectorstore.add_documents(sample_docs)
 
 
-def initialize_vectorstore() -> "PGVector":
+def initialize_vectorstore(embeddings: Optional[Embeddings] = None) -> "PGVector":
     """벡터스토어 초기화 및 샘플 데이터 추가.
 
     원격 Postgres를 사용하므로, 단 한 번 초기화되면 이후에는
     같은 컬렉션을 계속 재사용합니다.
     """
-    vectorstore = get_vectorstore()
+    vectorstore = get_vectorstore(embeddings)
+    if not settings.seed_sample_documents:
+        return vectorstore
 
     try:
         existing_docs = vectorstore.similarity_search("test", k=1)
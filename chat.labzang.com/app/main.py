@@ -1,37 +1,51 @@
-"""FastAPI 메인 애플리케이션."""
+"""FastAPI 메인 애플리케이션.
+
+검색(/search, /retrieve), RAG(/rag), 문서 수집(/documents), 관리(/admin)
+라우트를 한 앱에서 제공합니다. 벡터스토어(커넥션 풀), 임베딩, LLM, 캐시는
+lifespan 에서 한 번만 만들어 app.state 로 공유하고, 모든 설정은
+`app.config.Settings` 에서 읽습니다. (`app.api_server` 는 이 앱을 다시
+내보내는 호환용 엔트리포인트입니다.)
+"""
 
 import asyncio
+import time
 from contextlib import asynccontextmanager
 
-import psycopg2
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
 from app.api.models import HealthResponse
-from app.api.routes import search
-from app.router import chat_router
+from app.core.health import create_health_monitor
+from app.core.metrics import CONTENT_TYPE, observe_http, register_runtime_collector, render_metrics
+from app.core.startup import StartupTracker, warmup_generation
+from app.api.routes import admin, search
+from app.router import chat_router, document_router
 
 
 def wait_for_postgres() -> None:
     """PostgreSQL 데이터베이스가 준비될 때까지 대기.
 
     Docker 컨테이너 대신 외부(Postgres/Neon 등) 인스턴스를 사용하므로,
-    `Settings.database_url`을 사용해 접속을 시도합니다.
+    `Settings.database_url`을 사용해 접속을 시도합니다. 공유 커넥션 풀로
+    접속하므로 성공하면 풀에 커넥션 하나가 미리 만들어져 있습니다.
     """
     import time
 
-    max_retries = 30
+    from sqlalchemy import text
+
+    from app.core.vectorstore import get_engine
+
+    max_retries = settings.startup_db_retries
     retry_count = 0
 
     while retry_count < max_retries:
         try:
-            # DATABASE_URL 포함: postgresql://... 형태의 전체 URI 사용
-            conn = psycopg2.connect(settings.database_url)
-            conn.close()
+            with get_engine().connect() as conn:
+                conn.execute(text("SELECT 1"))
             print("✅ PostgreSQL 데이터베이스 연결 성공!")
             return
-        except psycopg2.OperationalError as exc:
+        except Exception as exc:
             retry_count += 1
             print(
                 f"⏳ PostgreSQL 연결 대기 중... ({retry_count}/{max_retries}) - {exc}"
@@ -41,53 +55,203 @@ def wait_for_postgres() -> None:
     raise Exception("PostgreSQL 데이터베이스에 연결할 수 없습니다.")
 
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """애플리케이션 시작/종료 시 실행되는 함수."""
-    # 시작 시
-    print("🚀 FastAPI RAG 애플리케이션 시작 중...")
-    wait_for_postgres()
-    print("🔧 벡터스토어 초기화 중...")
+async def _load_components(app: FastAPI, tracker: StartupTracker) -> None:
+    """서로 독립적인 단계(DB 풀, 임베딩, LLM, Chat Service, 재정렬기)를 동시에 로드."""
     # 순환 의존성을 피하기 위해 지연 임포트
-    from app.core.vectorstore import initialize_vectorstore
-
-    initialize_vectorstore()
-    # 🔧 LLM 생성 및 전역 설정
     from app.core.llm import create_llm_from_config
+    from app.core.reranker import create_reranker
+    from app.core.vectorstore import get_embeddings
 
-    llm = create_llm_from_config(settings)
-    if llm:
-        print("✅ 사용자 정의 LLM이 설정되었습니다.")
-        # 전역 변수로 저장하여 라우터에서 사용
-        app.state.llm = llm
-    else:
-        print("⚠️ LLM 설정이 불완전합니다. 기본 동작으로 실행합니다.")
-        app.state.llm = None
+    async def load_database() -> None:
+        await asyncio.to_thread(wait_for_postgres)
 
-    # 🔧 Chat Service (QLoRA) 초기화
-    if settings.use_chat_service and settings.chat_model_path:
-        try:
-            from app.service.chat_service import create_qlora_chat_service
+    async def load_embeddings():
+        embeddings = await asyncio.to_thread(get_embeddings)
+        # 첫 검색 요청이 모델 로딩/커널 초기화 비용을 치르지 않도록 한 번 실행
+        await asyncio.to_thread(embeddings.embed_query, "워밍업")
+        return embeddings
 
-            print("🔧 QLoRA Chat Service 초기화 중...")
-            chat_service = create_qlora_chat_service(
-                model_name_or_path=settings.chat_model_path,
-                adapter_path=settings.chat_adapter_path,
-            )
-            app.state.chat_service = chat_service
-            print("✅ QLoRA Chat Service 초기화 완료!")
-        except Exception as e:
-            print(f"⚠️ Chat Service 초기화 실패: {e}")
-            app.state.chat_service = None
+    async def load_llm():
+        llm = await asyncio.to_thread(create_llm_from_config, settings)
+        if llm:
+            print("✅ 사용자 정의 LLM이 설정되었습니다.")
+        else:
+            print("⚠️ LLM 설정이 불완전합니다. 기본 동작으로 실행합니다.")
+        return llm
+
+    async def load_chat_service():
+        from app.service.chat_service import create_qlora_chat_service
+
+        return await asyncio.to_thread(
+            create_qlora_chat_service,
+            model_name_or_path=settings.chat_model_path,
+            adapter_path=settings.chat_adapter_path,
+        )
+
+    async def load_reranker():
+        reranker = create_reranker()
+        if reranker is not None:
+            await asyncio.to_thread(reranker.count_tokens, "워밍업")  # 모델 로드
+        return reranker
+
+    stages = [
+        tracker.stage("database", load_database),
+        tracker.stage("embeddings", load_embeddings),
+        tracker.stage("llm", load_llm, required=False),
+        tracker.stage("reranker", load_reranker, required=False),
+    ]
+    if settings.use_chat_service and settings.chat_model_path:
+        stages.append(tracker.stage("chat_service", load_chat_service, required=False))
     else:
-        app.state.chat_service = None
+        tracker.skip("chat_service", "USE_CHAT_SERVICE / CHAT_MODEL_PATH 미설정")
         if settings.use_chat_service:
             print("⚠️ Chat Service를 사용하려면 CHAT_MODEL_PATH를 설정하세요.")
 
-    print("✅ 애플리케이션 준비 완료!")
+    _, embeddings, llm, reranker, *chat_service = await asyncio.gather(*stages)
+    app.state.embeddings = embeddings
+    app.state.llm = llm
+    app.state.reranker = reranker
+    app.state.chat_service = chat_service[0] if chat_service else None
+
+
+async def _load_vectorstore(app: FastAPI) -> None:
+    """DB 와 임베딩이 준비된 뒤 벡터스토어, 저장소, ANN 인덱스 준비."""
+    from app.core.executor import run_blocking
+    from app.core.vector_index import create_index_manager
+    from app.core.vectorstore import initialize_vectorstore
+    from app.repository.vector_repository import VectorRepository
+
+    # 프로세스 전역에서 공유할 벡터스토어 (커넥션 풀 포함)
+    app.state.vectorstore = await asyncio.to_thread(initialize_vectorstore, app.state.embeddings)
+
+    # 🔧 벡터 저장소 + ANN 인덱스 (HNSW/IVFFlat, 거리 전략에 맞는 opclass)
+    app.state.vector_repository = VectorRepository.from_vectorstore(app.state.vectorstore)
+    app.state.index_manager = create_index_manager(app.state.vector_repository)
+    if app.state.index_manager is not None and settings.vector_index_auto_create:
+        try:
+            await run_blocking(app.state.index_manager.ensure_index, pool="db")
+        except Exception as e:
+            print(f"⚠️ 벡터 인덱스 생성 실패 (순차 스캔으로 검색): {e}")
+
+
+def _build_services(app: FastAPI) -> None:
+    """로드된 구성 요소로 레지스트리/서비스 생성 (가벼운 작업)."""
+    from app.core.rag_chain import RAGChainRegistry
+    from app.core.semantic_cache import create_answer_cache
+    from app.service.embedding_ingest_service import create_ingest_service
+
+    # 🔧 RAG 체인 레지스트리 (체인은 프로세스당 한 번만 생성) + 시맨틱 답변 캐시
+    app.state.answer_cache = create_answer_cache(app.state.embeddings)
+    app.state.rag_registry = RAGChainRegistry(
+        app.state.vectorstore,
+        app.state.llm,
+        provider=settings.llm_provider,
+        default_k=settings.rag_default_k,
+        default_prompt_version=settings.rag_prompt_version,
+        answer_cache=app.state.answer_cache,
+        repository=app.state.vector_repository,
+        hybrid=settings.use_hybrid_search,
+        reranker=app.state.reranker,
+    )
+    app.state.rag_registry.get()
+
+    # 🔧 문서 수집 서비스 (배치 임베딩 + 다중 행 INSERT 기록, 기록 후 답변 캐시 무효화)
+    app.state.ingest_service = create_ingest_service(
+        app.state.vectorstore,
+        repository=app.state.vector_repository,
+        on_written=(
+            app.state.answer_cache.invalidate if app.state.answer_cache is not None else None
+        ),
+    )
+
+    # 🔧 세션 대화 서비스 (히스토리 저장 + 토큰 예산 초과 시 요약 압축)
+    if app.state.chat_service is not None:
+        from app.repository.session_repository import create_session_store
+        from app.service.conversation_service import create_conversation_service
+
+        app.state.conversation_service = create_conversation_service(
+            app.state.chat_service, create_session_store()
+        )
+
+    # 🔧 Chat Service 동적 배칭 스케줄러
+    if app.state.chat_service is not None and settings.use_chat_batching:
+        from app.service.generation_scheduler import GenerationScheduler
+
+        app.state.chat_scheduler = GenerationScheduler(
+            app.state.chat_service,
+            max_batch_size=settings.chat_batch_max_size,
+            max_batch_tokens=settings.chat_batch_max_tokens,
+            max_wait_ms=settings.chat_batch_max_wait_ms,
+        )
+        app.state.chat_scheduler.start()
+        print("✅ Chat Service 배칭 스케줄러 시작")
+
+
+async def _startup(app: FastAPI, tracker: StartupTracker) -> None:
+    """단계별 시작: 병렬 로드 → 벡터스토어 → 서비스 구성 → 워밍업 생성 → 준비."""
+    try:
+        await _load_components(app, tracker)
+        await tracker.stage("vectorstore", lambda: _load_vectorstore(app))
+        _build_services(app)
+
+        if settings.startup_warmup:
+            from app.core.executor import run_blocking
+
+            await tracker.stage(
+                "warmup",
+                lambda: run_blocking(
+                    warmup_generation,
+                    app.state.llm,
+                    app.state.chat_service,
+                    settings.startup_warmup_tokens,
+                    pool="llm",
+                ),
+                required=False,
+            )
+        tracker.mark_ready()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        tracker.failed = True
+        print(f"❌ 애플리케이션 시작 실패: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """애플리케이션 시작/종료 시 실행되는 함수.
+
+    무거운 로딩은 백그라운드 작업으로 실행하고 바로 요청을 받습니다.
+    준비가 끝나기 전에는 헬스체크 외의 요청에 503 을 반환합니다.
+    """
+    # 시작 시
+    print("🚀 FastAPI RAG 애플리케이션 시작 중...")
+    for name in (
+        "embeddings", "vectorstore", "vector_repository", "index_manager", "llm",
+        "reranker", "chat_service", "answer_cache", "rag_registry", "ingest_service",
+        "conversation_service", "chat_scheduler",
+    ):
+        setattr(app.state, name, None)
+    app.state.startup = StartupTracker()
+    startup_task = asyncio.create_task(_startup(app, app.state.startup))
+    # 🔧 헬스체크용 상태를 주기적으로 갱신 (프로브는 저장된 상태만 읽음)
+    app.state.health_monitor = create_health_monitor()
+    app.state.health_monitor.start()
     yield
     # 종료 시
     print("👋 애플리케이션 종료 중...")
+    await app.state.health_monitor.stop()
+    if not startup_task.done():
+        startup_task.cancel()
+        await asyncio.gather(startup_task, return_exceptions=True)
+    if app.state.chat_scheduler is not None:
+        await app.state.chat_scheduler.stop()
+    if app.state.ingest_service is not None:
+        await app.state.ingest_service.shutdown()
+    from app.core.executor import shutdown_executors
+    from app.core.vectorstore import dispose_vectorstore
+
+    shutdown_executors()
+    dispose_vectorstore()
 
 
 # FastAPI 애플리케이션 생성
@@ -110,7 +274,7 @@ app.add_middleware(
 # 전역 예외 핸들러 추가
 import traceback
 from fastapi import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -128,9 +292,52 @@ async def global_exception_handler(request: Request, exc: Exception):
         }
     )
 
+# 준비 전에도 응답하는 경로 (헬스체크, 메트릭, 문서)
+_ALWAYS_AVAILABLE = (
+    "/", "/health", "/health/live", "/health/ready", "/metrics", "/docs", "/redoc", "/openapi.json",
+)
+
+
+@app.middleware("http")
+async def readiness_gate(request: Request, call_next):
+    """시작 단계가 끝나기 전에는 헬스체크 외 요청에 503 + Retry-After 반환."""
+    tracker = getattr(request.app.state, "startup", None)
+    if (
+        tracker is not None
+        and not tracker.ready
+        and request.url.path not in _ALWAYS_AVAILABLE
+    ):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "서비스 준비 중입니다.", "startup": tracker.status()},
+            headers={"Retry-After": "5"},
+        )
+    return await call_next(request)
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """요청 처리 시간을 라우트 템플릿(`/documents/ingest/{job_id}`) 별로 기록."""
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    observe_http(
+        request.method,
+        getattr(route, "path", "unmatched"),
+        response.status_code,
+        time.perf_counter() - start,
+    )
+    return response
+
+
+register_runtime_collector(app)
+
 # API 라우터 등록
 app.include_router(search.router)
+app.include_router(search.retrieve_router)
+app.include_router(admin.router)
 app.include_router(chat_router.router)
+app.include_router(document_router.router)
 
 
 @app.get("/", tags=["root"])
@@ -140,27 +347,72 @@ async def root() -> dict:
         "message": "LangChain RAG API에 오신 것을 환영합니다!",
         "docs": "/docs",
         "health": "/health",
+        "endpoints": {
+            "search": "POST /search - 벡터/하이브리드 검색",
+            "retrieve": "POST /retrieve - 검색만 수행",
+            "rag": "POST /rag - 검색 + 답변 생성",
+            "rag_stream": "POST /rag/stream - 답변 SSE 스트리밍",
+            "rag_chat": "POST /rag/chat - 세션 대화",
+            "add_document": "POST /documents - 문서 추가",
+            "add_documents": "POST /documents/batch - 여러 문서 추가",
+            "ingest": "POST /documents/ingest - NDJSON 스트리밍 수집 (백그라운드)",
+            "ingest_status": "GET /documents/ingest/{job_id} - 수집 작업 상태",
+            "index": "GET /admin/index - 벡터 인덱스 상태",
+            "index_rebuild": "POST /admin/index/rebuild - 인덱스 재생성 및 recall 보고",
+            "metrics": "GET /metrics - Prometheus 메트릭",
+        },
     }
 
 
+@app.get("/health/live", tags=["health"])
+async def health_live() -> JSONResponse:
+    """Liveness: 프로세스가 살아 있으면 200 (필수 시작 단계가 실패하면 503)."""
+    tracker = app.state.startup
+    if tracker.failed:
+        return JSONResponse(status_code=503, content={"status": "failed", **tracker.status()})
+    return JSONResponse(content={"status": "alive"})
+
+
+@app.get("/health/ready", tags=["health"])
+async def health_ready() -> JSONResponse:
+    """Readiness: 모든 시작 단계와 워밍업이 끝났으면 200, 아니면 503."""
+    tracker = app.state.startup
+    return JSONResponse(status_code=200 if tracker.ready else 503, content=tracker.status())
+
+
 @app.get("/health", response_model=HealthResponse, tags=["health"])
 async def health() -> HealthResponse:
-    """헬스체크 엔드포인트."""
-    try:
-        # 데이터베이스 연결 확인 (DATABASE_URL 기반)
-        conn = psycopg2.connect(settings.database_url)
-        conn.close()
-        db_status = "connected"
-    except Exception:
-        db_status = "disconnected"
+    """헬스체크 엔드포인트.
+
+    백그라운드 작업이 갱신해 둔 상태만 읽으므로 새 DB 커넥션을 열지 않습니다.
+    """
+    from app.core.vectorstore import get_pool_status
 
+    db = app.state.health_monitor.status()
+    answer_cache = getattr(app.state, "answer_cache", None)
+    reranker = getattr(app.state, "reranker", None)
     return HealthResponse(
-        status="healthy",
+        status="healthy" if db["database"] in ("connected", "initializing") else "degraded",
         version=settings.app_version,
-        database=db_status,
+        database=db["database"],
+        database_latency_ms=db["database_latency_ms"],
+        checked_at=db["checked_at"],
         openai_configured=settings.openai_api_key is not None,
+        db_pool=get_pool_status() or None,
+        semantic_cache=answer_cache.stats() if answer_cache is not None else None,
+        reranker=reranker.stats() if reranker is not None else None,
     )
 
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus 메트릭 (단계별 지연 히스토그램, 초당 토큰 수, 큐/풀 상태)."""
+    body = render_metrics()
+    if body is None:
+        return Response(
+            "prometheus-client 가 설치되어 있지 않습니다.\n", status_code=503, media_type="text/plain"
+        )
+    return Response(body, media_type=CONTENT_TYPE)
+
 # python -m app.main
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,165 @@
+"""
+😎😎 서빙 쪽에서 사용할 대화 세션 저장소.
+세션 ID 별 대화 히스토리와 요약을 보관하는 기능.
+
+- InMemorySessionStore: 프로세스 내 LRU (최대 세션 수 + TTL)
+- RedisSessionStore: REDIS_URL 로 만든 Redis 클라이언트를 사용하는
+  Redis 저장소 (여러 워커/프로세스가 세션을 공유할 때)
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+# 세션 데이터 형식: {"summary": str, "messages": [{"role": ..., "content": ...}]}
+Session = Dict[str, Any]
+
+
+def empty_session() -> Session:
+    """빈 세션."""
+    return {"summary": "", "messages": []}
+
+
+class InMemorySessionStore:
+    """프로세스 메모리에 세션을 보관하는 LRU 저장소."""
+
+    backend = "memory"
+
+    def __init__(self, *, max_sessions: int = 1000, ttl_seconds: int = 86400):
+        """저장소를 초기화합니다.
+
+        Args:
+            max_sessions: 보관할 최대 세션 수 (초과 시 가장 오래 사용하지 않은 세션 삭제).
+            ttl_seconds: 마지막 사용 이후 세션 유지 시간(초).
+        """
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, Tuple[float, Session]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Session:
+        """세션 조회 (없거나 만료되었으면 빈 세션)."""
+        with self._lock:
+            item = self._sessions.get(session_id)
+            if item is None:
+                return empty_session()
+            saved_at, session = item
+            if time.time() - saved_at > self.ttl_seconds:
+                del self._sessions[session_id]
+                return empty_session()
+            self._sessions.move_to_end(session_id)
+            return json.loads(json.dumps(session))
+
+    def save(self, session_id: str, session: Session) -> None:
+        """세션 저장."""
+        with self._lock:
+            self._sessions[session_id] = (time.time(), session)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def delete(self, session_id: str) -> None:
+        """세션 삭제."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def count(self) -> int:
+        """보관 중인 세션 수."""
+        return len(self._sessions)
+
+
+class RedisSessionStore:
+    """Redis 에 세션을 JSON 으로 보관하는 저장소 (키별 TTL)."""
+
+    backend = "redis"
+
+    def __init__(self, client: Any, *, ttl_seconds: int = 86400, prefix: str = "chat:session:"):
+        """저장소를 초기화합니다.
+
+        Args:
+            client: redis 클라이언트 (`decode_responses=True`).
+            ttl_seconds: 마지막 저장 이후 세션 유지 시간(초).
+            prefix: Redis 키 접두사.
+        """
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    def get(self, session_id: str) -> Session:
+        """세션 조회 (없으면 빈 세션)."""
+        raw = self.client.get(self._key(session_id))
+        if not raw:
+            return empty_session()
+        return json.loads(raw)
+
+    def save(self, session_id: str, session: Session) -> None:
+        """세션 저장 (TTL 갱신)."""
+        self.client.set(
+            self._key(session_id),
+            json.dumps(session, ensure_ascii=False),
+            ex=self.ttl_seconds,
+        )
+
+    def delete(self, session_id: str) -> None:
+        """세션 삭제."""
+        self.client.delete(self._key(session_id))
+
+    def count(self) -> Optional[int]:
+        """Redis 는 전체 키 스캔이 필요하므로 세션 수를 집계하지 않음."""
+        return None
+
+
+def _get_redis_client() -> Any:
+    """설정의 REDIS_URL 로 Redis 클라이언트 생성 (사용할 수 없으면 None)."""
+    if not settings.redis_url:
+        print("⚠️ REDIS_URL 이 설정되지 않았습니다.")
+        return None
+    try:
+        import redis
+    except ImportError as e:
+        print(f"⚠️ redis 패키지를 불러올 수 없습니다: {e}")
+        return None
+    try:
+        client = redis.from_url(settings.redis_url, decode_responses=True)
+        client.ping()
+    except Exception as e:
+        print(f"⚠️ Redis 연결 실패: {e}")
+        return None
+    return client
+
+
+def create_session_store(backend: Optional[str] = None):
+    """설정에 맞는 세션 저장소 생성.
+
+    SESSION_BACKEND=redis 인데 Redis 를 사용할 수 없으면 메모리 저장소로 대체합니다.
+    """
+    backend = backend or settings.session_backend
+
+    if backend == "redis":
+        client = _get_redis_client()
+        if client is not None:
+            print("✅ 세션 저장소: Redis")
+            return RedisSessionStore(client, ttl_seconds=settings.session_ttl_seconds)
+        print("⚠️ Redis 를 사용할 수 없어 메모리 세션 저장소를 사용합니다.")
+
+    print("✅ 세션 저장소: 메모리 LRU")
+    return InMemorySessionStore(
+        max_sessions=settings.session_max_sessions,
+        ttl_seconds=settings.session_ttl_seconds,
+    )
+
+
+def history_messages(session: Session) -> List[Dict[str, str]]:
+    """세션을 `conversation_history` 형식으로 변환 (요약은 맨 앞 system 메시지)."""
+    messages: List[Dict[str, str]] = []
+    if session.get("summary"):
+        messages.append({"role": "system", "content": session["summary"]})
+    messages.extend(session.get("messages", []))
+    return messages
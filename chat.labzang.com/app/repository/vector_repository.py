@@ -1,4 +1,567 @@
 """
 😎😎 서빙 쪽에서 사용할 문서를 저장하고 관리하는 기능.
 vectorstore.py와 연결되는 CRUD 래퍼.
+
+PGVector 가 만든 테이블(langchain_pg_collection / langchain_pg_embedding)에
+SQL 로 직접 접근합니다. `add_documents` 는 문서마다 INSERT 를 보내지만,
+여기서는 미리 계산한 임베딩을 다중 행 `INSERT ... VALUES (...), (...)` 로
+INSERT_PAGE_SIZE 행씩 기록합니다. (`text()` 문장에 파라미터 목록을 넘기면
+psycopg2 는 행마다 왕복하는 `cursor.executemany` 로 실행합니다)
+
+청크 ID 는 내용 해시이므로(app.core.chunking), `existing_chunk_ids` 로 이미
+저장된 청크를 확인해 바뀐 청크만 `replace_chunks` 로 교체할 수 있습니다.
+
+`search` 는 PGVector 의 유사도 검색과 같은 거리 점수를 반환하지만,
+ANN 인덱스(app.core.vector_index)와 같은 식 `embedding::vector(dim)` 으로
+정렬하고 요청별 `hnsw.ef_search` / `ivfflat.probes` 를 적용합니다.
+
+`hybrid_search` 는 같은 벡터 검색 결과와 전문 검색(`to_tsvector('simple', ...)`)
+결과를 한 SQL 안에서 reciprocal-rank fusion(RRF)으로 결합합니다.
+
+검색 함수들은 `MetadataFilter`(source/type 등 값 일치 + 날짜 범위)를 받아
+같은 SQL 의 WHERE 절로 넣습니다. 값 일치는 `cmetadata @> ...` 로 표현해
+jsonb GIN 인덱스를, 날짜 범위는 `cmetadata->>'date'` 식 B-tree 인덱스를
+사용합니다 (app.core.vector_index).
+
+langchain_community 와 langchain_postgres 의 PGVector 는 임베딩 테이블의
+ID 컬럼이 다르므로(custom_id/uuid vs id) 실제 컬럼을 조회해 맞춥니다.
 """
+
+import json
+import re
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from langchain_core.documents import Document
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+COLLECTION_TABLE = "langchain_pg_collection"
+EMBEDDING_TABLE = "langchain_pg_embedding"
+
+# 거리 전략 → (pgvector 연산자, 인덱스 opclass)
+DISTANCE_OPERATORS: Dict[str, Tuple[str, str]] = {
+    "cosine": ("<=>", "vector_cosine_ops"),
+    "l2": ("<->", "vector_l2_ops"),
+    "inner": ("<#>", "vector_ip_ops"),
+}
+
+# 다중 행 INSERT 한 문장에 넣을 최대 행 수 (행당 파라미터 6개)
+INSERT_PAGE_SIZE = 500
+
+# 전문 검색 식 (GIN 인덱스와 같은 식이어야 플래너가 인덱스를 사용)
+TSVECTOR_EXPRESSION = "to_tsvector('simple'::regconfig, document)"
+
+
+@dataclass
+class EmbeddingRow:
+    """저장할 문서 한 건 (내용, 메타데이터, 임베딩, ID)."""
+
+    content: str
+    metadata: Dict[str, Any]
+    embedding: Sequence[float]
+    id: Optional[str] = None
+
+
+_METADATA_KEY = re.compile(r"^[A-Za-z0-9_]+$")
+
+
+def validate_metadata_key(key: str) -> str:
+    """SQL 에 리터럴로 넣는 메타데이터 키 검증 (인덱스 식과 일치시키기 위함)."""
+    if not _METADATA_KEY.match(key):
+        raise ValueError(f"메타데이터 키는 영문/숫자/_ 만 사용할 수 있습니다: {key}")
+    return key
+
+
+@dataclass
+class MetadataFilter:
+    """검색 메타데이터 필터.
+
+    equals 의 각 키는 나열된 값 중 하나와 일치해야 하고(키 사이는 AND),
+    날짜는 ISO 8601 문자열(`2024-01-31`, `2024-01-31T09:00:00`)로 비교합니다.
+    date_to_exclusive 가 True 면 상한을 포함하지 않습니다 (날짜만 준 상한을
+    "다음 날 0시 미만"으로 바꿀 때 사용).
+    """
+
+    equals: Dict[str, List[Any]] = field(default_factory=dict)
+    date_field: str = "date"
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    date_to_exclusive: bool = False
+
+    def is_empty(self) -> bool:
+        return not self.equals and self.date_from is None and self.date_to is None
+
+    def cache_key(self) -> str:
+        """시맨틱 캐시 범위 등에 쓰는 정규화된 문자열."""
+        return json.dumps(
+            {
+                "equals": {key: sorted(map(str, values)) for key, values in self.equals.items()},
+                "date": [self.date_field, self.date_from, self.date_to, self.date_to_exclusive],
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+
+    def to_sql(self, metadata_expression: str, alias: str = "") -> Tuple[str, Dict[str, Any]]:
+        """WHERE 절 조각과 바인딩 파라미터 (조건이 없으면 빈 문자열).
+
+        Args:
+            metadata_expression: jsonb 메타데이터 식 (`cmetadata` 또는 `(cmetadata::jsonb)`).
+            alias: 파라미터 이름 접두어 (한 SQL 에서 여러 번 쓸 때 구분).
+        """
+        clauses: List[str] = []
+        params: Dict[str, Any] = {}
+        for i, (key, values) in enumerate(sorted(self.equals.items())):
+            validate_metadata_key(key)
+            options = []
+            for j, value in enumerate(values):
+                name = f"{alias}mf_{i}_{j}"
+                params[name] = json.dumps({key: value}, ensure_ascii=False)
+                options.append(f"{metadata_expression} @> CAST(:{name} AS jsonb)")
+            if options:
+                clauses.append("(" + " OR ".join(options) + ")")
+
+        date_expression = f"({metadata_expression} ->> '{validate_metadata_key(self.date_field)}')"
+        if self.date_from is not None:
+            params[f"{alias}mf_date_from"] = self.date_from
+            clauses.append(f"{date_expression} >= :{alias}mf_date_from")
+        if self.date_to is not None:
+            params[f"{alias}mf_date_to"] = self.date_to
+            operator = "<" if self.date_to_exclusive else "<="
+            clauses.append(f"{date_expression} {operator} :{alias}mf_date_to")
+        return " AND ".join(clauses), params
+
+
+def engine_of(vectorstore: Any) -> Optional[Engine]:
+    """PGVector 인스턴스가 사용하는 SQLAlchemy 엔진 (없으면 None)."""
+    for attr in ("_engine", "_bind"):
+        engine = getattr(vectorstore, attr, None)
+        if isinstance(engine, Engine):
+            return engine
+    return None
+
+
+def distance_strategy_of(vectorstore: Any) -> str:
+    """PGVector 의 거리 전략 이름 ("cosine", "l2", "inner"). 기본값은 cosine."""
+    strategy = getattr(vectorstore, "_distance_strategy", None)
+    value = str(getattr(strategy, "value", strategy or "cosine")).lower()
+    if value in ("euclidean", "euclidean_distance"):
+        return "l2"
+    if value in ("max_inner_product", "inner_product"):
+        return "inner"
+    return value if value in DISTANCE_OPERATORS else "cosine"
+
+
+def vector_literal(embedding: Sequence[float]) -> str:
+    """pgvector 입력 형식 문자열 ('[0.1,0.2,...]')."""
+    return "[" + ",".join(repr(float(x)) for x in embedding) + "]"
+
+
+class VectorRepository:
+    """한 컬렉션의 임베딩 테이블에 대한 SQL CRUD 래퍼."""
+
+    def __init__(self, engine: Engine, collection_name: str, distance: str = "cosine"):
+        """저장소를 초기화합니다.
+
+        Args:
+            engine: 벡터스토어와 같은 DB 를 가리키는 SQLAlchemy 엔진.
+            collection_name: PGVector 컬렉션 이름.
+            distance: 거리 전략 ("cosine", "l2", "inner").
+        """
+        self.engine = engine
+        self.collection_name = collection_name
+        self.distance = distance
+        self._collection_id: Optional[str] = None
+        self._columns: Optional[Dict[str, str]] = None
+
+    @classmethod
+    def from_vectorstore(cls, vectorstore: Any, engine: Optional[Engine] = None) -> "VectorRepository":
+        """PGVector 인스턴스의 엔진/컬렉션으로 저장소 생성."""
+        engine = engine or engine_of(vectorstore)
+        if engine is None:
+            from app.core.vectorstore import get_engine
+
+            engine = get_engine()
+        return cls(engine, vectorstore.collection_name, distance_strategy_of(vectorstore))
+
+    @property
+    def columns(self) -> Dict[str, str]:
+        """임베딩 테이블 컬럼 이름 → 데이터 타입."""
+        if self._columns is None:
+            with self.engine.connect() as conn:
+                rows = conn.execute(
+                    text(
+                        "SELECT column_name, data_type FROM information_schema.columns "
+                        "WHERE table_name = :table AND table_schema = current_schema()"
+                    ),
+                    {"table": EMBEDDING_TABLE},
+                ).fetchall()
+            self._columns = {name: data_type for name, data_type in rows}
+        return self._columns
+
+    @property
+    def id_column(self) -> str:
+        """문서 ID 컬럼 (community: custom_id, langchain_postgres: id)."""
+        return "custom_id" if "custom_id" in self.columns else "id"
+
+    @property
+    def primary_key(self) -> str:
+        """임베딩 테이블 기본키 컬럼 (community: uuid, langchain_postgres: id)."""
+        return "uuid" if "custom_id" in self.columns else "id"
+
+    @property
+    def collection_id(self) -> str:
+        """컬렉션 UUID (PGVector 초기화 시 생성된 행)."""
+        if self._collection_id is None:
+            with self.engine.connect() as conn:
+                row = conn.execute(
+                    text(f"SELECT uuid FROM {COLLECTION_TABLE} WHERE name = :name"),
+                    {"name": self.collection_name},
+                ).fetchone()
+            if row is None:
+                raise ValueError(f"컬렉션을 찾을 수 없습니다: {self.collection_name}")
+            # 부분 인덱스와 일치하도록 SQL 에 리터럴로 넣으므로 UUID 형식 검증
+            self._collection_id = str(uuid.UUID(str(row[0])))
+        return self._collection_id
+
+    @property
+    def operator(self) -> str:
+        """거리 전략에 맞는 pgvector 거리 연산자."""
+        return DISTANCE_OPERATORS[self.distance][0]
+
+    def dimensions(self) -> Optional[int]:
+        """저장된 임베딩 차원 (문서가 없으면 None)."""
+        with self.engine.connect() as conn:
+            return conn.execute(
+                text(
+                    f"SELECT vector_dims(embedding) FROM {EMBEDDING_TABLE} "
+                    "WHERE collection_id = CAST(:collection_id AS uuid) LIMIT 1"
+                ),
+                {"collection_id": self.collection_id},
+            ).scalar()
+
+    def embedding_expression(self, dimensions: int) -> str:
+        """인덱스/검색에서 공통으로 쓰는 임베딩 식 (차원 고정 캐스트)."""
+        return f"(embedding::vector({int(dimensions)}))"
+
+    def collection_predicate(self) -> str:
+        """부분 인덱스와 같은 컬렉션 조건 (리터럴 UUID)."""
+        return f"collection_id = '{self.collection_id}'"
+
+    @property
+    def metadata_expression(self) -> str:
+        """jsonb 메타데이터 식 (community PGVector 는 json 컬럼이라 캐스트)."""
+        return "cmetadata" if self.columns.get("cmetadata") == "jsonb" else "(cmetadata::jsonb)"
+
+    def where_clause(self, filters: Optional[MetadataFilter] = None) -> Tuple[str, Dict[str, Any]]:
+        """컬렉션 조건 + 메타데이터 필터 WHERE 절과 파라미터."""
+        predicate = self.collection_predicate()
+        if filters is None or filters.is_empty():
+            return predicate, {}
+        clause, params = filters.to_sql(self.metadata_expression)
+        return f"{predicate} AND {clause}", params
+
+    @staticmethod
+    def apply_search_params(
+        conn: Connection,
+        *,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        exact: bool = False,
+        iterative_scan: Optional[str] = None,
+    ) -> None:
+        """현재 트랜잭션에만 적용되는 ANN 검색 파라미터 설정 (SET LOCAL 과 동일).
+
+        iterative_scan 은 필터가 있는 검색에서 HNSW 가 k 개를 채울 때까지
+        더 탐색하도록 하는 pgvector 0.8+ 설정입니다 (예: "relaxed_order").
+
+        여러 설정을 `set_config(..., true)` 한 문장으로 보내 왕복을 한 번으로 줄입니다.
+        """
+        config: Dict[str, str] = {}
+        if ef_search:
+            config["hnsw.ef_search"] = str(int(ef_search))
+        if probes:
+            config["ivfflat.probes"] = str(int(probes))
+        if iterative_scan:
+            config["hnsw.iterative_scan"] = iterative_scan
+        if exact:
+            # 인덱스를 쓰지 않는 정확한(순차 스캔) 검색
+            config["enable_indexscan"] = "off"
+            config["enable_bitmapscan"] = "off"
+        if not config:
+            return
+
+        calls = ", ".join(
+            f"set_config(:name{i}, :value{i}, true)" for i in range(len(config))
+        )
+        params: Dict[str, str] = {}
+        for i, (name, value) in enumerate(config.items()):
+            params[f"name{i}"] = name
+            params[f"value{i}"] = value
+        conn.execute(text(f"SELECT {calls}"), params)
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        k: int = 4,
+        *,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        exact: bool = False,
+        filters: Optional[MetadataFilter] = None,
+        iterative_scan: Optional[str] = None,
+    ) -> List[Tuple[Document, float]]:
+        """벡터 유사도 검색.
+
+        Args:
+            embedding: 질의 임베딩.
+            k: 반환할 문서 수.
+            ef_search: HNSW 탐색 폭 (클수록 recall ↑, 지연 ↑).
+            probes: IVFFlat 탐색 리스트 수.
+            exact: True 면 인덱스 없이 정확한 검색.
+            filters: 메타데이터 필터 (SQL WHERE 절로 적용).
+            iterative_scan: 필터가 있을 때 사용할 HNSW iterative scan 모드.
+
+        Returns:
+            (문서, 거리) 목록 (거리가 작을수록 유사).
+        """
+        expr = self.embedding_expression(len(embedding))
+        where, filter_params = self.where_clause(filters)
+        sql = text(
+            "SELECT document, cmetadata, "
+            f"{expr} {self.operator} CAST(:embedding AS vector({len(embedding)})) AS distance "
+            f"FROM {EMBEDDING_TABLE} WHERE {where} "
+            "ORDER BY distance LIMIT :k"
+        )
+        with self.engine.begin() as conn:
+            self.apply_search_params(
+                conn,
+                ef_search=ef_search,
+                probes=probes,
+                exact=exact,
+                iterative_scan=iterative_scan if filter_params else None,
+            )
+            rows = conn.execute(
+                sql, {"embedding": vector_literal(embedding), "k": k, **filter_params}
+            ).fetchall()
+
+        return [
+            (Document(page_content=content, metadata=metadata or {}), float(distance))
+            for content, metadata, distance in rows
+        ]
+
+    def hybrid_search(
+        self,
+        embedding: Sequence[float],
+        tsquery: str,
+        k: int = 4,
+        *,
+        candidates: Optional[int] = None,
+        rrf_k: int = 60,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        exact: bool = False,
+        filters: Optional[MetadataFilter] = None,
+        iterative_scan: Optional[str] = None,
+    ) -> List[Tuple[Document, float]]:
+        """벡터 검색 + 전문 검색을 RRF 로 결합 (DB 왕복 한 번).
+
+        각 방식에서 상위 `candidates` 개를 뽑아 순위 r 마다 1 / (rrf_k + r) 을
+        더하고, 합이 큰 순서로 k 개를 반환합니다.
+
+        Args:
+            embedding: 질의 임베딩.
+            tsquery: `to_tsquery('simple', ...)` 입력 (app.core.lexical.build_tsquery).
+            k: 반환할 문서 수.
+            candidates: 방식별 후보 수 (없으면 max(4k, 20)).
+            rrf_k: RRF 상수.
+            ef_search / probes / exact / filters / iterative_scan: `search` 와 동일.
+
+        Returns:
+            (문서, RRF 점수) 목록 (점수가 클수록 관련).
+        """
+        candidates = candidates or max(4 * k, 20)
+        dim = len(embedding)
+        expr = self.embedding_expression(dim)
+        predicate, filter_params = self.where_clause(filters)
+        pk = self.primary_key
+        sql = text(
+            "WITH vec AS ("
+            "  SELECT pk, row_number() OVER (ORDER BY distance) AS rank FROM ("
+            f"    SELECT {pk} AS pk, {expr} {self.operator} CAST(:embedding AS vector({dim})) AS distance"
+            f"    FROM {EMBEDDING_TABLE} WHERE {predicate}"
+            "    ORDER BY distance LIMIT :candidates"
+            "  ) v"
+            "), lex AS ("
+            "  SELECT pk, row_number() OVER (ORDER BY score DESC) AS rank FROM ("
+            f"    SELECT {pk} AS pk, ts_rank_cd({TSVECTOR_EXPRESSION}, q) AS score"
+            f"    FROM {EMBEDDING_TABLE}, to_tsquery('simple', :tsquery) q"
+            f"    WHERE {predicate} AND {TSVECTOR_EXPRESSION} @@ q"
+            "    ORDER BY score DESC LIMIT :candidates"
+            "  ) l"
+            "), fused AS ("
+            "  SELECT pk, sum(1.0 / (:rrf_k + rank)) AS score"
+            "  FROM (SELECT * FROM vec UNION ALL SELECT * FROM lex) r GROUP BY pk"
+            ") "
+            "SELECT e.document, e.cmetadata, f.score "
+            f"FROM fused f JOIN {EMBEDDING_TABLE} e ON e.{pk} = f.pk "
+            "ORDER BY f.score DESC LIMIT :k"
+        )
+        with self.engine.begin() as conn:
+            self.apply_search_params(
+                conn,
+                ef_search=ef_search,
+                probes=probes,
+                exact=exact,
+                iterative_scan=iterative_scan if filter_params else None,
+            )
+            rows = conn.execute(
+                sql,
+                {
+                    "embedding": vector_literal(embedding),
+                    "tsquery": tsquery,
+                    "candidates": candidates,
+                    "rrf_k": rrf_k,
+                    "k": k,
+                    **filter_params,
+                },
+            ).fetchall()
+
+        return [
+            (Document(page_content=content, metadata=metadata or {}), float(score))
+            for content, metadata, score in rows
+        ]
+
+    def _insert_sql(self, rows: int) -> str:
+        """rows 행을 한 문장으로 기록하는 다중 행 INSERT (파라미터 이름 뒤에 행 번호)."""
+        metadata_type = "jsonb" if self.columns.get("cmetadata") == "jsonb" else "json"
+        if self.id_column == "custom_id":
+            columns = "(uuid, collection_id, embedding, document, cmetadata, custom_id)"
+            row = (
+                "(CAST(:uuid{i} AS uuid), CAST(:collection_id AS uuid), CAST(:embedding{i} AS vector), "
+                f":document{{i}}, CAST(:cmetadata{{i}} AS {metadata_type}), :id{{i}})"
+            )
+        else:
+            columns = "(id, collection_id, embedding, document, cmetadata)"
+            row = (
+                "(:id{i}, CAST(:collection_id AS uuid), CAST(:embedding{i} AS vector), "
+                f":document{{i}}, CAST(:cmetadata{{i}} AS {metadata_type}))"
+            )
+        values = ", ".join(row.format(i=i) for i in range(rows))
+        return f"INSERT INTO {EMBEDDING_TABLE} {columns} VALUES {values}"
+
+    def _insert_page(self, conn: Connection, params: List[Dict[str, Any]]) -> None:
+        """파라미터 목록을 INSERT_PAGE_SIZE 행씩 다중 행 INSERT 로 기록."""
+        for start in range(0, len(params), INSERT_PAGE_SIZE):
+            page = params[start : start + INSERT_PAGE_SIZE]
+            names = ["id", "embedding", "document", "cmetadata"]
+            if self.id_column == "custom_id":
+                names.append("uuid")
+            bound: Dict[str, Any] = {"collection_id": self.collection_id}
+            for i, row in enumerate(page):
+                for name in names:
+                    bound[f"{name}{i}"] = row[name]
+            conn.execute(text(self._insert_sql(len(page))), bound)
+
+    def _insert_params(self, rows: List[EmbeddingRow]) -> List[Dict[str, Any]]:
+        params = []
+        for row in rows:
+            doc_id = row.id or str(uuid.uuid4())
+            params.append(
+                {
+                    "uuid": str(uuid.uuid4()),
+                    "id": doc_id,
+                    "embedding": vector_literal(row.embedding),
+                    "document": row.content,
+                    "cmetadata": json.dumps(row.metadata or {}, ensure_ascii=False),
+                }
+            )
+        return params
+
+    def bulk_insert(self, rows: List[EmbeddingRow]) -> List[str]:
+        """임베딩이 계산된 문서들을 한 트랜잭션에서 다중 행 INSERT 로 저장.
+
+        Returns:
+            저장된 문서 ID 목록.
+        """
+        return self.replace_chunks(rows, [])
+
+    def replace_chunks(self, rows: List[EmbeddingRow], delete_ids: Iterable[str]) -> List[str]:
+        """새 청크 저장과 낡은 청크 삭제를 한 트랜잭션으로 수행.
+
+        삭제는 DELETE 한 문장, 저장은 INSERT_PAGE_SIZE 행마다 다중 행 INSERT
+        한 문장이므로 DB 왕복이 행마다가 아니라 페이지마다 한 번입니다.
+
+        Args:
+            rows: 새로 저장할 청크 (임베딩 포함).
+            delete_ids: 삭제할 청크 ID.
+
+        Returns:
+            저장된 청크 ID 목록.
+        """
+        params = self._insert_params(rows) if rows else []
+        delete_ids = list(delete_ids)
+        if not params and not delete_ids:
+            return []
+
+        with self.engine.begin() as conn:
+            if delete_ids:
+                conn.execute(
+                    text(
+                        f"DELETE FROM {EMBEDDING_TABLE} "
+                        "WHERE collection_id = CAST(:collection_id AS uuid) "
+                        f"AND {self.id_column} = ANY(:ids)"
+                    ),
+                    {"collection_id": self.collection_id, "ids": delete_ids},
+                )
+            if params:
+                self._insert_page(conn, params)
+        return [p["id"] for p in params]
+
+    def existing_chunk_ids(self, doc_ids: Iterable[str]) -> Dict[str, Set[str]]:
+        """문서 ID 별로 이미 저장된 청크 ID 조회 (cmetadata 의 doc_id 기준)."""
+        doc_ids = list(doc_ids)
+        if not doc_ids:
+            return {}
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text(
+                    f"SELECT cmetadata->>'doc_id', {self.id_column} FROM {EMBEDDING_TABLE} "
+                    "WHERE collection_id = CAST(:collection_id AS uuid) "
+                    "AND cmetadata->>'doc_id' = ANY(:doc_ids)"
+                ),
+                {"collection_id": self.collection_id, "doc_ids": doc_ids},
+            ).fetchall()
+        existing: Dict[str, Set[str]] = {}
+        for doc_id, chunk_id in rows:
+            existing.setdefault(doc_id, set()).add(chunk_id)
+        return existing
+
+    def existing_ids(self, ids: Iterable[str]) -> Set[str]:
+        """주어진 청크 ID 중 이미 저장된 것 (문서 ID 없이 삽입된 청크 중복 확인용)."""
+        ids = list(ids)
+        if not ids:
+            return set()
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text(
+                    f"SELECT {self.id_column} FROM {EMBEDDING_TABLE} "
+                    "WHERE collection_id = CAST(:collection_id AS uuid) "
+                    f"AND {self.id_column} = ANY(:ids)"
+                ),
+                {"collection_id": self.collection_id, "ids": ids},
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def count(self) -> int:
+        """컬렉션의 문서 수."""
+        with self.engine.connect() as conn:
+            return conn.execute(
+                text(
+                    f"SELECT count(*) FROM {EMBEDDING_TABLE} "
+                    "WHERE collection_id = CAST(:collection_id AS uuid)"
+                ),
+                {"collection_id": self.collection_id},
+            ).scalar_one()
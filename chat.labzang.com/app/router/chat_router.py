@@ -6,23 +6,36 @@ POST /api/chat
 세션 ID, 메시지 리스트 등을 받아 대화형 응답 반환.
 """
 
+import json
+import time
 import traceback
-import asyncio
+from typing import Any, AsyncIterator
+
 from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import Response, StreamingResponse
 
-from app.api.models import RAGRequest, RAGResponse, DocumentResponse
+from app.api.models import ChatRequest, ChatResponse, RAGRequest, RAGResponse, DocumentResponse
 from app.core.vectorstore import get_vectorstore, VectorStoreType
-from app.core.rag_chain import create_rag_chain
+from app.config import settings
+from app.core.rag_chain import RAGChainRegistry
+from app.core.vector_index import resolve_search_params
+from app.core.llm.prefix_cache import get_prefix_cache
+from app.core.llm.streaming import get_hf_model_and_tokenizer
+from app.core.metrics import observe_rag, observe_stage
 
 router = APIRouter(prefix="/rag", tags=["rag"])
 
 
-def get_vectorstore_dependency() -> VectorStoreType:
-    """벡터스토어 의존성 주입."""
+def get_vectorstore_dependency(request: Request) -> VectorStoreType:
+    """벡터스토어 의존성 주입.
+
+    lifespan 에서 생성한 공유 인스턴스를 사용하며, 요청마다
+    임베딩/엔진/커넥션을 새로 만들지 않습니다.
+    """
     try:
-        print("🔧 벡터스토어 의존성 주입 중...")
-        vectorstore = get_vectorstore()
-        print("✅ 벡터스토어 의존성 주입 완료")
+        vectorstore = getattr(request.app.state, "vectorstore", None)
+        if vectorstore is None:
+            vectorstore = get_vectorstore()
         return vectorstore
     except Exception as e:
         print(f"❌ 벡터스토어 의존성 주입 실패: {str(e)}")
@@ -33,116 +46,114 @@ def get_vectorstore_dependency() -> VectorStoreType:
         )
 
 
+def get_rag_registry(request: Request, vectorstore: VectorStoreType) -> RAGChainRegistry:
+    """lifespan 에서 만든 RAG 체인 레지스트리 반환 (없으면 한 번만 생성)."""
+    registry = getattr(request.app.state, "rag_registry", None)
+    if registry is None:
+        registry = RAGChainRegistry(
+            vectorstore,
+            getattr(request.app.state, "llm", None),
+            provider=settings.llm_provider,
+            default_k=settings.rag_default_k,
+            default_prompt_version=settings.rag_prompt_version,
+            answer_cache=getattr(request.app.state, "answer_cache", None),
+            repository=getattr(request.app.state, "vector_repository", None),
+            hybrid=settings.use_hybrid_search,
+            reranker=getattr(request.app.state, "reranker", None),
+        )
+        request.app.state.rag_registry = registry
+    return registry
+
+
+def search_params_of(request: RAGRequest, fastapi_request: Request) -> dict:
+    """요청의 ANN 파라미터와 메타데이터 필터를 저장소 검색 인자로 변환.
+
+    `/search`, `/retrieve` 와 같이 저장소가 없으면 필터를 적용할 수 없으므로
+    필터 없는 검색으로 답하지 않고 400 을 반환합니다.
+    """
+    filters = request.filters.to_filter(settings.metadata_date_field) if request.filters else None
+    if filters is not None and getattr(fastapi_request.app.state, "vector_repository", None) is None:
+        raise HTTPException(status_code=400, detail="메타데이터 필터는 벡터 저장소가 필요합니다.")
+    return resolve_search_params(request.ef_search, request.probes, filters)
+
+
+def get_chat_backend(request: Request):
+    """생성에 사용할 Chat Service 반환 (배칭 스케줄러 우선, 없으면 None)."""
+    scheduler = getattr(request.app.state, "chat_scheduler", None)
+    if scheduler is not None:
+        return scheduler
+    return getattr(request.app.state, "chat_service", None)
+
+
 @router.post("", response_model=RAGResponse)
 @router.post("/query", response_model=RAGResponse)
 async def rag_query(
     request: RAGRequest,
     fastapi_request: Request,
     vectorstore: VectorStoreType = Depends(get_vectorstore_dependency),
-) -> RAGResponse:
+) -> Response:
     """
     RAG (Retrieval-Augmented Generation) 질의를 수행합니다.
 
     - **question**: 질문 내용
     - **k**: 검색에 사용할 문서 개수 (1-10)
+    - **ef_search** / **probes**: ANN 검색 정확도/속도 조절 (선택)
+    - **filters**: source / type / 메타데이터 값 / 날짜 범위 필터 (선택)
     """
     try:
         print(f"📝 RAG 질의 수신: question='{request.question}', k={request.k}")
 
-        # Chat Service가 설정되어 있으면 사용
-        chat_service = getattr(fastapi_request.app.state, 'chat_service', None)
+        # Chat Service가 설정되어 있으면 사용 (배칭 스케줄러가 있으면 스케줄러 경유)
+        chat_service = get_chat_backend(fastapi_request)
         if chat_service is not None:
             print("✅ Chat Service 사용")
         else:
             print("⚠️ Chat Service 미설정, 기존 RAG 체인 사용")
 
-        # 검색된 문서 가져오기 (참조용)
-        print("🔍 문서 검색 중...")
-        print(f"🔍 Vectorstore type: {type(vectorstore)}")
-        try:
-            retriever = vectorstore.as_retriever(search_kwargs={"k": request.k})
-            print(f"🔍 Retriever created: {type(retriever)}")
-            source_docs = retriever.invoke(request.question)
-            print(f"✅ {len(source_docs)}개 문서 검색 완료")
-        except Exception as search_error:
-            print(f"❌ 문서 검색 오류: {str(search_error)}")
-            traceback.print_exc()
-            raise
-
-        if chat_service is not None:
-            # Chat Service를 사용하여 대화 생성
-            # 검색된 문서를 컨텍스트로 포함
-            context = "\n\n".join([
-                f"문서 {i+1}:\n{doc.page_content}"
-                for i, doc in enumerate(source_docs)
-            ])
-
-            # 컨텍스트를 포함한 프롬프트 생성
-            prompt_with_context = f"""다음 컨텍스트를 바탕으로 질문에 답해주세요:
-
-컨텍스트:
-{context}
-
-질문: {request.question}
-
-답변:"""
-
-            # Chat Service로 응답 생성 (동기 함수를 비동기로 실행)
-            print("🤖 Chat Service로 응답 생성 중...")
-            try:
-                # Python 3.9+ 지원
-                import sys
-                if sys.version_info >= (3, 9):
-                    answer = await asyncio.to_thread(
-                        chat_service.chat,
-                        prompt_with_context,
-                        max_new_tokens=512,
-                        temperature=0.7,
-                    )
-                else:
-                    # Python 3.8 이하: 별도 스레드에서 실행
-                    loop = asyncio.get_event_loop()
-                    answer = await loop.run_in_executor(
-                        None,
-                        lambda: chat_service.chat(
-                            prompt_with_context,
-                            max_new_tokens=512,
-                            temperature=0.7,
-                        )
-                    )
-                print("✅ Chat Service 응답 생성 완료")
-            except Exception as chat_error:
-                print(f"❌ Chat Service 오류: {str(chat_error)}")
-                traceback.print_exc()
-                # Chat Service 실패 시 fallback으로 RAG 체인 사용
-                print("🔄 RAG 체인으로 fallback...")
-                llm = getattr(fastapi_request.app.state, 'llm', None)
-                rag_chain = create_rag_chain(vectorstore, llm=llm)
-                answer = rag_chain.invoke(request.question)
+        # 임베딩 1회 + 검색 1회 + 생성 (답변 근거 문서 == 반환 문서)
+        pipeline = get_rag_registry(fastapi_request, vectorstore).get()
+        print("🔍 문서 검색 및 응답 생성 중...")
+        result = await pipeline.arun(
+            request.question,
+            k=request.k,
+            chat_service=chat_service,
+            search_params=search_params_of(request, fastapi_request),
+        )
+        timings = result["timings"]
+        if result["cached"]:
+            print(f"⚡ 시맨틱 캐시 적중 (total={timings['total']:.3f}s)")
         else:
-            # 기존 RAG 체인 사용 (fallback)
-            print("🤖 RAG 체인으로 응답 생성 중...")
-            llm = getattr(fastapi_request.app.state, 'llm', None)
-            rag_chain = create_rag_chain(vectorstore, llm=llm)
-            answer = rag_chain.invoke(request.question)
-            print("✅ RAG 체인 응답 생성 완료")
-
-        # 응답 모델 생성
+            print(
+                f"✅ {len(result['source_docs'])}개 문서 기반 응답 생성 완료 "
+                f"(embed={timings['embed']:.3f}s, retrieve={timings['retrieve']:.3f}s, "
+                f"generate={timings['generate']:.3f}s)"
+            )
+
+        observe_rag("rag", timings, result["cached"])
+
+        # 응답 모델 생성 + JSON 직렬화 (직렬화 시간도 단계 메트릭으로 기록)
+        start = time.perf_counter()
         sources = [
             DocumentResponse(
                 content=doc.page_content,
                 metadata=doc.metadata,
+                score=score,
+                score_type=result["score_type"],
             )
-            for doc in source_docs
+            for doc, score in zip(result["source_docs"], result["scores"])
         ]
 
-        return RAGResponse(
+        body = RAGResponse(
             question=request.question,
-            answer=answer,
+            answer=result["answer"],
             sources=sources,
             retrieved_documents=sources,
             retrieved_count=len(sources) if sources else 0,
-        )
+            timings=timings,
+            cached=result["cached"],
+        ).model_dump_json()
+        observe_stage("serialize", time.perf_counter() - start)
+        return Response(content=body, media_type="application/json")
     except HTTPException:
         # HTTPException은 그대로 전달
         raise
@@ -157,7 +168,126 @@ async def rag_query(
         )
 
 
+def _sse(event: str, data: Any) -> str:
+    """Server-Sent Events 형식의 메시지 문자열 생성."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/stream")
+async def rag_stream(
+    request: RAGRequest,
+    fastapi_request: Request,
+    vectorstore: VectorStoreType = Depends(get_vectorstore_dependency),
+) -> StreamingResponse:
+    """
+    RAG 답변을 Server-Sent Events 로 스트리밍합니다.
+
+    1. `sources` 이벤트: 검색된 문서 목록 (즉시 전송)
+    2. `token` 이벤트: 생성되는 답변 조각
+    3. `done` 이벤트: 단계별 소요 시간 (첫 토큰까지의 시간 `ttft` 포함)
+
+    오류가 발생하면 `error` 이벤트를 보내고 스트림을 종료합니다.
+    """
+    print(f"📝 RAG 스트리밍 질의 수신: question='{request.question}', k={request.k}")
+    chat_service = get_chat_backend(fastapi_request)
+    pipeline = get_rag_registry(fastapi_request, vectorstore).get()
+    # 스트림을 시작하기 전에 검증해 잘못된 필터는 400 으로 응답
+    search_params = search_params_of(request, fastapi_request)
+
+    async def event_stream() -> AsyncIterator[str]:
+        serialize_seconds = 0.0
+        try:
+            async for event in pipeline.astream(
+                request.question,
+                k=request.k,
+                chat_service=chat_service,
+                search_params=search_params,
+            ):
+                start = time.perf_counter()
+                message = _sse(event["event"], event["data"])
+                serialize_seconds += time.perf_counter() - start
+                if event["event"] == "done":
+                    observe_rag("rag_stream", event["data"]["timings"], event["data"]["cached"])
+                    observe_stage("serialize", serialize_seconds)
+                yield message
+        except Exception as e:
+            print(f"❌ RAG 스트리밍 중 오류 발생: {str(e)}")
+            traceback.print_exc()
+            yield _sse("error", {"detail": f"RAG 스트리밍 중 오류 발생: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # 프록시(Nginx 등) 버퍼링 방지
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+def get_conversation_service(request: Request) -> Any:
+    """lifespan 에서 만든 세션 대화 서비스 (Chat Service 가 없으면 503)."""
+    service = getattr(request.app.state, "conversation_service", None)
+    if service is None:
+        raise HTTPException(
+            status_code=503,
+            detail="세션 대화를 사용하려면 Chat Service(USE_CHAT_SERVICE)를 활성화하세요.",
+        )
+    return service
+
+
+@router.post("/chat", response_model=ChatResponse)
+async def session_chat(
+    request: ChatRequest,
+    conversation_service: Any = Depends(get_conversation_service),
+) -> ChatResponse:
+    """세션 히스토리를 유지하는 멀티턴 대화."""
+    try:
+        result = await conversation_service.achat(
+            request.session_id,
+            request.message,
+            max_new_tokens=request.max_new_tokens,
+        )
+    except Exception as e:
+        print(f"❌ 세션 대화 오류: {str(e)}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"대화 생성 중 오류 발생: {str(e)}")
+
+    return ChatResponse(session_id=request.session_id, **result)
+
+
+@router.delete("/chat/{session_id}")
+async def reset_session(
+    session_id: str,
+    conversation_service: Any = Depends(get_conversation_service),
+) -> dict:
+    """세션 히스토리 삭제."""
+    await conversation_service.reset(session_id)
+    return {"session_id": session_id, "status": "deleted"}
+
+
 @router.get("/health")
-async def rag_health() -> dict:
+async def rag_health(request: Request) -> dict:
     """RAG 서비스 헬스체크."""
-    return {"status": "healthy", "service": "rag"}
+    registry = getattr(request.app.state, "rag_registry", None)
+    scheduler = getattr(request.app.state, "chat_scheduler", None)
+    conversation_service = getattr(request.app.state, "conversation_service", None)
+    reranker = getattr(request.app.state, "reranker", None)
+
+    # 로컬 모델(Chat Service 또는 HF 파이프라인)의 접두사 KV 캐시 통계
+    model = getattr(getattr(request.app.state, "chat_service", None), "model", None)
+    if model is None:
+        hf = get_hf_model_and_tokenizer(getattr(request.app.state, "llm", None))
+        model = hf[0] if hf is not None else None
+    prefix_cache = get_prefix_cache(model) if model is not None else None
+
+    return {
+        "status": "healthy",
+        "service": "rag",
+        "chains": registry.stats() if registry is not None else None,
+        "generation": scheduler.metrics() if scheduler is not None else None,
+        "prefix_cache": prefix_cache.stats() if prefix_cache is not None else None,
+        "sessions": conversation_service.stats() if conversation_service is not None else None,
+        "reranker": reranker.stats() if reranker is not None else None,
+    }
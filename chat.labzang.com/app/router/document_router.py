@@ -0,0 +1,120 @@
+"""
+😎😎 FastAPI 기준의 API 엔드포인트 계층입니다.
+
+document_router.py
+POST /documents, /documents/batch, /documents/ingest
+문서를 청킹/임베딩해 벡터스토어에 저장 (embedding_ingest_service 호출).
+"""
+
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from app.api.models import DocumentListRequest, DocumentRequest
+
+router = APIRouter(prefix="/documents", tags=["documents"])
+
+
+def get_ingest_service(request: Request) -> Any:
+    """lifespan 에서 만든 문서 수집 서비스 반환."""
+    ingest_service = getattr(request.app.state, "ingest_service", None)
+    if ingest_service is None:
+        raise HTTPException(status_code=503, detail="문서 수집 서비스가 초기화되지 않았습니다.")
+    return ingest_service
+
+
+@router.post("")
+async def add_document(request: DocumentRequest, fastapi_request: Request) -> dict:
+    """
+    문서 하나를 추가합니다.
+
+    문서를 청킹해 저장하며, 이미 저장된 내용과 같은 청크는 다시 임베딩하지 않습니다.
+    """
+    ingest_service = get_ingest_service(fastapi_request)
+    try:
+        job = await ingest_service.ingest(
+            [{"content": request.content, "metadata": request.metadata, "id": request.id}]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"문서 추가 중 오류 발생: {str(e)}")
+
+    if job.failed:
+        raise HTTPException(status_code=500, detail=job.error)
+
+    return {
+        "message": "Document added successfully",
+        "content": request.content,
+        "metadata": request.metadata,
+        "chunks_written": job.written,
+        "chunks_unchanged": job.skipped,
+        "chunks_deleted": job.deleted,
+    }
+
+
+@router.post("/batch")
+async def add_documents(
+    request: DocumentListRequest, fastapi_request: Request, response: Response
+) -> dict:
+    """
+    여러 문서를 추가합니다.
+
+    문서를 청킹해 배치 단위로 임베딩하고 다중 행 INSERT 로 기록합니다.
+    내용이 바뀌지 않은 청크는 건너뜁니다.
+
+    배치마다 따로 커밋되므로 일부 배치만 실패하면 이미 기록된 문서가 남습니다.
+    이 경우 207 과 함께 처리/실패 건수를 반환하고, 아무것도 기록되지 않았을
+    때만 500 을 반환합니다.
+    """
+    ingest_service = get_ingest_service(fastapi_request)
+    try:
+        job = await ingest_service.ingest(request.documents)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"문서 추가 중 오류 발생: {str(e)}")
+
+    if job.failed and not job.processed:
+        raise HTTPException(status_code=500, detail=job.error)
+    if job.failed:
+        response.status_code = 207
+
+    return {
+        "message": (
+            f"{job.processed} documents added, {job.failed} failed"
+            if job.failed
+            else f"{job.processed} documents added successfully"
+        ),
+        "count": job.processed,
+        "failed": job.failed,
+        "error": job.error,
+        "chunks_written": job.written,
+        "chunks_unchanged": job.skipped,
+        "chunks_deleted": job.deleted,
+        "duplicates_dropped": job.dropped,
+        "docs_per_second": round(job.docs_per_second, 2),
+    }
+
+
+@router.post("/ingest", status_code=202)
+async def ingest_documents(fastapi_request: Request) -> dict:
+    """
+    NDJSON/JSONL 본문(한 줄에 {"content", "metadata"} 하나)을 백그라운드 작업으로 수집합니다.
+
+    본문은 메모리에 모으지 않고 임시 파일로 받은 뒤 바로 job_id 를 반환하며,
+    진행 상황은 GET /documents/ingest/{job_id} 로 조회합니다.
+    """
+    ingest_service = get_ingest_service(fastapi_request)
+    path = await ingest_service.spool(fastapi_request.stream())
+    job = ingest_service.start_ndjson_job(path)
+    return job.to_dict()
+
+
+@router.get("/ingest/{job_id}")
+async def ingest_status(job_id: str, fastapi_request: Request) -> dict:
+    """수집 작업 상태 (처리 건수, 초당 문서 수)."""
+    job = get_ingest_service(fastapi_request).get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="수집 작업을 찾을 수 없습니다.")
+    return job.to_dict()
@@ -4,12 +4,13 @@
 단순 채팅/대화형 LLM 인터페이스.
 
 세션별 히스토리 관리, 요약, 토큰 절약 전략 등.
+(세션 저장/요약은 conversation_service.py, 저장소는 repository/session_repository.py)
 
 QLoRA (4-bit Quantized LoRA)를 사용한 대화 및 학습 기능을 제공합니다.
 """
 import os
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
 
 import torch
 from transformers import (
@@ -149,6 +150,93 @@ class QLoRAChatService:
         print("✅ QLoRA 모델 로딩 완료!")
         print("😎😎😎😎😎😎😎😎😎😎")
 
+    @staticmethod
+    def format_prompt(
+        message: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+    ) -> str:
+        """대화 히스토리와 현재 메시지를 모델 입력 프롬프트로 결합합니다.
+
+        Args:
+            message: 사용자 메시지.
+            conversation_history: 대화 히스토리 (선택사항).
+
+        Returns:
+            "사용자: ...\n어시스턴트:" 형식의 프롬프트.
+        """
+        if not conversation_history:
+            return f"사용자: {message}\n어시스턴트:"
+
+        # 히스토리를 텍스트로 변환
+        formatted_messages = []
+        for msg in conversation_history:
+            role = msg.get("role", "user")
+            content = msg.get("content", "")
+            if role == "system":
+                # 세션 저장소가 오래된 턴을 압축한 요약
+                formatted_messages.append(f"이전 대화 요약: {content}")
+            elif role == "user":
+                formatted_messages.append(f"사용자: {content}")
+            elif role == "assistant":
+                formatted_messages.append(f"어시스턴트: {content}")
+        formatted_messages.append(f"사용자: {message}")
+        formatted_messages.append("어시스턴트:")
+        return "\n".join(formatted_messages)
+
+    @staticmethod
+    def cacheable_prefix(
+        message: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+    ) -> Optional[str]:
+        """`format_prompt` 결과 중 다른 요청/다음 턴과 공유되는 접두사.
+
+        - 이전 대화 히스토리 (다음 턴의 프롬프트는 이 부분으로 시작함)
+        - RAG 프롬프트라면 이어지는 "사용자: " + 공통 지시문 머리말
+
+        Returns:
+            접두사 문자열. 공유할 부분이 없으면 None.
+        """
+        from app.core.rag_chain import RAG_PROMPT_HEADER
+
+        prompt = QLoRAChatService.format_prompt(message, conversation_history)
+        prefix = prompt[: len(prompt) - len(f"사용자: {message}\n어시스턴트:")]
+        if message.startswith(RAG_PROMPT_HEADER):
+            prefix += f"사용자: {RAG_PROMPT_HEADER}"
+        return prefix or None
+
+    async def astream_chat(
+        self,
+        message: str,
+        *,
+        max_new_tokens: int = 512,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        do_sample: bool = True,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+    ) -> AsyncIterator[str]:
+        """`chat` 과 같은 입력으로 생성된 텍스트 조각을 순서대로 반환합니다.
+
+        `TextIteratorStreamer` 를 사용하므로 전체 생성이 끝나기 전에
+        첫 토큰을 받을 수 있습니다.
+        """
+        if self.model is None or self.tokenizer is None:
+            raise RuntimeError("모델이 로드되지 않았습니다.")
+
+        from app.core.llm.streaming import astream_hf_generate
+
+        prompt = self.format_prompt(message, conversation_history)
+        async for text in astream_hf_generate(
+            self.model,
+            self.tokenizer,
+            prompt,
+            prefix=self.cacheable_prefix(message, conversation_history),
+            max_new_tokens=max_new_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            do_sample=do_sample,
+        ):
+            yield text
+
     def chat(
         self,
         message: str,
@@ -176,29 +264,79 @@ class QLoRAChatService:
         if self.model is None or self.tokenizer is None:
             raise RuntimeError("모델이 로드되지 않았습니다.")
 
-        # 대화 히스토리와 현재 메시지를 결합
-        if conversation_history:
-            # 히스토리를 텍스트로 변환
-            formatted_messages = []
-            for msg in conversation_history:
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-                if role == "user":
-                    formatted_messages.append(f"사용자: {content}")
-                elif role == "assistant":
-                    formatted_messages.append(f"어시스턴트: {content}")
-            formatted_messages.append(f"사용자: {message}")
-            formatted_messages.append("어시스턴트:")
-            prompt = "\n".join(formatted_messages)
-        else:
-            prompt = f"사용자: {message}\n어시스턴트:"
+        from app.core.llm.prefix_cache import generate_text
+
+        # 히스토리/공통 머리말은 접두사 KV 캐시를 재사용하고 새 토큰만 prefill
+        return generate_text(
+            self.model,
+            self.tokenizer,
+            self.format_prompt(message, conversation_history),
+            prefix=self.cacheable_prefix(message, conversation_history),
+            max_new_tokens=max_new_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            do_sample=do_sample,
+        )
+
+    def chat_batch(
+        self,
+        messages: List[str],
+        *,
+        max_new_tokens: int = 512,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        do_sample: bool = True,
+    ) -> List[str]:
+        """여러 프롬프트를 왼쪽 패딩으로 묶어 `generate` 한 번으로 생성합니다.
+
+        디코더 모델은 마지막 토큰 뒤에 이어서 생성하므로, 길이가 다른
+        프롬프트를 한 배치로 만들 때는 왼쪽에 패딩해야 합니다.
+
+        모든 메시지가 같은 공유 접두사(RAG 지시문 머리말)를 가지면 접두사
+        KV 캐시를 배치 크기만큼 복제해 넘기고 나머지 토큰만 prefill 합니다
+        (`PrefixKVCache.prepare_batch`).
+
+        Args:
+            messages: 사용자 메시지 목록 (각각 `format_prompt` 로 변환됨).
+            max_new_tokens: 최대 생성 토큰 수.
+            temperature: 생성 온도.
+            top_p: Top-p 샘플링.
+            do_sample: 샘플링 사용 여부.
 
-        # 토크나이징
-        inputs = self.tokenizer(
-            prompt, return_tensors="pt", truncation=True, max_length=2048
-        ).to(self.model.device)
+        Returns:
+            입력 순서와 같은 순서의 응답 텍스트 목록.
+        """
+        if self.model is None or self.tokenizer is None:
+            raise RuntimeError("모델이 로드되지 않았습니다.")
+
+        from app.core.llm.prefix_cache import get_prefix_cache
+        from app.core.metrics import GenerationTimer
+
+        timer = GenerationTimer()
+        prompts = [self.format_prompt(message) for message in messages]
+
+        inputs = None
+        prefixes = {self.cacheable_prefix(message) for message in messages}
+        cache = get_prefix_cache(self.model)
+        if cache is not None and len(prefixes) == 1 and None not in prefixes:
+            inputs = cache.prepare_batch(
+                self.model, self.tokenizer, prompts, prefixes.pop(), max_length=2048
+            )
+
+        if inputs is None:
+            padding_side = self.tokenizer.padding_side
+            self.tokenizer.padding_side = "left"
+            try:
+                inputs = self.tokenizer(
+                    prompts,
+                    return_tensors="pt",
+                    padding=True,
+                    truncation=True,
+                    max_length=2048,
+                ).to(self.model.device)
+            finally:
+                self.tokenizer.padding_side = padding_side
 
-        # 생성
         with torch.no_grad():
             outputs = self.model.generate(
                 **inputs,
@@ -208,14 +346,20 @@ class QLoRAChatService:
                 do_sample=do_sample,
                 pad_token_id=self.tokenizer.pad_token_id,
                 eos_token_id=self.tokenizer.eos_token_id,
+                logits_processor=[timer],
             )
+        timer.observe(batch_size=len(messages))
 
-        # 디코딩
-        generated_text = self.tokenizer.decode(
-            outputs[0][inputs["input_ids"].shape[1] :], skip_special_tokens=True
-        )
+        # 모든 행의 입력 길이가 같으므로 생성 시작 위치도 같음
+        generated = outputs[:, inputs["input_ids"].shape[1] :]
+        texts = self.tokenizer.batch_decode(generated, skip_special_tokens=True)
+        return [text.strip() for text in texts]
 
-        return generated_text.strip()
+    def count_tokens(self, message: str) -> int:
+        """메시지를 프롬프트로 변환했을 때의 토큰 수."""
+        if self.tokenizer is None:
+            raise RuntimeError("모델이 로드되지 않았습니다.")
+        return len(self.tokenizer(self.format_prompt(message))["input_ids"])
 
     def train(
         self,
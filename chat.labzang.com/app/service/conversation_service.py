@@ -0,0 +1,188 @@
+"""
+😎😎 conversation_service.py 서빙 관련 서비스
+
+세션 ID 별 대화 히스토리를 저장하고, QLoRAChatService 호출 시
+`conversation_history` 로 전달합니다.
+
+히스토리 토큰 수가 예산(max_history_tokens)을 넘으면 최근 몇 턴만 남기고
+오래된 턴을 모델로 요약해 세션 요약에 합칩니다. 대화가 길어져도 프롬프트
+길이와 prefill 비용이 일정 범위 안에 머물고, 압축 사이에는 히스토리 접두사가
+그대로 유지되므로 접두사 KV 캐시도 계속 재사용됩니다.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Tuple
+
+from app.config import settings
+from app.core.executor import run_blocking
+from app.repository.session_repository import Session, history_messages
+
+SUMMARY_PROMPT = """다음은 사용자와 어시스턴트의 이전 대화입니다.
+이후 대화에 필요한 사실과 사용자의 요청을 중심으로 간결하게 요약해주세요.
+
+{previous_summary}{transcript}
+
+요약:"""
+
+
+class ConversationService:
+    """세션 저장소와 Chat Service 를 묶어 멀티턴 대화를 처리하는 서비스."""
+
+    def __init__(
+        self,
+        chat_service: Any,
+        store: Any,
+        *,
+        max_history_tokens: int = 1024,
+        keep_recent_turns: int = 2,
+        summary_max_tokens: int = 128,
+        lock_stripes: int = 64,
+    ):
+        """대화 서비스를 초기화합니다.
+
+        Args:
+            chat_service: `chat`, `format_prompt`, `tokenizer` 를 제공하는 QLoRAChatService.
+            store: 세션 저장소 (`app.repository.session_repository`).
+            max_history_tokens: 요약을 포함한 히스토리의 토큰 예산.
+            keep_recent_turns: 압축 시 원문 그대로 남길 최근 턴(사용자+어시스턴트) 수.
+            summary_max_tokens: 요약 생성 최대 토큰 수.
+            lock_stripes: 세션 잠금 풀 크기 (세션 ID 해시로 잠금을 나눠 씀).
+        """
+        self.chat_service = chat_service
+        self.store = store
+        self.max_history_tokens = max_history_tokens
+        self.keep_recent_turns = keep_recent_turns
+        self.summary_max_tokens = summary_max_tokens
+
+        # 같은 세션의 요청이 동시에 히스토리를 덮어쓰지 않도록 잠금.
+        # 세션 수와 무관하게 고정 크기 풀을 쓰므로 메모리가 늘지 않음 (다른 세션과 가끔 같은 잠금을 공유)
+        self._locks: List[asyncio.Lock] = [asyncio.Lock() for _ in range(max(1, lock_stripes))]
+
+        # 메트릭
+        self.compactions = 0
+        self.compaction_seconds = 0.0
+
+    def _lock(self, session_id: str) -> asyncio.Lock:
+        return self._locks[hash(session_id) % len(self._locks)]
+
+    def count_history_tokens(self, session: Session) -> int:
+        """세션 히스토리를 프롬프트로 만들었을 때의 토큰 수 (현재 메시지 제외, 블로킹).
+
+        생성과 같은 토크나이저를 쓰므로 "llm" 풀에서 호출합니다.
+        """
+        history = history_messages(session)
+        if not history:
+            return 0
+        prompt = self.chat_service.format_prompt("", history)
+        return len(self.chat_service.tokenizer(prompt)["input_ids"])
+
+    def _summarize(self, previous_summary: str, messages: List[Dict[str, str]]) -> str:
+        """오래된 턴을 기존 요약과 합쳐 새 요약 생성 (블로킹)."""
+        transcript = "\n".join(
+            f"{'사용자' if m['role'] == 'user' else '어시스턴트'}: {m['content']}"
+            for m in messages
+        )
+        prompt = SUMMARY_PROMPT.format(
+            previous_summary=f"기존 요약: {previous_summary}\n\n" if previous_summary else "",
+            transcript=transcript,
+        )
+        return self.chat_service.chat(
+            prompt,
+            max_new_tokens=self.summary_max_tokens,
+            do_sample=False,
+        )
+
+    async def compact(self, session: Session) -> Tuple[bool, int]:
+        """토큰 예산을 넘으면 오래된 턴을 요약으로 압축합니다.
+
+        Returns:
+            (압축 여부, 압축 후 히스토리 토큰 수).
+        """
+        history_tokens = await run_blocking(self.count_history_tokens, session, pool="llm")
+        keep = self.keep_recent_turns * 2
+        if len(session["messages"]) <= keep or history_tokens <= self.max_history_tokens:
+            return False, history_tokens
+
+        start = time.perf_counter()
+        old = session["messages"][: len(session["messages"]) - keep]
+        session["summary"] = await run_blocking(
+            self._summarize, session.get("summary", ""), old, pool="llm"
+        )
+        session["messages"] = session["messages"][len(old) :]
+        history_tokens = await run_blocking(self.count_history_tokens, session, pool="llm")
+        self.compaction_seconds += time.perf_counter() - start
+        self.compactions += 1
+        print(f"🗜️ 대화 히스토리 압축: {len(old)}개 메시지 → 요약")
+        return True, history_tokens
+
+    async def achat(
+        self,
+        session_id: str,
+        message: str,
+        *,
+        max_new_tokens: int = 512,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        do_sample: bool = True,
+    ) -> Dict[str, Any]:
+        """세션 히스토리를 포함해 응답을 생성하고, 이번 턴을 세션에 저장합니다.
+
+        Returns:
+            {"answer", "history_tokens", "compacted"}
+        """
+        async with self._lock(session_id):
+            session = await run_blocking(self.store.get, session_id)
+
+            answer = await run_blocking(
+                self.chat_service.chat,
+                message,
+                pool="llm",
+                max_new_tokens=max_new_tokens,
+                temperature=temperature,
+                top_p=top_p,
+                do_sample=do_sample,
+                conversation_history=history_messages(session),
+            )
+
+            session["messages"].append({"role": "user", "content": message})
+            session["messages"].append({"role": "assistant", "content": answer})
+            compacted, history_tokens = await self.compact(session)
+
+            await run_blocking(self.store.save, session_id, session)
+
+        return {
+            "answer": answer,
+            "history_tokens": history_tokens,
+            "compacted": compacted,
+        }
+
+    def get_history(self, session_id: str) -> List[Dict[str, str]]:
+        """세션의 `conversation_history` (요약 포함)."""
+        return history_messages(self.store.get(session_id))
+
+    async def reset(self, session_id: str) -> None:
+        """세션 삭제."""
+        async with self._lock(session_id):
+            await run_blocking(self.store.delete, session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """세션/압축 통계."""
+        return {
+            "backend": self.store.backend,
+            "sessions": self.store.count(),
+            "compactions": self.compactions,
+            "compaction_seconds": round(self.compaction_seconds, 4),
+        }
+
+
+def create_conversation_service(chat_service: Any, store: Any) -> ConversationService:
+    """설정값으로 대화 서비스 생성."""
+    return ConversationService(
+        chat_service,
+        store,
+        max_history_tokens=settings.session_max_history_tokens,
+        keep_recent_turns=settings.session_keep_recent_turns,
+        summary_max_tokens=settings.session_summary_max_tokens,
+        lock_stripes=settings.session_lock_stripes,
+    )
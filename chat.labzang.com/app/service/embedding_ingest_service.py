@@ -4,4 +4,371 @@
 문서를 받아 임베딩 생성 + 벡터스토어 업서트까지 한 번에 처리.
 
 배치/주기적인 인덱싱 작업도 이 서비스 레벨에서 처리.
+
+- NDJSON/JSONL 업로드는 요청 본문을 스트리밍으로 임시 파일에 기록한 뒤
+  백그라운드 작업으로 처리하므로, 큰 코퍼스도 요청 타임아웃에 걸리지 않습니다.
+  파일 쓰기/읽기는 "ingest" 스레드 풀에서 실행해 이벤트 루프를 막지 않습니다.
+- 문서는 한국어 문장 경계 기준으로 청킹하고(app.core.chunking), 청크 ID 는
+  내용 해시입니다. 이미 저장된 청크는 임베딩 없이 건너뜁니다. `id` 가 있는
+  문서는 다시 보내면 자기 청크만 교체(새 청크 기록 + 사라진 청크 삭제)하고,
+  `id` 가 없는 문서는 삽입만 하며 아무것도 삭제하지 않습니다.
+- 문서는 batch_size 개씩 "ingest" 스레드 풀에서 임베딩하고, 결과는
+  `VectorRepository.replace_chunks` 의 다중 행 INSERT 로 기록합니다.
+  여러 배치의 임베딩과 DB 기록이 겹쳐서 진행됩니다.
+- 작업 상태(처리 건수, 초당 문서 수)는 job_id 로 조회합니다.
 """
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import IO, Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.core.chunking import KoreanSentenceChunker, create_chunker
+from app.core.executor import run_blocking
+from app.repository.vector_repository import EmbeddingRow, VectorRepository
+
+# 업로드 본문을 임시 파일에 쓰기 전에 모아 둘 크기 (쓰기마다 스레드를 오가지 않도록)
+SPOOL_FLUSH_BYTES = 1024 * 1024
+
+
+@dataclass
+class IngestJob:
+    """백그라운드 수집 작업 상태."""
+
+    job_id: str
+    status: str = "pending"  # pending, running, completed, failed
+    received: int = 0
+    processed: int = 0  # 처리된 문서 수 (변경 없음 포함)
+    written: int = 0  # 새로 임베딩해 기록한 청크 수
+    skipped: int = 0  # 내용이 같아 임베딩을 건너뛴 청크 수
+    deleted: int = 0  # 문서 변경으로 삭제된 청크 수
+    dropped: int = 0  # 같은 배치에 같은 id 가 다시 나와 반영되지 않은 문서 수
+    failed: int = 0
+    batches: int = 0
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def docs_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "received": self.received,
+            "processed": self.processed,
+            "written": self.written,
+            "skipped": self.skipped,
+            "deleted": self.deleted,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "error": self.error,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "docs_per_second": round(self.docs_per_second, 2),
+        }
+
+
+def parse_document(item: Dict[str, Any]) -> Dict[str, Any]:
+    """{"content" | "page_content", "metadata", "id"} 형식의 문서 검증."""
+    content = item.get("content", item.get("page_content"))
+    if not isinstance(content, str) or not content.strip():
+        raise ValueError("content 가 비어 있습니다.")
+    metadata = item.get("metadata") or {}
+    if not isinstance(metadata, dict):
+        raise ValueError("metadata 는 객체여야 합니다.")
+    return {"content": content, "metadata": metadata, "id": item.get("id")}
+
+
+class EmbeddingIngestService:
+    """배치 임베딩 + 일괄 기록 기반 문서 수집 서비스."""
+
+    def __init__(
+        self,
+        vectorstore: Any,
+        *,
+        repository: Optional[VectorRepository] = None,
+        chunker: Optional[KoreanSentenceChunker] = None,
+        batch_size: int = 64,
+        max_inflight_batches: int = 2,
+        max_jobs: int = 100,
+        on_written: Optional[Callable[[], None]] = None,
+    ):
+        """수집 서비스를 초기화합니다.
+
+        Args:
+            vectorstore: 임베딩 모델과 컬렉션을 제공하는 PGVector 인스턴스.
+            repository: 기록에 사용할 저장소 (없으면 vectorstore 에서 생성).
+            chunker: 문서 청커 (없으면 설정값으로 생성).
+            batch_size: 한 번에 임베딩/기록할 문서 수.
+            max_inflight_batches: 동시에 처리 중인 배치 수 (임베딩/기록 겹침 정도).
+            max_jobs: 상태를 보관할 최근 작업 수.
+            on_written: 문서가 기록된 뒤 호출할 콜백 (예: 답변 캐시 무효화).
+        """
+        self.embeddings = vectorstore.embeddings
+        self.repository = repository or VectorRepository.from_vectorstore(vectorstore)
+        self.chunker = chunker or create_chunker()
+        self.batch_size = batch_size
+        self.max_inflight_batches = max_inflight_batches
+        self.max_jobs = max_jobs
+        self.on_written = on_written
+        self.jobs: "OrderedDict[str, IngestJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    # ------------------------------------------------------------------
+    # 배치 처리
+    # ------------------------------------------------------------------
+
+    def _embed_and_write(self, docs: List[Dict[str, Any]]) -> Dict[str, int]:
+        """한 배치를 청킹하고, 바뀐 청크만 임베딩해 교체 (블로킹).
+
+        Returns:
+            {"written", "skipped", "deleted"} 청크 수와 "dropped" 문서 수.
+        """
+        # id 가 있는 문서: 문서별로 바뀐 청크만 교체
+        # 같은 배치에 같은 id 가 여러 번 있으면 마지막 내용을 사용하고 앞의 것은 dropped
+        chunks_by_doc: Dict[str, List[Dict[str, Any]]] = {}
+        # id 가 없는 문서: 청크 내용 해시로만 중복을 거르고 삭제하지 않음
+        unkeyed: Dict[str, Dict[str, Any]] = {}
+        dropped = 0
+        for doc in docs:
+            chunks = self.chunker.chunk_document(doc["content"], doc["metadata"], doc.get("id"))
+            if not chunks:
+                continue
+            doc_id = chunks[0]["metadata"].get("doc_id")
+            if doc_id is None:
+                for chunk in chunks:
+                    unkeyed.setdefault(chunk["id"], chunk)
+                continue
+            if doc_id in chunks_by_doc:
+                dropped += 1
+            # 한 문서 안의 동일한 청크는 하나만 저장
+            chunks_by_doc[doc_id] = list({chunk["id"]: chunk for chunk in chunks}.values())
+
+        existing = self.repository.existing_chunk_ids(chunks_by_doc)
+        stored_unkeyed = self.repository.existing_ids(unkeyed)
+
+        new_chunks: List[Dict[str, Any]] = []
+        delete_ids: List[str] = []
+        skipped = len(stored_unkeyed)
+        new_chunks.extend(chunk for chunk_id, chunk in unkeyed.items() if chunk_id not in stored_unkeyed)
+        for doc_id, chunks in chunks_by_doc.items():
+            stored = existing.get(doc_id, set())
+            current = {chunk["id"] for chunk in chunks}
+            new_chunks.extend(chunk for chunk in chunks if chunk["id"] not in stored)
+            delete_ids.extend(stored - current)
+            skipped += len(current & stored)
+
+        rows: List[EmbeddingRow] = []
+        if new_chunks:
+            vectors = self.embeddings.embed_documents([chunk["content"] for chunk in new_chunks])
+            rows = [
+                EmbeddingRow(
+                    content=chunk["content"],
+                    metadata=chunk["metadata"],
+                    embedding=vector,
+                    id=chunk["id"],
+                )
+                for chunk, vector in zip(new_chunks, vectors)
+            ]
+        self.repository.replace_chunks(rows, delete_ids)
+        return {
+            "written": len(rows),
+            "skipped": skipped,
+            "deleted": len(delete_ids),
+            "dropped": dropped,
+        }
+
+    async def _process_batches(
+        self, job: IngestJob, batches: AsyncIterator[List[Dict[str, Any]]]
+    ) -> None:
+        """배치들을 최대 max_inflight_batches 개까지 겹쳐서 처리."""
+        semaphore = asyncio.Semaphore(self.max_inflight_batches)
+
+        async def process(batch: List[Dict[str, Any]]) -> None:
+            try:
+                counts = await run_blocking(self._embed_and_write, batch, pool="ingest")
+                job.processed += len(batch) - counts["dropped"]
+                job.dropped += counts["dropped"]
+                job.written += counts["written"]
+                job.skipped += counts["skipped"]
+                job.deleted += counts["deleted"]
+            except Exception as e:
+                job.failed += len(batch)
+                job.error = str(e)
+                print(f"❌ 수집 배치 실패 ({len(batch)}건): {e}")
+            finally:
+                job.batches += 1
+                semaphore.release()
+
+        tasks = []
+        async for batch in batches:
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(process(batch)))
+        await asyncio.gather(*tasks)
+
+    async def _batched(self, docs: List[Dict[str, Any]]) -> AsyncIterator[List[Dict[str, Any]]]:
+        for start in range(0, len(docs), self.batch_size):
+            yield docs[start : start + self.batch_size]
+
+    def _read_batch(self, f: IO[str], job: IngestJob) -> Tuple[List[Dict[str, Any]], bool]:
+        """파일에서 최대 batch_size 개 문서를 읽음 (블로킹, 잘못된 줄은 failed 로 집계).
+
+        Returns:
+            (문서 목록, 파일 끝 도달 여부).
+        """
+        batch: List[Dict[str, Any]] = []
+        while len(batch) < self.batch_size:
+            line = f.readline()
+            if not line:
+                return batch, True
+            line = line.strip()
+            if not line:
+                continue
+            job.received += 1
+            try:
+                batch.append(parse_document(json.loads(line)))
+            except (ValueError, TypeError, AttributeError) as e:
+                job.failed += 1
+                job.error = f"{job.received}번째 줄: {e}"
+        return batch, False
+
+    async def _read_ndjson(self, path: str, job: IngestJob) -> AsyncIterator[List[Dict[str, Any]]]:
+        """임시 파일을 "ingest" 스레드 풀에서 읽어 batch_size 개씩 반환."""
+        f = await run_blocking(open, path, encoding="utf-8", pool="ingest")
+        try:
+            eof = False
+            while not eof:
+                batch, eof = await run_blocking(self._read_batch, f, job, pool="ingest")
+                if batch:
+                    yield batch
+        finally:
+            f.close()
+
+    def _notify_written(self, job: IngestJob) -> None:
+        if (job.written or job.deleted) and self.on_written is not None:
+            self.on_written()
+
+    # ------------------------------------------------------------------
+    # 공개 API
+    # ------------------------------------------------------------------
+
+    async def ingest(self, items: List[Dict[str, Any]]) -> IngestJob:
+        """요청 안에서 바로 처리하는 동기식 수집 (`/documents/batch`).
+
+        잘못된 항목이 있으면 ValueError 를 발생시킵니다.
+        """
+        docs = [parse_document(item) for item in items]
+        job = IngestJob(job_id=str(uuid.uuid4()), status="running", received=len(docs))
+        job.started_at = time.time()
+        await self._process_batches(job, self._batched(docs))
+        job.finished_at = time.time()
+        job.status = "failed" if job.failed else "completed"
+        self._notify_written(job)
+        return job
+
+    async def spool(self, chunks: AsyncIterator[bytes]) -> str:
+        """요청 본문 스트림을 메모리에 모으지 않고 임시 파일에 기록.
+
+        SPOOL_FLUSH_BYTES 씩 모아 "ingest" 스레드 풀에서 쓰므로 큰 업로드도
+        이벤트 루프를 막지 않습니다.
+        """
+        fd, path = tempfile.mkstemp(prefix="ingest-", suffix=".ndjson")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                buffer = bytearray()
+                async for chunk in chunks:
+                    buffer += chunk
+                    if len(buffer) >= SPOOL_FLUSH_BYTES:
+                        await run_blocking(f.write, bytes(buffer), pool="ingest")
+                        buffer.clear()
+                if buffer:
+                    await run_blocking(f.write, bytes(buffer), pool="ingest")
+        except BaseException:
+            os.remove(path)
+            raise
+        return path
+
+    def start_ndjson_job(self, path: str) -> IngestJob:
+        """임시 NDJSON 파일을 처리하는 백그라운드 작업 시작."""
+        job = IngestJob(job_id=str(uuid.uuid4()))
+        self.jobs[job.job_id] = job
+        self._evict_finished_jobs()
+
+        self._tasks[job.job_id] = asyncio.create_task(self._run_ndjson_job(job, path))
+        return job
+
+    def _evict_finished_jobs(self) -> None:
+        """max_jobs 를 넘으면 끝난 작업부터 오래된 순으로 상태 삭제.
+
+        실행 중인 작업은 종료 시 취소/대기할 수 있도록 남겨 두므로, 모두 실행 중이면
+        잠시 max_jobs 를 넘을 수 있습니다.
+        """
+        excess = len(self.jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        finished = [
+            job_id for job_id, job in self.jobs.items()
+            if job.finished_at is not None and job_id not in self._tasks
+        ]
+        for job_id in finished[:excess]:
+            del self.jobs[job_id]
+
+    async def _run_ndjson_job(self, job: IngestJob, path: str) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        print(f"📥 수집 작업 시작: {job.job_id}")
+        try:
+            await self._process_batches(job, self._read_ndjson(path, job))
+            job.status = "completed"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            traceback.print_exc()
+        finally:
+            job.finished_at = time.time()
+            self._tasks.pop(job.job_id, None)
+            os.remove(path)
+            self._notify_written(job)
+            print(
+                f"✅ 수집 작업 종료: {job.job_id} (status={job.status}, processed={job.processed}, "
+                f"written={job.written}, skipped={job.skipped}, failed={job.failed}, "
+                f"{job.docs_per_second:.1f} docs/s)"
+            )
+
+    def get_job(self, job_id: str) -> Optional[IngestJob]:
+        """작업 상태 조회."""
+        return self.jobs.get(job_id)
+
+    async def shutdown(self) -> None:
+        """진행 중인 작업 취소."""
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+
+def create_ingest_service(vectorstore: Any, **kwargs: Any) -> EmbeddingIngestService:
+    """설정값으로 수집 서비스 생성."""
+    return EmbeddingIngestService(
+        vectorstore,
+        batch_size=settings.ingest_batch_size,
+        max_inflight_batches=settings.ingest_workers,
+        **kwargs,
+    )
@@ -0,0 +1,232 @@
+"""
+😎😎 generation_scheduler.py 서빙 관련 서비스
+
+QLoRAChatService 생성 요청을 모아서 한 번에 처리하는 동적 배칭 스케줄러.
+
+동시에 들어온 요청을 큐에 쌓았다가, 최대 대기 시간(max_wait_ms) 안에
+모인 요청을 토큰 예산(max_batch_tokens) 범위에서 마이크로 배치로 묶어
+`generate` 한 번으로 처리하고, 각 결과를 기다리던 요청에 돌려줍니다.
+샘플링 파라미터가 다른 요청은 같은 배치에 섞지 않습니다.
+"""
+
+import asyncio
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from app.core.executor import run_blocking
+
+# (max_new_tokens, temperature, top_p, do_sample)
+GenerationParams = Tuple[int, float, float, bool]
+
+
+@dataclass
+class _PendingGeneration:
+    """큐에서 대기 중인 생성 요청."""
+
+    message: str
+    params: GenerationParams
+    prompt_tokens: int
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class GenerationScheduler:
+    """QLoRAChatService 용 동적(마이크로) 배칭 스케줄러."""
+
+    def __init__(
+        self,
+        chat_service: Any,
+        *,
+        max_batch_size: int = 8,
+        max_batch_tokens: int = 8192,
+        max_wait_ms: float = 20.0,
+    ):
+        """스케줄러를 초기화합니다.
+
+        Args:
+            chat_service: `chat_batch`, `count_tokens` 를 제공하는 QLoRAChatService.
+            max_batch_size: 한 배치의 최대 요청 수.
+            max_batch_tokens: 한 배치의 토큰 예산
+                (배치 크기 × (가장 긴 프롬프트 + max_new_tokens)).
+            max_wait_ms: 첫 요청 이후 추가 요청을 기다리는 최대 시간(ms).
+        """
+        self.chat_service = chat_service
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._deferred: Deque[_PendingGeneration] = deque()
+        self._worker: Optional[asyncio.Task] = None
+
+        # 메트릭
+        self._batches = 0
+        self._requests = 0
+        self._last_batch_size = 0
+        self._batch_sizes: Counter = Counter()
+        self._queue_wait_total = 0.0
+
+    # ------------------------------------------------------------------
+    # 수명 주기
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """배칭 워커 태스크 시작 (실행 중인 이벤트 루프 안에서 호출)."""
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """워커 종료 및 대기 중인 요청 취소."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        while self._deferred:
+            self._deferred.popleft().future.cancel()
+        while self._queue is not None and not self._queue.empty():
+            self._queue.get_nowait().future.cancel()
+
+    # ------------------------------------------------------------------
+    # 요청 API
+    # ------------------------------------------------------------------
+
+    async def achat(
+        self,
+        message: str,
+        *,
+        max_new_tokens: int = 512,
+        temperature: float = 0.7,
+        top_p: float = 0.9,
+        do_sample: bool = True,
+    ) -> str:
+        """요청을 큐에 넣고, 배치 처리된 결과를 기다립니다."""
+        if self._worker is None:
+            self.start()
+
+        # 긴 RAG 프롬프트 토큰화는 루프 밖에서, 생성과 같은 llm 스레드에서 실행
+        # (HF fast 토크나이저를 다른 스레드와 동시에 쓰면 "Already borrowed" 오류)
+        prompt_tokens = await run_blocking(self.chat_service.count_tokens, message, pool="llm")
+        pending = _PendingGeneration(
+            message=message,
+            params=(max_new_tokens, temperature, top_p, do_sample),
+            prompt_tokens=prompt_tokens,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        await self._queue.put(pending)
+        return await pending.future
+
+    def astream_chat(self, message: str, **kwargs: Any) -> AsyncIterator[str]:
+        """스트리밍은 배칭하지 않고 Chat Service 로 바로 전달합니다."""
+        return self.chat_service.astream_chat(message, **kwargs)
+
+    # ------------------------------------------------------------------
+    # 배칭 루프
+    # ------------------------------------------------------------------
+
+    def _batch_cost(self, prompt_tokens: int, size: int, params: GenerationParams) -> int:
+        """왼쪽 패딩 후 배치 텐서의 토큰 수 (프롬프트 + 생성)."""
+        return size * (prompt_tokens + params[0])
+
+    async def _next_pending(self, timeout: Optional[float]) -> Optional[_PendingGeneration]:
+        """보류 요청을 먼저, 없으면 큐에서 timeout 까지 기다려 하나를 꺼냄."""
+        if self._deferred:
+            return self._deferred.popleft()
+        if timeout is None:
+            return await self._queue.get()
+        if timeout <= 0:
+            return self._queue.get_nowait() if not self._queue.empty() else None
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def _collect_batch(self) -> List[_PendingGeneration]:
+        """첫 요청과 같은 파라미터의 요청을 대기 시간/토큰 예산 안에서 모음."""
+        first = await self._next_pending(None)
+        batch = [first]
+        longest = first.prompt_tokens
+        deadline = time.perf_counter() + self.max_wait
+        skipped: List[_PendingGeneration] = []
+
+        while len(batch) < self.max_batch_size:
+            candidate = await self._next_pending(deadline - time.perf_counter())
+            if candidate is None:
+                break
+            if candidate.params != first.params:
+                skipped.append(candidate)
+                continue
+
+            new_longest = max(longest, candidate.prompt_tokens)
+            if self._batch_cost(new_longest, len(batch) + 1, first.params) > self.max_batch_tokens:
+                skipped.append(candidate)
+                break
+
+            batch.append(candidate)
+            longest = new_longest
+
+        # 이번 배치에 못 들어간 요청은 도착 순서를 유지하며 다음 배치에서 우선 처리
+        self._deferred.extendleft(reversed(skipped))
+        return batch
+
+    async def _run(self) -> None:
+        """배치를 모아 `chat_batch` 를 실행하고 결과를 각 요청에 전달."""
+        while True:
+            batch = await self._collect_batch()
+            batch = [item for item in batch if not item.future.cancelled()]
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            max_new_tokens, temperature, top_p, do_sample = batch[0].params
+            try:
+                outputs = await run_blocking(
+                    self.chat_service.chat_batch,
+                    [item.message for item in batch],
+                    pool="llm",
+                    max_new_tokens=max_new_tokens,
+                    temperature=temperature,
+                    top_p=top_p,
+                    do_sample=do_sample,
+                )
+            except Exception as e:
+                print(f"❌ 배치 생성 실패 (batch_size={len(batch)}): {e}")
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                continue
+
+            for item, output in zip(batch, outputs):
+                if not item.future.done():
+                    item.future.set_result(output)
+
+            self._record(batch, started)
+
+    def _record(self, batch: List[_PendingGeneration], started: float) -> None:
+        """배치 메트릭 갱신."""
+        self._batches += 1
+        self._requests += len(batch)
+        self._last_batch_size = len(batch)
+        self._batch_sizes[len(batch)] += 1
+        self._queue_wait_total += sum(started - item.enqueued_at for item in batch)
+
+    def metrics(self) -> Dict[str, Any]:
+        """배치 크기, 큐 깊이 등 스케줄러 메트릭."""
+        queue_depth = len(self._deferred) + (self._queue.qsize() if self._queue else 0)
+        return {
+            "queue_depth": queue_depth,
+            "batches": self._batches,
+            "requests": self._requests,
+            "last_batch_size": self._last_batch_size,
+            "avg_batch_size": round(self._requests / self._batches, 2) if self._batches else 0.0,
+            "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+            "avg_queue_wait_ms": (
+                round(self._queue_wait_total / self._requests * 1000, 2) if self._requests else 0.0
+            ),
+        }